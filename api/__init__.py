@@ -4,6 +4,7 @@ API 모듈
 
 from .dream import (
     generate_dream_numbers,
+    generate_dream_numbers_batch,
     generate_dream_numbers_with_llm,
     find_symbols_in_dream,
     load_dream_symbols
@@ -11,6 +12,7 @@ from .dream import (
 
 __all__ = [
     "generate_dream_numbers",
+    "generate_dream_numbers_batch",
     "generate_dream_numbers_with_llm", 
     "find_symbols_in_dream",
     "load_dream_symbols"
@@ -1,74 +1,43 @@
 """
 AI 해몽 모듈 - 꿈을 분석하여 로또 번호 추천
 
-형태소 분석:
-  - Kiwi 라이브러리를 사용하여 한국어 형태소 분석
+형태소 분석 (api/morphemes.py):
+  - Kiwi 라이브러리를 사용하여 한국어 형태소 분석 (지연 생성 + 결과 캐시)
   - "물려서" → "물리다" (동사 원형)
   - "뱀에게" → "뱀" (명사)
 """
 
 import json
 import re
-import random
+import asyncio
 from pathlib import Path
 from typing import Optional, List, Tuple
-import os
 
-# Kiwi 한국어 형태소 분석기
-try:
-    from kiwipiepy import Kiwi
-    kiwi = Kiwi()
-    KIWI_AVAILABLE = True
-except ImportError:
-    KIWI_AVAILABLE = False
-    print("⚠️ Kiwi not installed. Using simple keyword matching.")
+import numpy as np
+
+from api.llm_cache import cache_key, get_interpretation_cache, single_flight
+from api.llm_client import get_llm_client
+from api.morphemes import extract_morphemes, extract_morphemes_batch, normalize_text
+from api.symbol_index import get_symbol_index
 
 # 해몽 DB 로드
 DATA_DIR = Path(__file__).parent.parent / "data"
 
-
-def extract_morphemes(text: str) -> List[Tuple[str, str]]:
-    """
-    텍스트에서 형태소 추출 (Kiwi 사용)
-    
-    Returns:
-        List of (원형, 품사) 튜플
-        예: "뱀에게 물려서" → [("뱀", "NNG"), ("물리다", "VV")]
-    
-    품사 태그:
-        NNG: 일반명사, NNP: 고유명사
-        VV: 동사, VA: 형용사
-        MM: 관형사, MAG: 부사
-    """
-    if not KIWI_AVAILABLE:
-        return []
-    
-    result = kiwi.analyze(text)
-    if not result:
-        return []
-    
-    # 첫 번째 분석 결과 사용
-    tokens = result[0][0]
-    
-    morphemes = []
-    for token in tokens:
-        form = token.form      # 원형
-        tag = token.tag        # 품사 태그
-        
-        # 명사, 동사, 형용사만 추출
-        if tag.startswith(('NN', 'VV', 'VA')):
-            morphemes.append((form, tag))
-    
-    return morphemes
+# 운세 타입별 메시지
+FORTUNE_MESSAGES = {
+    "대박": "대박의 기운이 감지됩니다! 로또 구매를 강력 추천합니다! 🎉",
+    "금전운": "금전운이 있습니다. 당신의 행운을 믿어보세요! 💰",
+    "재물": "재물운이 좋습니다. 재정적 이익이 기대됩니다.",
+    "성공": "성공의 기운이 있습니다. 도전해보세요! ⭐",
+    "행운": "전반적인 행운이 따릅니다. 좋은 일이 생길 거예요.",
+    "시작": "새로운 시작에 좋은 기운입니다.",
+    "변화": "변화의 시기입니다. 과감한 결정이 필요해요."
+}
 
 
 def load_dream_symbols():
-    """해몽 상징 DB 로드"""
-    symbols_path = DATA_DIR / "dream_symbols.json"
-    if symbols_path.exists():
-        with open(symbols_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"symbols": [], "fortune_types": {}}
+    """해몽 상징 DB (색인에 캐시된 DB, 파일이 바뀌면 다시 읽음)"""
+    return get_symbol_index().db
 
 
 def find_symbols_in_dream(dream_text: str) -> Tuple[list, list]:
@@ -78,46 +47,15 @@ def find_symbols_in_dream(dream_text: str) -> Tuple[list, list]:
     처리 흐름:
       1. Kiwi로 형태소 분석 → 원형 추출
       2. "물려서" → "물리다", "뱀에게" → "뱀"
-      3. 원형으로 DB 검색
+      3. 원형으로 키워드 색인 조회 (DB 순서)
+      4. 결과가 2개 미만이면 원문에서 키워드 직접 검색 (Aho-Corasick, 2글자 이상)
     
     Returns:
         (found_symbols, morphemes): 발견된 상징 리스트, 분석된 형태소 리스트
     """
-    db = load_dream_symbols()
-    found_symbols = []
-    found_ids = set()
-    
-    # 형태소 분석
     morphemes = extract_morphemes(dream_text)
     extracted_words = [form for form, tag in morphemes]
-    
-    # 1. 형태소 원형으로 DB 검색
-    if morphemes:
-        for symbol in db["symbols"]:
-            if symbol["id"] in found_ids:
-                continue
-            
-            keywords = [symbol["keyword"]] + symbol.get("variants", [])
-            for kw in keywords:
-                if kw in extracted_words:
-                    found_symbols.append(symbol)
-                    found_ids.add(symbol["id"])
-                    break
-    
-    # 2. 형태소 분석이 안되거나 결과가 적으면 키워드 직접 검색도 수행
-    if len(found_symbols) < 2:
-        for symbol in db["symbols"]:
-            if symbol["id"] in found_ids:
-                continue
-            
-            keywords = [symbol["keyword"]] + symbol.get("variants", [])
-            for kw in keywords:
-                # 2글자 이상인 키워드만 직접 검색 (오탐 방지)
-                if len(kw) >= 2 and kw in dream_text:
-                    found_symbols.append(symbol)
-                    found_ids.add(symbol["id"])
-                    break
-    
+    found_symbols = get_symbol_index().find(dream_text, extracted_words)
     return found_symbols, morphemes
 
 
@@ -130,77 +68,51 @@ def extract_numbers_from_dream(dream_text: str) -> list:
     return list(set(valid_numbers))
 
 
-def generate_dream_numbers(dream_text: str, num_sets: int = 1) -> dict:
+def sample_dream_numbers(candidates: np.ndarray, num_sets: int, rng=None) -> np.ndarray:
     """
-    꿈 텍스트 기반 로또 번호 생성 (형태소 분석 + 규칙 기반)
-    
+    후보 번호 우선 7개 뽑기 (벡터화)
+
+    후보 번호에는 [0, 1), 나머지에는 [1, 2) 난수 키를 주고 키 순서대로 7개를 고름
+      - 후보가 7개 이상이면 후보 중에서 무작위 7개
+      - 부족하면 후보 전부 + 나머지에서 무작위로 채움 (보너스는 채운 번호 중 하나)
+
     Args:
-        dream_text: 사용자가 입력한 꿈 내용
-        num_sets: 생성할 세트 수
-    
+        candidates: (D, 45) bool, 꿈별 후보 번호 마스크 (1차원이면 꿈 1개)
+        num_sets: 꿈별 세트 수
+
     Returns:
-        dict: {
-            "interpretation": 해석 텍스트,
-            "symbols_found": 발견된 상징들,
-            "numbers": [[메인6개, 보너스], ...],
-            "fortune": 운세 타입,
-            "morphemes": 분석된 형태소 (디버그용)
-        }
+        (D, num_sets, 7) int, 메인 6개 오름차순 + 보너스
     """
-    # 1. 상징 찾기 (형태소 분석 포함)
-    symbols, morphemes = find_symbols_in_dream(dream_text)
-    
-    # 2. 꿈에서 직접 언급된 숫자 추출
-    direct_numbers = extract_numbers_from_dream(dream_text)
-    
-    # 3. 상징에서 숫자 수집
-    symbol_numbers = []
-    for symbol in symbols:
-        symbol_numbers.extend(symbol.get("numbers", []))
-    
-    # 4. 모든 숫자 합치기 (중복 제거, 1-45 범위만)
-    all_candidate_numbers = list(set([n for n in (direct_numbers + symbol_numbers) if 1 <= n <= 45]))
-    
-    # 5. 번호 세트 생성
-    results = []
-    for _ in range(num_sets):
-        # 후보 숫자가 7개 이상이면 그 중에서 선택
-        if len(all_candidate_numbers) >= 7:
-            selected = random.sample(all_candidate_numbers, 7)
-        else:
-            # 부족하면 1-45에서 추가
-            remaining = [n for n in range(1, 46) if n not in all_candidate_numbers]
-            needed = 7 - len(all_candidate_numbers)
-            selected = list(all_candidate_numbers) + random.sample(remaining, needed)
-        
-        main_nums = sorted(selected[:6])
-        bonus = selected[6]
-        
-        results.append(main_nums + [bonus])
-    
-    # 6. 해석 생성 (결론 요약 + 상세 해석)
+    rng = rng or np.random.default_rng()
+    candidates = np.atleast_2d(candidates)
+    keys = rng.random((len(candidates), num_sets, 45))
+    keys += ~candidates[:, None, :]
+    picked = np.argsort(keys, axis=-1)[..., :7] + 1
+    picked[..., :6].sort(axis=-1)
+    return picked
+
+
+def _candidate_mask(direct_numbers: list, symbols: list) -> np.ndarray:
+    """직접 언급된 숫자 + 상징 숫자 (1-45 범위만) → (45,) bool"""
+    mask = np.zeros(45, dtype=bool)
+    numbers = [n for n in direct_numbers + [n for s in symbols for n in s.get("numbers", [])] if 1 <= n <= 45]
+    mask[np.array(numbers, dtype=np.int64) - 1] = True
+    return mask
+
+
+def _build_result(symbols: list, morphemes: list, direct_numbers: list, numbers: list) -> dict:
+    """해석 텍스트 + 응답 dict 구성"""
+    # 해석 생성 (결론 요약 + 상세 해석)
     if symbols:
-        symbol_names = [s["keyword"] for s in symbols]
         fortunes = [s.get("fortune", "행운") for s in symbols]
         main_fortune = max(set(fortunes), key=fortunes.count)
         
-        # 운세 타입별 메시지
-        fortune_messages = {
-            "대박": "대박의 기운이 감지됩니다! 로또 구매를 강력 추천합니다! 🎉",
-            "금전운": "금전운이 있습니다. 당신의 행운을 믿어보세요! 💰",
-            "재물": "재물운이 좋습니다. 재정적 이익이 기대됩니다.",
-            "성공": "성공의 기운이 있습니다. 도전해보세요! ⭐",
-            "행운": "전반적인 행운이 따릅니다. 좋은 일이 생길 거예요.",
-            "시작": "새로운 시작에 좋은 기운입니다.",
-            "변화": "변화의 시기입니다. 과감한 결정이 필요해요."
-        }
-        
         # 길몽/흉몽 판정 (금전운, 대박, 재물, 성공 → 길몽)
         is_good = main_fortune in ["대박", "금전운", "재물", "성공", "행운"]
         dream_type = "길몽" if is_good else "보통"
         
         # 결론 요약
-        summary = f"🌙 해몽 결과: {dream_type}, {main_fortune} => {fortune_messages.get(main_fortune, '행운이 따릅니다.')}"
+        summary = f"🌙 해몽 결과: {dream_type}, {main_fortune} => {FORTUNE_MESSAGES.get(main_fortune, '행운이 따릅니다.')}"
         
         # 상세 해석
         details = "\n\n📖 상세 해석:\n"
@@ -215,44 +127,82 @@ def generate_dream_numbers(dream_text: str, num_sets: int = 1) -> dict:
     return {
         "interpretation": interpretation,
         "symbols_found": [{"keyword": s["keyword"], "meaning": s.get("meaning", "")} for s in symbols],
-        "numbers": results,
+        "numbers": numbers,
         "fortune": main_fortune,
         "direct_numbers": direct_numbers,
         "morphemes": [{"word": form, "pos": tag} for form, tag in morphemes]
     }
 
 
-# LLM 연동 (Gemini API)
-async def generate_dream_numbers_with_llm(
-    dream_text: str, 
-    num_sets: int = 1,
-    api_key: Optional[str] = None
-) -> dict:
+def generate_dream_numbers(dream_text: str, num_sets: int = 1) -> dict:
     """
-    LLM (Gemini)을 활용한 고급 해몽 분석
+    꿈 텍스트 기반 로또 번호 생성 (형태소 분석 + 규칙 기반)
     
-    API 키가 없으면 규칙 기반으로 fallback
+    Args:
+        dream_text: 사용자가 입력한 꿈 내용
+        num_sets: 생성할 세트 수
+    
+    Returns:
+        dict: {
+            "interpretation": 해석 텍스트,
+            "symbols_found": 발견된 상징들,
+            "numbers": [[메인6개, 보너스], ...],
+            "fortune": 운세 타입,
+            "morphemes": 분석된 형태소 (디버그용)
+        }
     """
-    # API 키 확인
-    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    # 1. 상징 찾기 (형태소 분석 포함)
+    symbols, morphemes = find_symbols_in_dream(dream_text)
     
-    if not api_key:
-        # LLM 없이 규칙 기반으로 처리
-        return generate_dream_numbers(dream_text, num_sets)
+    # 2. 꿈에서 직접 언급된 숫자 추출
+    direct_numbers = extract_numbers_from_dream(dream_text)
     
-    try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # 해몽 DB 로드
-        db = load_dream_symbols()
-        symbols_str = json.dumps(db["symbols"], ensure_ascii=False, indent=2)
-        
-        prompt = f"""당신은 한국 전통 꿈 해몽 전문가입니다.
+    # 3. 후보 번호 (직접 언급 + 상징 숫자) 우선으로 세트 생성
+    numbers = sample_dream_numbers(_candidate_mask(direct_numbers, symbols), num_sets)[0]
+    
+    return _build_result(symbols, morphemes, direct_numbers, numbers.tolist())
+
+
+def generate_dream_numbers_batch(dream_texts: List[str], num_sets: int = 1) -> List[dict]:
+    """
+    여러 꿈 한 번에 처리 (generate_dream_numbers와 같은 결과 형식)
+      1. Kiwi 멀티스레드 배치 형태소 분석
+      2. 상징 색인 조회
+      3. 모든 꿈의 세트를 한 번의 벡터 연산으로 생성
+    """
+    morphemes_list = extract_morphemes_batch(dream_texts)
+    index = get_symbol_index()
+    symbols_list = [
+        index.find(text, [form for form, tag in morphemes])
+        for text, morphemes in zip(dream_texts, morphemes_list)
+    ]
+    direct_list = [extract_numbers_from_dream(text) for text in dream_texts]
 
-다음 해몽 상징 데이터베이스를 참조하세요:
+    candidates = np.stack([
+        _candidate_mask(direct, symbols) for direct, symbols in zip(direct_list, symbols_list)
+    ]) if dream_texts else np.zeros((0, 45), dtype=bool)
+    numbers = sample_dream_numbers(candidates, num_sets).tolist()
+
+    return [
+        _build_result(symbols, morphemes, direct, sets)
+        for symbols, morphemes, direct, sets in zip(symbols_list, morphemes_list, direct_list, numbers)
+    ]
+
+
+# LLM 연동 (Gemini API, api/llm_client.py)
+LLM_SYMBOL_FIELDS = ("keyword", "numbers", "meaning", "fortune")
+
+
+def build_llm_prompt(dream_text: str, symbols: list) -> str:
+    """꿈에서 찾은 상징만 압축 JSON으로 넣은 프롬프트 (DB 전체를 넣지 않음)"""
+    symbols_str = json.dumps(
+        [{k: s[k] for k in LLM_SYMBOL_FIELDS if k in s} for s in symbols],
+        ensure_ascii=False, separators=(",", ":"),
+    ) if symbols else "(해당 상징 없음, 일반적인 해몽 지식으로 해석)"
+
+    return f"""당신은 한국 전통 꿈 해몽 전문가입니다.
+
+이 꿈과 관련된 해몽 상징 데이터를 참조하세요:
 {symbols_str}
 
 사용자의 꿈: "{dream_text}"
@@ -268,26 +218,66 @@ async def generate_dream_numbers_with_llm(
 
 반드시 유효한 JSON만 출력하세요."""
 
-        response = model.generate_content(prompt)
+
+async def _ask_llm(client, dream_text: str, key: str, cache) -> dict:
+    """상징 검색 → 프롬프트 → LLM 호출 → JSON 파싱 (성공한 응답만 캐시)"""
+    symbols, _ = await asyncio.to_thread(find_symbols_in_dream, dream_text)
+    response_text = await client.complete(build_llm_prompt(dream_text, symbols))
+    
+    # JSON 파싱 (JSON 부분만 추출)
+    json_match = re.search(r'\{[\s\S]*\}', response_text)
+    if not json_match:
+        raise ValueError("LLM 응답에서 JSON을 찾지 못함")
+    result = json.loads(json_match.group())
+    if cache is not None:
+        await asyncio.to_thread(cache.put, key, result)
+    return result
+
+
+def _cached_llm_result(client, dream_text: str):
+    """캐시 키 계산 + 조회 (SQLite / 상징 색인 stat → 스레드에서 호출)"""
+    cache = get_interpretation_cache()
+    key = cache_key(
+        client.backend.name, client.backend.model_name,
+        repr(get_symbol_index().version), normalize_text(dream_text),
+    )
+    return cache, key, (cache.get(key) if cache is not None else None)
+
+
+async def generate_dream_numbers_with_llm(
+    dream_text: str, 
+    num_sets: int = 1,
+    api_key: Optional[str] = None
+) -> dict:
+    """
+    LLM (Gemini)을 활용한 고급 해몽 분석
+    
+    - 같은 꿈 (정규화 텍스트 기준)은 캐시된 응답 사용 (api/llm_cache.py, TTL)
+    - 같은 꿈이 동시에 들어오면 LLM 호출 한 번을 공유
+    - API 키가 없거나 호출이 실패/시간 초과/서킷 열림이면 규칙 기반으로 fallback
+    """
+    client = get_llm_client(api_key)
+    
+    if client is None:
+        # LLM 없이 규칙 기반으로 처리
+        return await asyncio.to_thread(generate_dream_numbers, dream_text, num_sets)
+    
+    try:
+        cache, key, result = await asyncio.to_thread(_cached_llm_result, client, dream_text)
+        if result is None:
+            result = await single_flight.do(key, lambda: _ask_llm(client, dream_text, key, cache))
         
-        # JSON 파싱
-        response_text = response.text
-        # JSON 부분만 추출
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            result = json.loads(json_match.group())
-            
-            return {
-                "interpretation": result.get("interpretation", ""),
-                "symbols_found": [{"keyword": s} for s in result.get("symbols", [])],
-                "numbers": [result.get("lucky_numbers", [])],
-                "fortune": result.get("fortune", "행운"),
-                "reasoning": result.get("reasoning", ""),
-                "llm_used": True
-            }
+        return {
+            "interpretation": result.get("interpretation", ""),
+            "symbols_found": [{"keyword": s} for s in result.get("symbols", [])],
+            "numbers": [result.get("lucky_numbers", [])],
+            "fortune": result.get("fortune", "행운"),
+            "reasoning": result.get("reasoning", ""),
+            "llm_used": True
+        }
     
     except Exception as e:
         print(f"LLM 호출 실패: {e}, 규칙 기반으로 fallback")
     
     # Fallback to rule-based
-    return generate_dream_numbers(dream_text, num_sets)
+    return await asyncio.to_thread(generate_dream_numbers, dream_text, num_sets)
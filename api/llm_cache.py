@@ -0,0 +1,158 @@
+"""
+LLM 해몽 응답 캐시
+- 정규화한 꿈 텍스트 → 파싱된 LLM 응답 (SQLite, 서버 재시작 후에도 유지, TTL 지나면 다시 호출)
+- 같은 꿈이 동시에 들어오면 진행 중인 호출 하나를 같이 기다림 (single-flight)
+
+사용법:
+    cache = get_interpretation_cache()      # TTL이 0이면 None
+    result = cache.get(key) or await single_flight.do(key, call_llm)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+
+from lotto.util import env_float
+
+CACHE_PATH_ENV = 'LOTTO_LLM_CACHE_PATH'
+CACHE_TTL_ENV = 'LOTTO_LLM_CACHE_TTL'
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "llm_cache.sqlite3"
+
+
+def configured_cache_ttl(default: float = 7 * 24 * 3600) -> float:
+    """LOTTO_LLM_CACHE_TTL (초, 0이면 캐시 사용 안 함)"""
+    return env_float(CACHE_TTL_ENV, default)
+
+
+def cache_key(*parts: str) -> str:
+    """
+    백엔드 이름 + 모델 이름 + 상징 DB 버전 + 정규화 텍스트 → 키
+    (모델이 바뀌거나 dream_symbols.json이 수정되면 예전 응답을 쓰지 않도록)
+    """
+    return hashlib.sha1('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class InterpretationCache:
+    """SQLite TTL 캐시 (스레드 안전, WAL)"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl: float = 7 * 24 * 3600):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS interpretations '
+            '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)'
+        )
+
+        # 지표
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key: str):
+        """캐시된 응답 dict (없거나 TTL 지났으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created FROM interpretations WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and time.time() - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM interpretations WHERE key = ?', (key,))
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict):
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO interpretations (key, value, created) VALUES (?, ?, ?)',
+                (key, data, time.time()),
+            )
+
+    def purge(self) -> int:
+        """TTL 지난 항목 삭제 → 삭제 수"""
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM interpretations WHERE created < ?', (time.time() - self.ttl,)
+            )
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute('SELECT COUNT(*) FROM interpretations').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'size': size,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """키별 진행 중인 작업 공유 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn):
+        """fn() 코루틴 결과 (같은 키로 진행 중인 작업이 있으면 그 결과를 같이 기다림)"""
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+        # 기다리던 요청 하나가 취소돼도 다른 요청이 기다리는 작업은 계속
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        return {'inflight': len(self._inflight), 'calls': self.calls, 'shared': self.shared}
+
+
+single_flight = SingleFlight()
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_interpretation_cache():
+    """프로세스 전역 응답 캐시 (LOTTO_LLM_CACHE_TTL이 0이면 None)"""
+    global _cache
+    ttl = configured_cache_ttl()
+    if ttl == 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = InterpretationCache(os.environ.get(CACHE_PATH_ENV, DEFAULT_CACHE_PATH), ttl)
+        return _cache
+
+
+def llm_cache_stats() -> dict:
+    cache = _cache
+    return {
+        'cache': cache.stats() if cache is not None else None,
+        'single_flight': single_flight.stats(),
+    }
@@ -0,0 +1,240 @@
+"""
+해몽 LLM 클라이언트 (비동기)
+- 백엔드 (Gemini 모델 객체 / 연결)는 프로세스당 한 번 만들어 재사용
+- 호출마다 마감 시간 (asyncio.wait_for), 넘기면 LLMUnavailable → 호출 쪽에서 규칙 기반 fallback
+- 연속 실패가 쌓이면 서킷 브레이커가 열려 한동안 호출하지 않고 바로 fallback
+- LOTTO_LLM_BACKEND=stub이면 로컬 스텁 (지연/실패율 조절, 오프라인 부하 테스트용)
+
+사용법:
+    client = get_llm_client()           # 설정이 없으면 None (규칙 기반만 사용)
+    text = await client.complete(prompt)
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+from typing import Optional
+
+from lotto.util import env_float
+
+BACKEND_ENV = 'LOTTO_LLM_BACKEND'
+TIMEOUT_ENV = 'LOTTO_LLM_TIMEOUT'
+STUB_LATENCY_ENV = 'LOTTO_LLM_STUB_LATENCY_MS'
+STUB_FAILURE_ENV = 'LOTTO_LLM_STUB_FAILURE_RATE'
+GEMINI_MODEL = 'gemini-1.5-flash'
+
+
+def configured_backend() -> str:
+    """LOTTO_LLM_BACKEND (gemini / stub, 기본 gemini)"""
+    return os.environ.get(BACKEND_ENV, 'gemini').strip().lower()
+
+
+def configured_timeout(default: float = 10.0) -> float:
+    """LOTTO_LLM_TIMEOUT (호출당 마감 시간, 초)"""
+    return env_float(TIMEOUT_ENV, default)
+
+
+class LLMUnavailable(RuntimeError):
+    """LLM 응답을 받지 못함 (시간 초과, 오류, 서킷 열림) → 규칙 기반 fallback"""
+
+
+class GeminiBackend:
+    """google.generativeai 비동기 호출 (configure / 모델 객체는 한 번만)"""
+
+    name = 'gemini'
+
+    def __init__(self, api_key: str, model_name: str = GEMINI_MODEL):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+
+class StubBackend:
+    """
+    로컬 스텁 (네트워크 없음)
+
+    Args:
+        latency_ms: 평균 응답 지연
+        jitter_ms: 지연 편차 (균등 분포 ±)
+        failure_rate: 예외를 던질 확률 (0~1)
+    """
+
+    name = 'stub'
+    model_name = 'stub'
+
+    def __init__(self, latency_ms: float = 200.0, jitter_ms: float = 50.0, failure_rate: float = 0.0,
+                 seed: int = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+
+    async def generate(self, prompt: str) -> str:
+        delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        await asyncio.sleep(max(0.0, delay) / 1000)
+        if self._rng.random() < self.failure_rate:
+            raise RuntimeError('stub backend failure')
+        return json.dumps({
+            "interpretation": "스텁 응답입니다. 좋은 기운이 느껴지는 꿈입니다.",
+            "symbols": [],
+            "lucky_numbers": self._rng.sample(range(1, 46), 7),
+            "fortune": "행운",
+            "reasoning": "stub backend",
+        }, ensure_ascii=False)
+
+
+class CircuitBreaker:
+    """
+    연속 실패 failure_threshold번 → open (reset_timeout초 동안 호출 차단)
+    → half-open (시험 호출 1번 허용, 성공하면 closed, 실패하면 다시 open)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._trial = False
+
+    def allow(self) -> bool:
+        if self.state == 'open':
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = 'half-open'
+            self._trial = False
+        if self.state == 'half-open':
+            if self._trial:
+                return False  # 시험 호출 결과를 기다리는 중
+            self._trial = True
+        return True
+
+    def release(self):
+        """결과 없이 끝난 호출 (취소 등): half-open 시험 자리를 돌려줌"""
+        self._trial = False
+
+    def record_success(self):
+        self.state = 'closed'
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == 'open':
+            return  # 열리기 전에 나간 호출들의 실패
+        if self.state == 'half-open' or self.failures >= self.failure_threshold:
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+            self.opens += 1
+
+    def stats(self) -> dict:
+        return {'state': self.state, 'consecutive_failures': self.failures, 'opens': self.opens}
+
+
+class LLMClient:
+    """백엔드 + 마감 시간 + 서킷 브레이커"""
+
+    def __init__(self, backend, timeout: float = 10.0, breaker: CircuitBreaker = None):
+        self.backend = backend
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+
+        # 지표
+        self.calls = 0
+        self.successes = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.total_seconds = 0.0
+
+    async def complete(self, prompt: str) -> str:
+        """프롬프트 → 응답 텍스트 (실패하면 LLMUnavailable)"""
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise LLMUnavailable('circuit open')
+
+        self.calls += 1
+        start = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(self.backend.generate(prompt), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.breaker.record_failure()
+            raise LLMUnavailable(f'timed out after {self.timeout}s')
+        except Exception as e:
+            self.errors += 1
+            self.breaker.record_failure()
+            raise LLMUnavailable(f'{type(e).__name__}: {e}') from e
+        except BaseException:
+            # 취소 (CancelledError)는 성공/실패가 아니므로 시험 자리만 풀고 다시 던짐
+            self.cancelled += 1
+            self.breaker.release()
+            raise
+        finally:
+            self.total_seconds += time.perf_counter() - start
+
+        self.successes += 1
+        self.breaker.record_success()
+        return text
+
+    def stats(self) -> dict:
+        return {
+            'backend': self.backend.name,
+            'timeout': self.timeout,
+            'calls': self.calls,
+            'successes': self.successes,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'rejected': self.rejected,
+            'cancelled': self.cancelled,
+            'avg_latency_ms': round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+            'circuit': self.breaker.stats(),
+        }
+
+
+_clients = {}
+
+
+def get_llm_client(api_key: Optional[str] = None) -> Optional[LLMClient]:
+    """
+    프로세스 전역 클라이언트 (백엔드/API 키별로 한 번만 생성)
+    Gemini인데 API 키가 없거나 라이브러리가 없으면 None
+    """
+    backend_name = configured_backend()
+    if backend_name == 'stub':
+        key = ('stub', None)
+    else:
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            return None
+        key = ('gemini', api_key)
+
+    if key not in _clients:
+        if backend_name == 'stub':
+            backend = StubBackend(
+                latency_ms=env_float(STUB_LATENCY_ENV, 200.0),
+                failure_rate=env_float(STUB_FAILURE_ENV, 0.0),
+            )
+        else:
+            try:
+                backend = GeminiBackend(api_key)
+            except ImportError:
+                print("⚠️ google-generativeai not installed. Using rule-based dream numbers.")
+                _clients[key] = None
+                return None
+        _clients[key] = LLMClient(backend, timeout=configured_timeout())
+    return _clients[key]
+
+
+def llm_stats() -> list:
+    """생성된 클라이언트 지표 (API 키는 노출하지 않음)"""
+    return [client.stats() for client in _clients.values() if client is not None]
@@ -0,0 +1,203 @@
+"""
+Kiwi 형태소 분석기 (지연 생성) + 분석 결과 캐시
+- Kiwi()는 처음 쓸 때 생성 (import만으로 수 초 / 수백 MB를 쓰지 않도록)
+- 서버 시작 시 백그라운드 스레드로 미리 생성 가능 (LOTTO_KIWI_WARMUP, 준비를 막지 않음)
+- 정규화한 텍스트 → 명사/동사/형용사 형태소 LRU 캐시 (LOTTO_MORPHEME_CACHE_SIZE)
+- 여러 텍스트는 Kiwi 멀티스레드 배치 분석 (LOTTO_KIWI_WORKERS)
+
+사용법:
+    warm_up_kiwi()                      # 서버 시작 시 (선택)
+    extract_morphemes('뱀에게 물려서')  # [('뱀', 'NNG'), ('물리다', 'VV')]
+    extract_morphemes_batch(texts)      # 텍스트별 형태소 리스트
+"""
+
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from importlib.util import find_spec
+from typing import List, Tuple
+
+from lotto.util import env_int
+
+KIWI_AVAILABLE = find_spec('kiwipiepy') is not None
+if not KIWI_AVAILABLE:
+    print("⚠️ Kiwi not installed. Using simple keyword matching.")
+
+WARMUP_ENV = 'LOTTO_KIWI_WARMUP'
+CACHE_SIZE_ENV = 'LOTTO_MORPHEME_CACHE_SIZE'
+WORKERS_ENV = 'LOTTO_KIWI_WORKERS'
+MORPHEME_TAGS = ('NN', 'VV', 'VA')  # 명사, 동사, 형용사만 사용
+
+_kiwi = None
+_kiwi_lock = threading.Lock()
+_kiwi_state = 'idle' if KIWI_AVAILABLE else 'unavailable'
+
+
+def configured_warmup() -> bool:
+    """LOTTO_KIWI_WARMUP (기본 켜짐, 0/false면 첫 /dream 요청 때 생성)"""
+    return os.environ.get(WARMUP_ENV, '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def configured_cache_size(default: int = 4096) -> int:
+    """LOTTO_MORPHEME_CACHE_SIZE (0이면 캐시 사용 안 함)"""
+    return env_int(CACHE_SIZE_ENV, default)
+
+
+def configured_kiwi_workers(default: int = -1) -> int:
+    """LOTTO_KIWI_WORKERS (배치 분석 스레드 수, -1이면 모든 코어, 0이면 단일 스레드)"""
+    return env_int(WORKERS_ENV, default, minimum=-1)
+
+
+def get_kiwi():
+    """프로세스 전역 Kiwi (처음 호출 때 생성, 설치 안 됐거나 생성 실패면 None)"""
+    global _kiwi, _kiwi_state
+    if _kiwi is not None or not KIWI_AVAILABLE:
+        return _kiwi
+    with _kiwi_lock:
+        if _kiwi is None and _kiwi_state != 'failed':
+            _kiwi_state = 'loading'
+            try:
+                from kiwipiepy import Kiwi
+                _kiwi = Kiwi(num_workers=configured_kiwi_workers())
+                _kiwi_state = 'ready'
+            except Exception as e:
+                _kiwi_state = 'failed'
+                print(f"⚠️ Kiwi init failed ({e}). Using simple keyword matching.")
+    return _kiwi
+
+
+def kiwi_state() -> str:
+    """idle / loading / ready / failed / unavailable"""
+    return _kiwi_state
+
+
+def warm_up_kiwi(background: bool = True):
+    """Kiwi 생성 + 첫 분석을 미리 실행 (background면 스레드에서, 호출은 바로 반환)"""
+    def run():
+        kiwi = get_kiwi()
+        if kiwi is not None:
+            kiwi.analyze('꿈에서 돼지를 보았다')
+            print("✅ Kiwi ready")
+
+    if not KIWI_AVAILABLE:
+        return None
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name='kiwi-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키: NFC 정규화 + 공백 정리 (입력기/복붙 차이로 달라지는 텍스트를 같은 키로)"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class MorphemeCache:
+    """정규화 텍스트 → 형태소 튜플 LRU (스레드 안전)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: tuple):
+        if self.capacity == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'kiwi': _kiwi_state,
+            'size': len(self._entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+morpheme_cache = MorphemeCache(configured_cache_size())
+
+
+def _filter_tokens(tokens) -> tuple:
+    return tuple((token.form, token.tag) for token in tokens if token.tag.startswith(MORPHEME_TAGS))
+
+
+def extract_morphemes(text: str) -> List[Tuple[str, str]]:
+    """
+    텍스트에서 형태소 추출 (Kiwi 사용, 결과 캐시)
+
+    Returns:
+        List of (원형, 품사) 튜플
+        예: "뱀에게 물려서" → [("뱀", "NNG"), ("물리다", "VV")]
+
+    품사 태그:
+        NNG: 일반명사, NNP: 고유명사
+        VV: 동사, VA: 형용사
+    """
+    kiwi = get_kiwi()
+    if kiwi is None:
+        return []
+
+    key = normalize_text(text)
+    morphemes = morpheme_cache.get(key)
+    if morphemes is None:
+        result = kiwi.analyze(key)
+        # 첫 번째 분석 결과 사용
+        morphemes = _filter_tokens(result[0][0]) if result else ()
+        morpheme_cache.put(key, morphemes)
+    return list(morphemes)
+
+
+def extract_morphemes_batch(texts: List[str]) -> List[List[Tuple[str, str]]]:
+    """
+    여러 텍스트 형태소 추출 (캐시에 없는 텍스트만 Kiwi 멀티스레드 배치 분석)
+
+    Returns:
+        texts와 같은 순서의 (원형, 품사) 리스트들
+    """
+    kiwi = get_kiwi()
+    if kiwi is None:
+        return [[] for _ in texts]
+
+    keys = [normalize_text(text) for text in texts]
+    found = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        morphemes = morpheme_cache.get(key)
+        if morphemes is None:
+            missing.append(key)
+        else:
+            found[key] = morphemes
+
+    if missing:
+        # 텍스트 목록을 넘기면 Kiwi 내부 스레드 풀에서 병렬 분석 (입력 순서대로 결과 반환)
+        for key, result in zip(missing, kiwi.analyze(missing)):
+            morphemes = _filter_tokens(result[0][0]) if result else ()
+            morpheme_cache.put(key, morphemes)
+            found[key] = morphemes
+    return [list(found[key]) for key in keys]
@@ -0,0 +1,176 @@
+"""
+해몽 상징 DB 색인
+- 키워드 (keyword + variants) → 상징 위치 해시 색인: 형태소 원형 조회
+- Aho-Corasick 오토마톤: 원문 부분 문자열 검색 (2글자 이상 키워드)
+- 조회 비용은 꿈 텍스트 길이에 비례 (DB 크기 × 변형 수와 무관)
+- dream_symbols.json이 바뀌면 (mtime/size) 다음 조회 때 다시 빌드
+"""
+
+import json
+import threading
+from collections import deque
+from pathlib import Path
+
+from lotto.util import file_version
+
+SYMBOLS_PATH = Path(__file__).parent.parent / "data" / "dream_symbols.json"
+EMPTY_DB = {"symbols": [], "fortune_types": {}}
+MIN_SUBSTRING_LEN = 2  # 원문 직접 검색은 2글자 이상 키워드만 (오탐 방지)
+
+
+class AhoCorasick:
+    """
+    다중 패턴 부분 문자열 검색 오토마톤 (순수 Python)
+
+    사용법:
+        ac = AhoCorasick()
+        ac.add('뱀', 0); ac.add('돼지', 1)
+        ac.build()
+        ac.search('뱀과 돼지')   # {0, 1}
+    """
+
+    def __init__(self):
+        self._goto = [{}]     # 상태 → {문자: 다음 상태}
+        self._fail = [0]
+        self._output = [()]   # 상태 → 이 상태에서 끝나는 패턴 값들 (fail 경로 포함)
+
+    def add(self, pattern: str, value):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = nxt
+        self._output[state] = self._output[state] + (value,)
+
+    def build(self):
+        """fail 링크 계산 (BFS), 출력은 fail 상태의 출력까지 합쳐둠"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+        return self
+
+    def search(self, text: str) -> set:
+        """text에 나타나는 패턴들의 값 집합"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class SymbolIndex:
+    """
+    dream_symbols.json 색인 (파일이 바뀌면 자동 재빌드)
+
+    사용법:
+        index = get_symbol_index()
+        symbols = index.find('뱀에게 물리는 꿈', ['뱀', '물리다'])
+    """
+
+    def __init__(self, path=SYMBOLS_PATH):
+        self.path = Path(path)
+        self._version = None
+        self._lock = threading.Lock()
+        self.db = EMPTY_DB
+        self.symbols = []
+        self.keyword_index = {}
+        self.automaton = AhoCorasick().build()
+
+    @property
+    def version(self):
+        """빌드에 쓴 파일 버전 (mtime_ns, size), 파일이 없으면 None"""
+        return self._version
+
+    def refresh(self):
+        """파일 버전이 바뀌었으면 다시 빌드"""
+        version = file_version(self.path)
+        if version == self._version:
+            return self
+        with self._lock:
+            if version != self._version:
+                self._build(version)
+        return self
+
+    def _build(self, version):
+        db = EMPTY_DB
+        if version is not None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                db = json.load(f)
+
+        symbols = db.get("symbols", [])
+        keyword_index = {}
+        automaton = AhoCorasick()
+        for position, symbol in enumerate(symbols):
+            for kw in dict.fromkeys([symbol["keyword"]] + symbol.get("variants", [])):
+                keyword_index.setdefault(kw, []).append(position)
+                if len(kw) >= MIN_SUBSTRING_LEN:
+                    automaton.add(kw, position)
+        automaton.build()
+
+        # 조회 중인 스레드가 반쯤 바뀐 상태를 보지 않도록 한 번에 교체
+        self.db, self.symbols, self.keyword_index, self.automaton = db, symbols, keyword_index, automaton
+        self._version = version
+
+    def match_words(self, words) -> set:
+        """형태소 원형 목록과 키워드가 일치하는 상징 위치"""
+        index = self.keyword_index
+        found = set()
+        for word in words:
+            found.update(index.get(word, ()))
+        return found
+
+    def match_text(self, text: str) -> set:
+        """원문에 부분 문자열로 나타나는 키워드 (2글자 이상)의 상징 위치"""
+        return self.automaton.search(text)
+
+    def find(self, dream_text: str, words) -> list:
+        """
+        상징 찾기 (find_symbols_in_dream과 같은 규칙)
+          1. 형태소 원형이 키워드와 일치하는 상징 (DB 순서)
+          2. 1에서 2개 미만이면 원문 부분 문자열 검색 결과를 DB 순서로 추가
+        """
+        self.refresh()
+        symbols = self.symbols
+        found, found_ids = [], set()
+
+        def collect(positions):
+            for p in sorted(positions):
+                if symbols[p]["id"] not in found_ids:
+                    found.append(symbols[p])
+                    found_ids.add(symbols[p]["id"])
+
+        if words:
+            collect(self.match_words(words))
+        if len(found) < 2:
+            collect(self.match_text(dream_text))
+        return found
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """프로세스 전역 상징 색인"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SymbolIndex()
+        return _index.refresh()
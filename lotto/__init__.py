@@ -0,0 +1,7 @@
+# Lotto 공통 유틸 패키지
+from .encoding import (
+    NUM_COMBINATIONS, tickets_to_ranks, ranks_to_tickets, tickets_to_masks, masks_to_tickets, popcount
+)
+
+__all__ = ['NUM_COMBINATIONS', 'tickets_to_ranks', 'ranks_to_tickets', 'tickets_to_masks',
+           'masks_to_tickets', 'popcount']
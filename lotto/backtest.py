@@ -0,0 +1,184 @@
+"""
+과거 회차 백테스트
+- 티켓 (M, 6)을 전체 회차와 비교해서 등수별 당첨 횟수 계산
+- 티켓/회차를 45비트 마스크로 바꿔 AND + popcount (티켓 × 회차 벡터화)
+- 티켓이 많으면 청크로 나눠 여러 프로세스에서 계산
+
+등수: 5등(3개) / 4등(4개) / 3등(5개) / 2등(5개 + 보너스) / 1등(6개)
+"""
+
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lotto.encoding import NUM_COMBINATIONS, popcount, tickets_to_masks
+
+TIERS = ('3', '4', '5', '5+bonus', '6')
+TIER_NAMES = ('5등', '4등', '3등', '2등', '1등')
+
+# 무작위 티켓 1장이 한 회차에서 각 등수에 당첨될 확률
+TIER_PROBS = np.array([182_780, 11_115, 228, 6, 1], dtype=np.float64) / NUM_COMBINATIONS
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'draws.json')
+
+
+def draw_masks(draws: np.ndarray) -> tuple:
+    """(N, 7) 회차 → (메인 마스크 (N,), 보너스 마스크 (N,)) uint64"""
+    draws = np.asarray(draws)
+    main_masks = tickets_to_masks(draws[:, :6])
+    bonus_masks = np.left_shift(np.uint64(1), draws[:, 6].astype(np.uint64) - np.uint64(1))
+    return main_masks, bonus_masks
+
+
+def _tier_counts(ticket_masks: np.ndarray, main_masks: np.ndarray, bonus_masks: np.ndarray,
+                 chunk_size: int) -> np.ndarray:
+    """티켓 마스크 전체 × 회차 → (N, 5) 회차별 등수 당첨 수"""
+    num_draws = len(main_masks)
+    counts = np.zeros((num_draws, len(TIERS)), dtype=np.int64)
+    chunk_size = min(chunk_size, 65_535)  # 회차별 합계를 uint16으로 누적
+
+    # 청크마다 새로 할당하지 않도록 버퍼 재사용
+    anded = np.empty((chunk_size, num_draws), dtype=np.uint64)
+    at_least = np.empty((chunk_size, num_draws), dtype=bool)
+
+    for start in range(0, len(ticket_masks), chunk_size):
+        chunk = ticket_masks[start:start + chunk_size, None]
+        n = len(chunk)
+        np.bitwise_and(chunk, main_masks, out=anded[:n])
+        m = popcount(anded[:n])                                # (n, N) uint8
+
+        # 회차별 k개 이상 맞은 티켓 수 (k = 3, 4, 5, 6)
+        ge = np.empty((4, num_draws), dtype=np.int64)
+        for i, k in enumerate(range(3, 7)):
+            np.greater_equal(m, k, out=at_least[:n])
+            ge[i] = at_least[:n].view(np.uint8).sum(axis=0, dtype=np.uint16)
+
+        exact = ge.copy()                                      # 정확히 3, 4, 5, 6개
+        exact[:-1] -= ge[1:]
+        # 5개 맞은 티켓은 드물어서 해당 회차 열만 골라 보너스 확인
+        five_bonus = np.zeros(num_draws, dtype=np.int64)
+        cols = np.nonzero(exact[2])[0]
+        if len(cols):
+            t_idx, c_idx = np.nonzero(m[:, cols] == 5)
+            with_bonus = (chunk[t_idx, 0] & bonus_masks[cols[c_idx]]) != 0
+            np.add.at(five_bonus, cols[c_idx[with_bonus]], 1)
+
+        counts[:, 0] += exact[0]
+        counts[:, 1] += exact[1]
+        counts[:, 2] += exact[2] - five_bonus
+        counts[:, 3] += five_bonus
+        counts[:, 4] += exact[3]
+    return counts
+
+
+def backtest(tickets, draws, workers: int = None, chunk_size: int = 4096,
+             parallel_threshold: int = 200_000) -> np.ndarray:
+    """
+    티켓 배열을 전체 회차에 대해 채점
+
+    Args:
+        tickets: (M, 6) 또는 (M, 7) 번호 (보너스 열은 무시)
+        draws: (N, 7) 회차 (메인 6개 + 보너스)
+        workers: 프로세스 수 (기본: CPU 수). 티켓이 parallel_threshold 미만이면 현재 프로세스에서 계산
+        chunk_size: 한 번에 비교할 티켓 수 (메모리 ≈ chunk_size × N 바이트)
+
+    Returns:
+        (N, 5) int64 - 회차별 [5등, 4등, 3등, 2등, 1등] 당첨 티켓 수
+    """
+    ticket_masks = tickets_to_masks(np.asarray(tickets)[:, :6])
+    main_masks, bonus_masks = draw_masks(draws)
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(ticket_masks) < parallel_threshold:
+        return _tier_counts(ticket_masks, main_masks, bonus_masks, chunk_size)
+
+    parts = np.array_split(ticket_masks, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_tier_counts, part, main_masks, bonus_masks, chunk_size) for part in parts]
+        return sum(future.result() for future in futures)
+
+
+def summarize(counts: np.ndarray, num_tickets: int, draw_no: np.ndarray = None) -> dict:
+    """
+    backtest 결과 요약
+
+    Returns:
+        {'tickets', 'draws', 'tiers': {등수: {'hits', 'per_ticket_draw', 'vs_random'}}, 'best_draw'}
+        vs_random: 무작위 티켓 기대값 대비 비율 (1.0이면 무작위와 같음)
+    """
+    num_draws = len(counts)
+    totals = counts.sum(axis=0)
+    trials = max(num_tickets * num_draws, 1)
+    tiers = {}
+    for i, tier in enumerate(TIERS):
+        rate = totals[i] / trials
+        tiers[tier] = {
+            'hits': int(totals[i]),
+            'per_ticket_draw': float(rate),
+            'vs_random': float(rate / TIER_PROBS[i]),
+        }
+
+    report = {'tickets': int(num_tickets), 'draws': int(num_draws), 'tiers': tiers}
+    if num_draws:
+        # 높은 등수 우선으로 가장 많이 맞은 회차
+        best = int(np.lexsort(counts.T)[-1])
+        report['best_draw'] = {
+            'draw_no': int(draw_no[best]) if draw_no is not None else best,
+            'hits': dict(zip(TIERS, counts[best].tolist())),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='과거 회차 백테스트')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--tickets', help='티켓 파일 (bulk_generate 출력)')
+    source.add_argument('--random', type=int, metavar='N', help='무작위 티켓 N개로 기준선 측정')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='draws.json 경로')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--chunk-size', type=int, default=4096, help='한 번에 비교할 티켓 수')
+    args = parser.parse_args()
+
+    from models.draw_store import get_draw_store
+
+    if args.tickets:
+        from models.bulk_generate import read_tickets
+        tickets = read_tickets(args.tickets)
+        label = args.tickets
+    else:
+        from models.tickets import sample_random
+        tickets = sample_random(args.random)
+        label = f'random × {args.random:,}'
+
+    snapshot = get_draw_store(args.data).snapshot()
+
+    print('=' * 60)
+    print('📈 과거 회차 백테스트')
+    print('=' * 60)
+    print(f'   티켓: {label} ({len(tickets):,}개)')
+    print(f'   회차: {snapshot.draw_no[0]}~{snapshot.draw_no[-1]}회 ({len(snapshot.draws):,}개)')
+    print('=' * 60)
+
+    start = time.perf_counter()
+    counts = backtest(tickets, snapshot.draws, workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    report = summarize(counts, len(tickets), snapshot.draw_no)
+
+    print(f'\n{"등수":<6}{"조건":<10}{"당첨 수":>14}{"무작위 대비":>12}')
+    print('-' * 44)
+    for name, tier in zip(TIER_NAMES, TIERS):
+        stats = report['tiers'][tier]
+        print(f'{name:<6}{tier:<10}{stats["hits"]:>14,}{stats["vs_random"]:>11.3f}x')
+    print('-' * 44)
+    if 'best_draw' in report:
+        best = report['best_draw']
+        print(f'🏆 최다 당첨 회차: {best["draw_no"]}회 {best["hits"]}')
+    print(f'⏱️ {len(tickets) * len(snapshot.draws):,}쌍 / {elapsed:.2f}s')
+    return report
+
+
+if __name__ == '__main__':
+    main()
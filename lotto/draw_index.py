@@ -0,0 +1,100 @@
+"""
+번호 → 회차 역색인 (비트셋)
+- 번호별 (45개) 메인 출현 비트셋 + 보너스 비트셋, 회차 인덱스 i → 비트 i
+- "7과 23이 나오고 40은 안 나온 2015~2020년 회차" = 비트셋 AND / AND NOT + 구간 마스크
+- 요청 경로에서 JSON을 읽지 않음 (회차 추가 시 새 비트만 설정)
+"""
+
+import numpy as np
+
+from lotto.encoding import NUM_BALLS
+from lotto.history import HistoryIndex
+from lotto.util import grow_capacity
+
+WORD_BITS = 64
+
+
+def _words(num_bits: int) -> int:
+    return (num_bits + WORD_BITS - 1) // WORD_BITS
+
+
+def _set_bits(bitsets: np.ndarray, numbers: np.ndarray, draw_ids: np.ndarray):
+    """bitsets[number - 1]의 draw_id 비트 설정 (numbers, draw_ids 같은 shape)"""
+    numbers = numbers.astype(np.int64).ravel() - 1
+    draw_ids = draw_ids.astype(np.int64).ravel()
+    bits = np.left_shift(np.uint64(1), (draw_ids % WORD_BITS).astype(np.uint64))
+    np.bitwise_or.at(bitsets, (numbers, draw_ids // WORD_BITS), bits)
+
+
+class DrawIndex(HistoryIndex):
+    """
+    회차 검색용 비트셋 색인
+
+    사용법:
+        index = DrawIndex(get_draw_store('data/draws.json')).sync()
+        index.search(include=[7, 23], exclude=[40], start_date='2015-01-01', end_date='2020-12-31')
+    """
+
+    def _reset(self):
+        self.main_bits = np.zeros((NUM_BALLS, 0), dtype=np.uint64)
+        self.bonus_bits = np.zeros((NUM_BALLS, 0), dtype=np.uint64)
+
+    def _append(self, draws: np.ndarray):
+        start = len(self.draws)
+        total = start + len(draws)
+        if _words(total) > self.main_bits.shape[1]:
+            capacity = grow_capacity(_words(total), self.main_bits.shape[1])
+            pad = ((0, 0), (0, capacity - self.main_bits.shape[1]))
+            self.main_bits = np.pad(self.main_bits, pad)
+            self.bonus_bits = np.pad(self.bonus_bits, pad)
+
+        draw_ids = np.arange(start, total)
+        _set_bits(self.main_bits, draws[:, :6], np.repeat(draw_ids, 6))
+        _set_bits(self.bonus_bits, draws[:, 6], draw_ids)
+
+    def _range_bits(self, lo: int, hi: int) -> np.ndarray:
+        """[lo, hi) 구간 비트셋"""
+        in_range = np.zeros(self.main_bits.shape[1] * WORD_BITS, dtype=bool)
+        in_range[lo:hi] = True
+        return np.packbits(in_range, bitorder='little').view(np.uint64)
+
+    def match(self, include=(), exclude=(), bonus: int = None, start_date=None, end_date=None) -> np.ndarray:
+        """조건을 만족하는 회차 인덱스 (오름차순)"""
+        for n in list(include) + list(exclude) + ([bonus] if bonus is not None else []):
+            if not 1 <= int(n) <= NUM_BALLS:
+                raise ValueError(f'Invalid number: {n}')
+
+        lo, hi = self.draw_range(start_date=start_date, end_date=end_date)
+        acc = self._range_bits(lo, hi)
+        for n in include:
+            acc &= self.main_bits[int(n) - 1]
+        for n in exclude:
+            acc &= ~self.main_bits[int(n) - 1]
+        if bonus is not None:
+            acc &= self.bonus_bits[int(bonus) - 1]
+        return np.flatnonzero(np.unpackbits(acc.view(np.uint8), bitorder='little'))
+
+    def search(self, include=(), exclude=(), bonus: int = None, start_date=None, end_date=None,
+               page: int = 1, page_size: int = 20) -> dict:
+        """
+        회차 검색 (최신 회차 먼저, 페이지 단위)
+
+        Returns:
+            {'total', 'page', 'page_size', 'draws': [{'draw_no', 'date', 'numbers', 'bonus'}, ...]}
+        """
+        ids = self.match(include, exclude, bonus, start_date, end_date)[::-1]
+        page_ids = ids[(page - 1) * page_size:page * page_size]
+        return {
+            'total': int(len(ids)),
+            'page': page,
+            'page_size': page_size,
+            'draws': [
+                {
+                    'draw_no': int(self.draw_no[i]),
+                    'date': str(self.dates[i]),
+                    'numbers': self.draws[i, :6].tolist(),
+                    'bonus': int(self.draws[i, 6]),
+                }
+                for i in page_ids
+            ],
+        }
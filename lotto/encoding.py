@@ -0,0 +1,122 @@
+"""
+티켓 인코딩 (6/45 조합 ↔ 정수)
+
+- 조합 순위 (combinatorial rank): 오름차순 6개 ↔ 0 ~ 8,145,059 (int32에 들어감)
+  colex 순서: rank = Σ C(n_i - 1, i + 1), n_0 < n_1 < ... < n_5
+- 비트 마스크: 번호 n → 비트 (n - 1), 45비트 (NumPy uint64 / torch int64)
+
+NumPy 배열과 torch 텐서 모두 배치로 처리 (입력과 같은 타입/디바이스로 반환)
+"""
+
+from math import comb
+
+import numpy as np
+
+try:
+    import torch
+except ImportError:  # numpy만으로도 사용 가능
+    torch = None
+
+NUM_BALLS = 45
+PICK = 6
+NUM_COMBINATIONS = comb(NUM_BALLS, PICK)  # 8,145,060
+
+# BINOMIAL[c, i] = C(c, i), c = 0..45, i = 0..6
+BINOMIAL = np.array([[comb(c, i) for i in range(PICK + 1)] for c in range(NUM_BALLS + 1)], dtype=np.int64)
+
+_torch_tables = {}
+
+
+def _is_torch(x) -> bool:
+    return torch is not None and isinstance(x, torch.Tensor)
+
+
+def _torch_binomial(device):
+    table = _torch_tables.get(device)
+    if table is None:
+        table = torch.from_numpy(BINOMIAL).to(device)
+        _torch_tables[device] = table
+    return table
+
+
+def tickets_to_ranks(tickets):
+    """
+    (M, 6) 티켓 (1~45) → (M,) 조합 순위 int32
+    정렬되지 않은 입력도 내부에서 정렬. (M, k) 부분 조합 (쌍/삼중)이면 0 ~ C(45, k) - 1
+    """
+    if _is_torch(tickets):
+        idx = tickets.long().sort(dim=-1).values - 1
+        table = _torch_binomial(idx.device)
+        cols = torch.arange(1, idx.shape[-1] + 1, device=idx.device)
+        return table[idx, cols].sum(dim=-1).to(torch.int32)
+
+    idx = np.sort(np.asarray(tickets, dtype=np.int64), axis=-1) - 1
+    return BINOMIAL[idx, np.arange(1, idx.shape[-1] + 1)].sum(axis=-1).astype(np.int32)
+
+
+def ranks_to_tickets(ranks, pick: int = PICK):
+    """(M,) 조합 순위 → (M, pick) 오름차순 티켓 (1~45) uint8"""
+    if _is_torch(ranks):
+        r = ranks.long().clone()
+        table = _torch_binomial(r.device)
+        tickets = torch.empty(r.shape + (pick,), dtype=torch.uint8, device=r.device)
+        for i in range(pick, 0, -1):
+            # C(c, i) ≤ r 를 만족하는 가장 큰 c (C(c, i)는 c에 대해 단조 증가)
+            c = (r.unsqueeze(-1) >= table[:NUM_BALLS, i]).sum(dim=-1) - 1
+            r -= table[c, i]
+            tickets[..., i - 1] = (c + 1).to(torch.uint8)
+        return tickets
+
+    r = np.array(ranks, dtype=np.int64)
+    tickets = np.empty(r.shape + (pick,), dtype=np.uint8)
+    for i in range(pick, 0, -1):
+        c = (r[..., None] >= BINOMIAL[:NUM_BALLS, i]).sum(axis=-1) - 1
+        r -= BINOMIAL[c, i]
+        tickets[..., i - 1] = c + 1
+    return tickets
+
+
+def tickets_to_masks(tickets):
+    """(M, k) 번호 (1~45) → (M,) 비트 마스크 (NumPy uint64 / torch int64)"""
+    if _is_torch(tickets):
+        bits = torch.bitwise_left_shift(torch.ones_like(tickets, dtype=torch.int64), tickets.long() - 1)
+        return bits.sum(dim=-1)  # 번호가 서로 다르므로 합 == OR
+
+    bits = np.left_shift(np.uint64(1), np.asarray(tickets).astype(np.uint64) - np.uint64(1))
+    return np.bitwise_or.reduce(bits, axis=-1)
+
+
+def masks_to_tickets(masks, pick: int = PICK):
+    """(M,) 비트 마스크 → (M, pick) 오름차순 번호 (1~45) uint8, 마스크당 비트 수는 pick개여야 함"""
+    if _is_torch(masks):
+        shifts = torch.arange(NUM_BALLS, device=masks.device)
+        bits = torch.bitwise_right_shift(masks.long().unsqueeze(-1), shifts) & 1
+        numbers = torch.nonzero(bits.reshape(-1, NUM_BALLS))[:, 1] + 1
+        return numbers.reshape(masks.shape + (pick,)).to(torch.uint8)
+
+    masks = np.asarray(masks, dtype=np.uint64)
+    bits = (masks[..., None] >> np.arange(NUM_BALLS, dtype=np.uint64)) & np.uint64(1)
+    numbers = np.nonzero(bits.reshape(-1, NUM_BALLS))[1] + 1
+    return numbers.reshape(masks.shape + (pick,)).astype(np.uint8)
+
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(masks):
+    """비트 마스크의 1 개수 (NumPy는 uint8, torch는 int64)"""
+    if _is_torch(masks):
+        # SWAR: 2비트 → 4비트 → 바이트 단위 합 후 바이트끼리 더함 (마스크는 음수가 아님)
+        x = masks.long()
+        x = x - ((x >> 1) & 0x5555555555555555)
+        x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+        x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+        x = x + (x >> 8)
+        x = x + (x >> 16)
+        x = x + (x >> 32)
+        return x & 0x7F
+
+    masks = np.asarray(masks, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):  # NumPy 2.0+
+        return np.bitwise_count(masks)
+    return _POPCOUNT_TABLE[masks.view(np.uint8).reshape(masks.shape + (8,))].sum(axis=-1, dtype=np.uint8)
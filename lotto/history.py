@@ -0,0 +1,92 @@
+"""
+회차 이력 인덱스 공통 베이스
+- DrawStore 스냅샷에서 인덱스를 만들고, 회차가 뒤에 추가되면 추가분만 반영
+- 기존 회차가 바뀐 경우 (수정/재정렬)만 전체 재구축
+- 회차 범위 (최근 K회 / 날짜 구간) → 배열 인덱스 변환
+"""
+
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class HistoryIndex:
+    """
+    증분 갱신되는 회차 인덱스 (하위 클래스가 _reset, _append 구현)
+
+    사용법:
+        index = FrequencyIndex(get_draw_store('data/draws.json'))
+        index.sync()        # 바뀐 회차만 반영
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.version = None
+        self.draws = np.zeros((0, 7), dtype=np.uint8)
+        self.draw_no = np.zeros(0, dtype=np.int32)
+        self.dates = np.zeros(0, dtype='datetime64[D]')
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self.draws)
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def _append(self, draws: np.ndarray):
+        """새 회차 (n, 7) 반영 (호출 시점의 self.draws는 이미 반영된 회차)"""
+        raise NotImplementedError
+
+    def sync(self):
+        """스토어 버전이 바뀌었으면 추가된 회차만 반영 (기존 회차가 바뀌었으면 재구축)"""
+        snapshot = self.store.snapshot()
+        if snapshot.version == self.version:
+            return self
+        with self._lock:
+            if snapshot.version == self.version:
+                return self
+            old = len(self.draws)
+            draws = np.asarray(snapshot.draws)
+            if len(draws) < old or not np.array_equal(draws[:old], self.draws):
+                self._reset()
+                self.draws = self.draws[:0]
+                old = 0
+            if len(draws) > old:
+                self._append(draws[old:])
+            self.draws = np.array(draws)
+            self.draw_no = np.array(snapshot.draw_no)
+            self.dates = np.array(snapshot.dates)
+            self.version = snapshot.version
+        return self
+
+    @contextmanager
+    def synced(self):
+        """
+        sync 후 잠금을 잡은 채로 조회 (version과 배열이 같은 스냅샷)
+
+            with index.synced():
+                key = index.version
+                freq = index.frequency(last=100)
+        """
+        self.sync()
+        with self._lock:
+            yield self
+
+    def draw_range(self, last: int = None, start_date=None, end_date=None) -> tuple:
+        """
+        조회 구간 → 배열 인덱스 [lo, hi)
+
+        Args:
+            last: 최근 K회 (날짜 구간 적용 후)
+            start_date, end_date: 'YYYY-MM-DD' (양 끝 포함)
+        """
+        lo, hi = 0, len(self.draws)
+        if start_date is not None:
+            lo = int(np.searchsorted(self.dates, np.datetime64(start_date, 'D'), side='left'))
+        if end_date is not None:
+            hi = int(np.searchsorted(self.dates, np.datetime64(end_date, 'D'), side='right'))
+        if last is not None:
+            lo = max(lo, hi - max(int(last), 0))
+        return lo, max(lo, hi)
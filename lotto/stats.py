@@ -0,0 +1,92 @@
+"""
+번호별 출현 빈도 인덱스 (누적합)
+- counts[i] = 앞에서부터 i개 회차의 번호별 출현 수, (N+1, 45)
+- 임의 구간 빈도 = counts[hi] - counts[lo] → O(45)
+- 회차가 추가되면 마지막 누적값에 이어서 행만 추가
+"""
+
+import numpy as np
+
+from lotto.history import HistoryIndex
+from lotto.util import grow_capacity
+
+NUM_BALLS = 45
+
+
+def _one_hot(numbers: np.ndarray) -> np.ndarray:
+    """(n, k) 번호 (1~45) → (n, 45) int32 출현 표시"""
+    numbers = np.asarray(numbers, dtype=np.int64).reshape(len(numbers), -1)
+    hot = np.zeros((len(numbers), NUM_BALLS), dtype=np.int32)
+    np.put_along_axis(hot, numbers - 1, 1, axis=1)
+    return hot
+
+
+def _grow(buf: np.ndarray, used: int, capacity: int) -> np.ndarray:
+    """앞 used행을 복사한 (capacity, 45) 새 버퍼"""
+    grown = np.zeros((capacity, buf.shape[1]), dtype=buf.dtype)
+    grown[:used] = buf[:used]
+    return grown
+
+
+class FrequencyIndex(HistoryIndex):
+    """
+    메인/보너스 번호 누적 빈도표
+
+    사용법:
+        index = FrequencyIndex(get_draw_store('data/draws.json')).sync()
+        index.frequency(last=100)          # 최근 100회 번호별 출현 수 (45,)
+        index.draws_since_last_seen()      # 번호별 미출현 회차 수 (45,)
+    """
+
+    def _reset(self):
+        # 행 여유분을 둔 버퍼, counts/bonus_counts는 사용 중인 앞부분 뷰
+        self._main_buf = np.zeros((1, NUM_BALLS), dtype=np.int32)
+        self._bonus_buf = np.zeros((1, NUM_BALLS), dtype=np.int32)
+        self.counts = self._main_buf[:1]
+        self.bonus_counts = self._bonus_buf[:1]
+
+    def _append(self, draws: np.ndarray):
+        start = len(self.counts)
+        total = start + len(draws)
+        if total > len(self._main_buf):
+            capacity = grow_capacity(total, len(self._main_buf))
+            self._main_buf = _grow(self._main_buf, start, capacity)
+            self._bonus_buf = _grow(self._bonus_buf, start, capacity)
+
+        main_cum = self.counts[-1] + _one_hot(draws[:, :6]).cumsum(axis=0, dtype=np.int32)
+        bonus_cum = self.bonus_counts[-1] + _one_hot(draws[:, 6:7]).cumsum(axis=0, dtype=np.int32)
+        self._main_buf[start:total] = main_cum
+        self._bonus_buf[start:total] = bonus_cum
+        # 이전 뷰를 들고 있는 조회는 그대로 (뒤쪽 행만 채우거나 새 버퍼로 교체)
+        self.counts = self._main_buf[:total]
+        self.bonus_counts = self._bonus_buf[:total]
+
+    def frequency(self, last: int = None, start_date=None, end_date=None, bonus: bool = False) -> np.ndarray:
+        """구간 내 번호별 출현 수 (45,) - index 0이 번호 1"""
+        lo, hi = self.draw_range(last, start_date, end_date)
+        counts = self.bonus_counts if bonus else self.counts
+        return counts[hi] - counts[lo]
+
+    def draws_since_last_seen(self, end: int = None) -> np.ndarray:
+        """
+        end번째 회차 (배열 인덱스, 기본: 전체) 직전까지 기준 번호별 미출현 회차 수 (45,)
+        한 번도 안 나온 번호는 end
+        """
+        end = len(self.draws) if end is None else end
+        gaps = np.empty(NUM_BALLS, dtype=np.int64)
+        for n in range(NUM_BALLS):
+            column = self.counts[:end + 1, n]
+            # 누적값이 마지막 값에 처음 도달한 행 = 마지막 출현 회차 + 1
+            first = int(np.searchsorted(column, column[-1], side='left'))
+            gaps[n] = end - first if column[-1] else end
+        return gaps
+
+    def hot(self, k: int = 6, **window) -> list:
+        """구간 내 가장 많이 나온 번호 k개 (동률은 작은 번호 우선)"""
+        freq = self.frequency(**window)
+        return (np.argsort(-freq, kind='stable')[:k] + 1).tolist()
+
+    def cold(self, k: int = 6, **window) -> list:
+        """구간 내 가장 적게 나온 번호 k개 (동률은 작은 번호 우선)"""
+        freq = self.frequency(**window)
+        return (np.argsort(freq, kind='stable')[:k] + 1).tolist()
@@ -0,0 +1,150 @@
+"""
+티켓 중복 제거용 비트셋
+- 조합 순위 (lotto.encoding) 하나당 1비트 → C(45,6)개 전체가 약 1MB
+- 포함 여부 확인/추가가 배치 단위 O(1) (Python set of tuple 없이)
+- path를 주면 memmap 파일로 유지 → 대량 생성 작업 전체에서 중복 없음
+- 응답 하나 (수천 세트 이하)는 정렬된 순위 배열 (RankSet)로 충분 → seen_set(count)이 골라줌
+"""
+
+import os
+
+import numpy as np
+
+from lotto.encoding import NUM_COMBINATIONS, popcount, tickets_to_ranks
+
+NUM_BYTES = (NUM_COMBINATIONS + 63) // 64 * 8  # uint64 단위로 맞춤 (popcount)
+SMALL_SET_LIMIT = 100_000  # 이 이하면 1MB 비트셋 대신 RankSet
+
+
+class TicketBitset:
+    """
+    조합 순위 비트셋
+
+    사용법:
+        seen = TicketBitset()                      # 메모리 (응답 하나)
+        seen = TicketBitset('out.bin.seen')        # 파일 (대량 생성 작업)
+        fresh = seen.add(ranks)                    # 새로 추가된 행만 True
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        if path is None:
+            self.bits = np.zeros(NUM_BYTES, dtype=np.uint8)
+        else:
+            mode = 'r+' if os.path.exists(path) and os.path.getsize(path) == NUM_BYTES else 'w+'
+            self.bits = np.memmap(path, dtype=np.uint8, mode=mode, shape=(NUM_BYTES,))
+        self.count = int(popcount(self.bits.view(np.uint64)).sum(dtype=np.int64))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def contains(self, ranks) -> np.ndarray:
+        """(M,) 순위 → (M,) bool"""
+        ranks = np.asarray(ranks, dtype=np.int64)
+        return (self.bits[ranks >> 3] >> (ranks & 7).astype(np.uint8)) & 1 == 1
+
+    def add(self, ranks) -> np.ndarray:
+        """
+        순위 배치 추가
+
+        Returns:
+            (M,) bool - 이미 있던 순위나 배치 안에서 앞에 나온 순위와 겹치는 행은 False
+        """
+        ranks = np.asarray(ranks, dtype=np.int64)
+        fresh = ~self.contains(ranks)
+        # 배치 내 중복은 첫 번째만 남김
+        _, first = np.unique(ranks, return_index=True)
+        is_first = np.zeros(len(ranks), dtype=bool)
+        is_first[first] = True
+        fresh &= is_first
+
+        new = ranks[fresh]
+        np.bitwise_or.at(self.bits, new >> 3, np.left_shift(1, new & 7).astype(np.uint8))
+        self.count += len(new)
+        return fresh
+
+    def add_tickets(self, tickets) -> np.ndarray:
+        """(M, 6+) 티켓 배치 추가 (앞 6개만 사용, 보너스는 무시)"""
+        return self.add(tickets_to_ranks(np.asarray(tickets)[:, :6]))
+
+    def clear(self):
+        self.bits[:] = 0
+        self.count = 0
+
+    def flush(self):
+        if isinstance(self.bits, np.memmap):
+            self.bits.flush()
+
+
+class RankSet:
+    """
+    정렬된 순위 배열 (TicketBitset과 같은 add / add_tickets / contains)
+    - 할당과 조회가 담긴 개수에 비례 → 작은 응답마다 1MB 비트셋을 만들고 훑지 않음
+    """
+
+    def __init__(self):
+        self.ranks = np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    @property
+    def count(self) -> int:
+        return len(self.ranks)
+
+    def contains(self, ranks) -> np.ndarray:
+        ranks = np.asarray(ranks, dtype=np.int64)
+        if len(self.ranks) == 0:
+            return np.zeros(len(ranks), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.ranks, ranks), len(self.ranks) - 1)
+        return self.ranks[pos] == ranks
+
+    def add(self, ranks) -> np.ndarray:
+        """TicketBitset.add와 같음 (이미 있던 순위, 배치 안의 두 번째 이후 순위는 False)"""
+        ranks = np.asarray(ranks, dtype=np.int64)
+        unique, first = np.unique(ranks, return_index=True)
+        new = ~self.contains(unique)
+        fresh = np.zeros(len(ranks), dtype=bool)
+        fresh[first[new]] = True
+        self.ranks = np.insert(self.ranks, np.searchsorted(self.ranks, unique[new]), unique[new])
+        return fresh
+
+    def add_tickets(self, tickets) -> np.ndarray:
+        return self.add(tickets_to_ranks(np.asarray(tickets)[:, :6]))
+
+
+def seen_set(count: int):
+    """티켓 count개까지 담을 중복 확인 집합 (작으면 RankSet, 크면 TicketBitset)"""
+    return RankSet() if count <= SMALL_SET_LIMIT else TicketBitset()
+
+
+def unique_sample(sample_fn, count: int, seen: TicketBitset = None, max_rounds: int = 50) -> np.ndarray:
+    """
+    중복 없는 티켓 count개 샘플링 (겹친 행만 다시 뽑음)
+
+    Args:
+        sample_fn: (rows) -> (len(rows), 7) uint8. rows는 다시 뽑을 행 인덱스
+            (행별 temperature/top_k를 쓰는 경우 해당 행 설정만 골라 쓰기 위함)
+        seen: 이전 결과와도 겹치지 않게 할 비트셋 / RankSet (없으면 이번 결과 안에서만)
+        max_rounds: 재샘플링 최대 횟수 (분포가 좁아서 못 채우면 RuntimeError)
+
+    Returns:
+        (count, 7) uint8, 뽑힌 티켓은 seen에 추가됨
+    """
+    if seen is None:
+        seen = seen_set(count)
+    if len(seen) + count > NUM_COMBINATIONS:
+        raise ValueError(f'Cannot draw {count} more unique tickets ({len(seen)} already used)')
+
+    rows = np.arange(count)
+    tickets = None
+    for _ in range(max_rounds):
+        batch = sample_fn(rows)
+        if tickets is None:
+            tickets = batch
+        else:
+            tickets[rows] = batch
+        rows = rows[~seen.add_tickets(batch)]
+        if len(rows) == 0:
+            return tickets
+    raise RuntimeError(f'{len(rows)} of {count} tickets still duplicated after {max_rounds} rounds')
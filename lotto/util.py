@@ -0,0 +1,38 @@
+"""
+공통 헬퍼
+- 환경 변수 숫자 설정 (잘못된 값이면 기본값)
+- 파일 버전 (mtime, size) - 파일이 바뀌었는지 stat 한 번으로 확인
+- 늘어나는 버퍼 용량 계산
+"""
+
+import os
+
+
+def env_int(name: str, default: int, minimum: int = 0) -> int:
+    """정수 환경 변수 (minimum 미만이면 minimum, 숫자가 아니면 default)"""
+    try:
+        return max(minimum, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float, minimum: float = 0.0) -> float:
+    """실수 환경 변수 (minimum 미만이면 minimum, 숫자가 아니면 default)"""
+    try:
+        return max(minimum, float(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def file_version(path):
+    """(st_mtime_ns, st_size), 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def grow_capacity(needed: int, current: int) -> int:
+    """버퍼 새 크기 - 회차 추가마다 다시 할당하지 않도록 최소 두 배로 늘림"""
+    return max(needed, current * 2)
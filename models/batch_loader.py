@@ -0,0 +1,69 @@
+"""
+텐서 상주 배치 로더
+- 샘플이 ~1,200개뿐이라 DataLoader의 per-item collate가 에폭 시간의 대부분
+- 학습/검증 텐서를 학습 디바이스에 통째로 올려두고 인덱싱으로 배치 생성
+- 에폭마다 randperm 한 번으로 셔플
+"""
+
+import torch
+
+
+class TensorBatchLoader:
+    """
+    DataLoader 대체 (같은 길이의 텐서들을 0번 축 기준으로 배치)
+
+    사용법:
+        loader = TensorBatchLoader(seqs, targets, batch_size=32, shuffle=True, device=device)
+        for seq, target in loader:
+            ...
+    텐서가 하나면 배치도 튜플이 아닌 텐서 하나로 반환
+    """
+
+    def __init__(self, *tensors: torch.Tensor, batch_size: int = 32, shuffle: bool = False,
+                 drop_last: bool = False, device=None):
+        if not tensors:
+            raise ValueError('At least one tensor is required')
+        num_samples = tensors[0].size(0)
+        if any(t.size(0) != num_samples for t in tensors):
+            raise ValueError('All tensors must have the same size in dim 0')
+
+        self.device = torch.device(device) if device is not None else tensors[0].device
+        self.tensors = tuple(t.to(self.device) for t in tensors)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.num_samples = num_samples
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.num_samples // self.batch_size
+        return (self.num_samples + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        num_batches = len(self)
+        if self.shuffle:
+            order = torch.randperm(self.num_samples, device=self.device)
+
+        for b in range(num_batches):
+            start = b * self.batch_size
+            end = min(start + self.batch_size, self.num_samples)
+            if self.shuffle:
+                idx = order[start:end]
+                batch = tuple(t.index_select(0, idx) for t in self.tensors)
+            else:
+                # 순서대로면 슬라이스 (윈도우 view면 배치만 연속 메모리로)
+                batch = tuple(t[start:end].contiguous() for t in self.tensors)
+            yield batch[0] if len(batch) == 1 else batch
+
+
+def chronological_split(*tensors: torch.Tensor, train_ratio: float = 0.8) -> tuple:
+    """
+    시간순 분할 (앞쪽은 학습, 뒤쪽은 검증)
+
+    Returns:
+        (train 텐서 튜플, val 텐서 튜플)
+    """
+    train_size = int(tensors[0].size(0) * train_ratio)
+    train = tuple(t[:train_size] for t in tensors)
+    val = tuple(t[train_size:] for t in tensors)
+    return train, val
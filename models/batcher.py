@@ -0,0 +1,183 @@
+"""
+/generate 요청 마이크로 배칭
+- 같은 모델에 대한 동시 요청은 세트 수만 다르므로 짧은 시간 (기본 2ms) 동안 모아서
+  forward + 샘플링을 한 번에 실행하고 요청별로 나눠 돌려줌
+- 요청별 temperature/top_k는 행별 텐서로 합쳐서 한 배치에 섞음
+- unique 요청은 요청 안에서 겹친 행만 다음 라운드에 모아서 다시 샘플링
+
+사용법:
+    coalescer = RequestCoalescer(sample_batch, window_ms=2, max_sets=1000)
+    tickets = await coalescer.submit(5)         # (5, 7) uint8
+"""
+
+import time
+import asyncio
+from collections import deque
+
+import numpy as np
+import torch
+
+from lotto.uniqueness import seen_set
+from lotto.util import env_float, env_int
+
+WINDOW_ENV = 'LOTTO_BATCH_WINDOW_MS'
+MAX_SETS_ENV = 'LOTTO_BATCH_MAX_SETS'
+
+
+def configured_window_ms(default: float = 2.0) -> float:
+    """LOTTO_BATCH_WINDOW_MS (0이면 모으지 않고 바로 실행)"""
+    return env_float(WINDOW_ENV, default)
+
+
+def configured_max_sets(default: int) -> int:
+    """LOTTO_BATCH_MAX_SETS (이만큼 쌓이면 창을 기다리지 않고 실행)"""
+    return env_int(MAX_SETS_ENV, default, minimum=1)
+
+
+class _Pending:
+    __slots__ = ('count', 'unique', 'temperature', 'top_k', 'future', 'enqueued')
+
+    def __init__(self, count, unique, temperature, top_k, future):
+        self.count = count
+        self.unique = unique
+        self.temperature = temperature
+        self.top_k = top_k
+        self.future = future
+        self.enqueued = time.perf_counter()
+
+
+class RequestCoalescer:
+    """
+    요청 모음 → 배치 샘플링 → 요청별 분배
+
+    Args:
+        sample_batch: async (count, temperature (count,), top_k (count,)) -> (count, 7) uint8
+        window_ms: 첫 요청 후 기다리는 시간
+        max_sets: 대기 중인 세트 수가 이만큼 되면 바로 실행 (이보다 큰 요청 하나는 단독 배치)
+        max_rounds: unique 재샘플링 최대 라운드
+    """
+
+    def __init__(self, sample_batch, window_ms: float = 2.0, max_sets: int = 1000, max_rounds: int = 50,
+                 history: int = 1000):
+        self.sample_batch = sample_batch
+        self.window = window_ms / 1000.0
+        self.max_sets = max_sets
+        self.max_rounds = max_rounds
+        self._pending = []
+        self._pending_sets = 0
+        self._timer = None
+        self._tasks = set()
+
+        # 지표
+        self.batches = 0
+        self.requests = 0
+        self.sets = 0
+        self.rounds = 0
+        self.max_batch_requests = 0
+        self.max_batch_sets = 0
+        self._delays = deque(maxlen=history)       # 요청별 대기 시간 (초)
+        self._batch_sizes = deque(maxlen=history)  # 배치별 요청 수
+
+    async def submit(self, count: int, unique: bool = True, temperature: float = 1.0, top_k: int = 15) -> np.ndarray:
+        """count개 티켓 요청 (다른 요청과 합쳐서 실행)"""
+        loop = asyncio.get_running_loop()
+        item = _Pending(count, unique, temperature, 45 if top_k is None else top_k, loop.create_future())
+        if self._pending and self._pending_sets + count > self.max_sets:
+            self._flush()  # 넣으면 max_sets를 넘으므로 쌓인 요청부터 실행
+        self._pending.append(item)
+        self._pending_sets += count
+
+        if self._pending_sets >= self.max_sets or self.window == 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await item.future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_sets = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list):
+        start = time.perf_counter()
+        self._record(batch, start)
+        try:
+            tickets = [np.zeros((p.count, 7), dtype=np.uint8) for p in batch]
+            seen = [seen_set(p.count) if p.unique else None for p in batch]
+            missing = [np.arange(p.count) for p in batch]
+
+            for _ in range(self.max_rounds):
+                counts = [len(rows) for rows in missing]
+                total = sum(counts)
+                if total == 0:
+                    break
+                temperature = torch.cat([
+                    torch.full((n,), float(p.temperature)) for p, n in zip(batch, counts)
+                ])
+                top_k = torch.cat([
+                    torch.full((n,), int(p.top_k), dtype=torch.long) for p, n in zip(batch, counts)
+                ])
+                sampled = await self.sample_batch(total, temperature, top_k)
+                self.rounds += 1
+
+                offset = 0
+                for i, n in enumerate(counts):
+                    part, rows = sampled[offset:offset + n], missing[i]
+                    offset += n
+                    tickets[i][rows] = part
+                    # unique가 아니면 한 번에 끝, unique면 요청 안에서 겹친 행만 남김
+                    missing[i] = rows[:0] if seen[i] is None else rows[~seen[i].add_tickets(part)]
+
+            for p, result, rows in zip(batch, tickets, missing):
+                if p.future.done():
+                    continue
+                if len(rows):
+                    p.future.set_exception(RuntimeError(
+                        f'{len(rows)} of {p.count} tickets still duplicated after {self.max_rounds} rounds'
+                    ))
+                else:
+                    p.future.set_result(result)
+        except Exception as e:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+
+    def _record(self, batch: list, start: float):
+        sets = sum(p.count for p in batch)
+        self.batches += 1
+        self.requests += len(batch)
+        self.sets += sets
+        self.max_batch_requests = max(self.max_batch_requests, len(batch))
+        self.max_batch_sets = max(self.max_batch_sets, sets)
+        self._batch_sizes.append(len(batch))
+        self._delays.extend(start - p.enqueued for p in batch)
+
+    def stats(self) -> dict:
+        """배치 크기 / 대기 시간 지표 (평균·분위수는 최근 기록 기준)"""
+        delays_ms = np.array(self._delays) * 1000
+        sizes = np.array(self._batch_sizes)
+        return {
+            'window_ms': self.window * 1000,
+            'max_sets': self.max_sets,
+            'batches': self.batches,
+            'requests': self.requests,
+            'sets': self.sets,
+            'rounds': self.rounds,
+            'pending': len(self._pending),
+            'avg_batch_requests': round(self.requests / self.batches, 3) if self.batches else 0.0,
+            'avg_batch_sets': round(self.sets / self.batches, 3) if self.batches else 0.0,
+            'max_batch_requests': self.max_batch_requests,
+            'max_batch_sets': self.max_batch_sets,
+            'recent_batch_requests_p95': float(np.percentile(sizes, 95)) if len(sizes) else 0.0,
+            'queue_delay_ms': {
+                'avg': round(float(delays_ms.mean()), 3) if len(delays_ms) else 0.0,
+                'p50': round(float(np.percentile(delays_ms, 50)), 3) if len(delays_ms) else 0.0,
+                'p95': round(float(np.percentile(delays_ms, 95)), 3) if len(delays_ms) else 0.0,
+                'max': round(float(delays_ms.max()), 3) if len(delays_ms) else 0.0,
+            },
+        }
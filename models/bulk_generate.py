@@ -0,0 +1,272 @@
+"""
+대량 티켓 생성 스크립트
+- 고정 크기 청크 단위로 생성해서 메모리 사용량이 일정
+- 티켓을 바이너리 파일에 기록 (packed: 7바이트, mask: 8바이트)
+- 중간에 끊긴 파일은 이어서 생성
+- --unique: 작업 전체에서 메인 6개 조합이 겹치지 않음 (<output>.seen 비트셋 파일, 약 1MB)
+
+파일 포맷:
+  헤더 16바이트: b'LTKT' + 버전(u1) + 포맷(u1) + 레코드 크기(u2)
+               + 소스(u1) + 플래그(u1, 비트 0 = unique) + top_k(u2) + temperature(f4)
+  (버전 1 파일은 뒤 8바이트가 예약 영역, 생성 설정 없음)
+  packed 레코드: 오름차순 메인 6개 + 보너스 (uint8 × 7)
+  mask 레코드:   uint64 little-endian, 비트 0~44 = 메인 번호 1~45, 비트 48~53 = 보너스
+"""
+
+import os
+import time
+import struct
+import argparse
+
+import numpy as np
+
+from lotto.encoding import masks_to_tickets, tickets_to_masks
+from lotto.uniqueness import TicketBitset
+from models.registry import ModelRegistry
+from models.tickets import SOURCES, TicketSampler
+from models.transformer.generate_full import load_configs
+from models.transformer.logit_cache import LogitCache
+from models.gan.generate import load_config as load_gan_config
+
+MAGIC = b'LTKT'
+FILE_VERSION = 2
+HEADER_SIZE = 16
+HEADER_STRUCT = struct.Struct('<4sBBHBBHf')
+FLAG_UNIQUE = 0x01
+FORMATS = {'packed': (0, 7), 'mask': (1, 8)}
+BONUS_SHIFT = 48
+MAIN_MASK = (1 << 45) - 1
+
+
+def file_header(fmt: str, source: str = None, temperature: float = 1.0, top_k: int = 15,
+                unique: bool = False) -> bytes:
+    """티켓 파일 헤더 (16바이트, 생성 설정 포함)"""
+    code, record_size = FORMATS[fmt]
+    source_code = SOURCES.index(source) + 1 if source is not None else 0
+    flags = FLAG_UNIQUE if unique else 0
+    return HEADER_STRUCT.pack(MAGIC, FILE_VERSION, code, record_size, source_code, flags,
+                              45 if top_k is None else top_k, temperature)
+
+
+def _unpack_header(path: str) -> tuple:
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f'{path}: truncated header')
+    fields = HEADER_STRUCT.unpack(raw)
+    if fields[0] != MAGIC or fields[1] not in (1, FILE_VERSION):
+        raise ValueError(f'{path}: not a ticket file')
+    return fields
+
+
+def read_header(path: str) -> tuple:
+    """
+    티켓 파일 헤더 읽기
+
+    Returns:
+        (포맷 이름, 레코드 크기)
+    """
+    _, _, code, record_size, *_ = _unpack_header(path)
+    for name, (fmt_code, fmt_size) in FORMATS.items():
+        if fmt_code == code and fmt_size == record_size:
+            return name, record_size
+    raise ValueError(f'{path}: unknown record format {code}')
+
+
+def read_settings(path: str):
+    """
+    헤더의 생성 설정
+
+    Returns:
+        {'source', 'temperature', 'top_k', 'unique'} 또는 None (버전 1 파일이나 소스 미기록)
+    """
+    _, version, _, _, source_code, flags, top_k, temperature = _unpack_header(path)
+    if version < 2 or not 0 < source_code <= len(SOURCES):
+        return None
+    return {
+        'source': SOURCES[source_code - 1],
+        'temperature': temperature,
+        'top_k': top_k,
+        'unique': bool(flags & FLAG_UNIQUE),
+    }
+
+
+def check_settings(path: str, source: str, temperature: float, top_k: int, unique: bool):
+    """이어쓰기 전에 기존 파일의 생성 설정과 비교 (다르면 ValueError)"""
+    settings = read_settings(path)
+    if settings is None:
+        raise ValueError(f'{path} has no recorded generation settings; rerun with --overwrite')
+    expected = {'source': source, 'unique': unique}
+    if source == 'transformer':  # temperature, top_k는 transformer에만 적용
+        expected['temperature'] = float(np.float32(temperature))
+        expected['top_k'] = 45 if top_k is None else top_k
+    mismatched = [f'{k}={settings[k]} (now {v})' for k, v in expected.items() if settings[k] != v]
+    if mismatched:
+        raise ValueError(f'{path} was generated with different settings: {", ".join(mismatched)}; '
+                         'rerun with matching options or --overwrite')
+
+
+def encode_records(tickets: np.ndarray, fmt: str) -> np.ndarray:
+    """(n, 7) uint8 티켓 → 파일 레코드 배열"""
+    if fmt == 'packed':
+        return np.ascontiguousarray(tickets, dtype=np.uint8)
+    masks = tickets_to_masks(tickets[:, :6])
+    masks |= tickets[:, 6].astype(np.uint64) << np.uint64(BONUS_SHIFT)
+    return masks.astype('<u8')
+
+
+def decode_records(records: np.ndarray, fmt: str) -> np.ndarray:
+    """파일 레코드 배열 → (n, 7) uint8 티켓"""
+    if fmt == 'packed':
+        return np.asarray(records, dtype=np.uint8).reshape(-1, 7)
+    masks = np.asarray(records, dtype=np.uint64)
+    main_numbers = masks_to_tickets(masks & np.uint64(MAIN_MASK))
+    bonus = (masks >> np.uint64(BONUS_SHIFT)) & np.uint64(0x3F)
+    return np.column_stack([main_numbers, bonus]).astype(np.uint8)
+
+
+def read_tickets(path: str) -> np.ndarray:
+    """티켓 파일 → (n, 7) uint8 (packed면 memmap, 복사 없음)"""
+    fmt, record_size = read_header(path)
+    count = (os.path.getsize(path) - HEADER_SIZE) // record_size
+    if count == 0:
+        return np.zeros((0, 7), dtype=np.uint8)
+    if fmt == 'packed':
+        return np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=(count, 7))
+    records = np.memmap(path, dtype='<u8', mode='r', offset=HEADER_SIZE, shape=(count,))
+    return decode_records(records, fmt)
+
+
+def open_output(path: str, fmt: str, overwrite: bool = False, source: str = None, temperature: float = 1.0,
+                top_k: int = 15, unique: bool = False) -> tuple:
+    """
+    출력 파일 열기 (기존 파일이 있으면 이어쓰기, 생성 설정이 다르면 ValueError)
+
+    Returns:
+        (파일 객체, 이미 기록된 티켓 수)
+    """
+    record_size = FORMATS[fmt][1]
+    if overwrite or not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE:
+        f = open(path, 'wb')
+        f.write(file_header(fmt, source, temperature, top_k, unique))
+        return f, 0
+
+    existing_fmt, _ = read_header(path)
+    if existing_fmt != fmt:
+        raise ValueError(f'{path} was written with format {existing_fmt}, not {fmt}')
+    check_settings(path, source, temperature, top_k, unique)
+
+    # 마지막 레코드가 잘려 있으면 레코드 경계까지 잘라냄
+    written = (os.path.getsize(path) - HEADER_SIZE) // record_size
+    f = open(path, 'r+b')
+    f.truncate(HEADER_SIZE + written * record_size)
+    f.seek(0, os.SEEK_END)
+    return f, written
+
+
+def seen_path(output: str) -> str:
+    return output + '.seen'
+
+
+def open_seen(output: str, written: int, chunk_size: int = 1_000_000) -> TicketBitset:
+    """
+    중복 방지 비트셋 열기
+    기록된 티켓 수와 비트 수가 다르면 (중간에 끊긴 경우 등) 출력 파일에서 다시 만듦
+    """
+    seen = TicketBitset(seen_path(output))
+    if len(seen) == written:
+        return seen
+
+    seen.clear()
+    if written:
+        print(f'   🔁 중복 방지 비트셋 재생성 ({written:,}개)')
+        tickets = read_tickets(output)
+        for i in range(0, written, chunk_size):
+            seen.add_tickets(tickets[i:i + chunk_size])
+        if len(seen) != written:
+            raise ValueError(f'{output} already contains duplicate tickets; rerun with --overwrite')
+    return seen
+
+
+def bulk_generate(sampler, count: int, output: str, fmt: str = 'packed', chunk_size: int = 100_000,
+                  temperature=1.0, top_k=15, overwrite: bool = False, unique: bool = False) -> int:
+    """
+    count개가 될 때까지 청크 단위로 생성해서 output에 기록
+    unique=True면 이미 기록된 티켓과 겹치는 행만 다시 샘플링
+
+    Returns:
+        이번 실행에서 새로 기록한 티켓 수
+    """
+    f, written = open_output(output, fmt, overwrite, sampler.source, temperature, top_k, unique)
+    if written:
+        print(f'   ↪️ 이어쓰기: 이미 {written:,}개 기록됨')
+    seen = open_seen(output, written) if unique else None
+
+    start_written = written
+    start = time.perf_counter()
+    try:
+        while written < count:
+            n = min(chunk_size, count - written)
+            if seen is None:
+                tickets = sampler.sample(n, temperature=temperature, top_k=top_k)
+            else:
+                tickets = sampler.sample_unique(n, temperature=temperature, top_k=top_k, seen=seen)
+            f.write(encode_records(tickets, fmt).tobytes())
+            f.flush()
+            if seen is not None:
+                seen.flush()
+            written += n
+
+            elapsed = time.perf_counter() - start
+            rate = (written - start_written) / elapsed if elapsed > 0 else 0.0
+            eta = (count - written) / rate if rate > 0 else 0.0
+            print(f'\r   {written:,}/{count:,} ({written / count:.1%}) | {rate:,.0f} 티켓/s | 남은 시간 {eta:,.0f}s',
+                  end='', flush=True)
+    finally:
+        f.close()
+    print()
+
+    elapsed = time.perf_counter() - start
+    generated = written - start_written
+    if generated:
+        print(f'   ⏱️ {generated:,}개 / {elapsed:.2f}s ({generated / elapsed:,.0f} 티켓/s)')
+    return generated
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대량 티켓 생성 (바이너리 파일)')
+    parser.add_argument('--source', choices=SOURCES, default='transformer', help='생성 모델')
+    parser.add_argument('--count', type=int, required=True, help='총 티켓 수')
+    parser.add_argument('--output', required=True, help='출력 파일 경로')
+    parser.add_argument('--format', choices=list(FORMATS), default='packed',
+                        help='packed: 7바이트 (번호 6 + 보너스), mask: 8바이트 (45비트 마스크 + 보너스)')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='청크 크기')
+    parser.add_argument('--temperature', type=float, default=1.0, help='샘플링 온도 (transformer)')
+    parser.add_argument('--top-k', type=int, default=15, help='Top-K (transformer)')
+    parser.add_argument('--overwrite', action='store_true', help='기존 파일 무시하고 새로 생성')
+    parser.add_argument('--unique', action='store_true', help='작업 전체에서 중복 티켓 없이 생성')
+    args = parser.parse_args()
+
+    main_config, bonus_config = load_configs()
+
+    print('=' * 60)
+    print(f'🎱 대량 티켓 생성 ({args.source})')
+    print('=' * 60)
+    print(f'   출력: {args.output} ({args.format})')
+    print(f'   목표: {args.count:,}개, 청크: {args.chunk_size:,}' + (' (중복 없음)' if args.unique else ''))
+    print('=' * 60)
+
+    registry = None
+    if args.source != 'random':
+        registry = ModelRegistry().load_all(main_config, bonus_config, load_gan_config())
+
+    # 실행 동안 로짓은 한 번만 계산
+    sampler = TicketSampler(args.source, registry, main_config, bonus_config, logit_cache=LogitCache())
+    bulk_generate(
+        sampler, args.count, args.output, fmt=args.format, chunk_size=args.chunk_size,
+        temperature=args.temperature, top_k=args.top_k, overwrite=args.overwrite, unique=args.unique
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+당첨번호 저장 포맷 (JSON ↔ 바이너리)
+
+draws.json은 교환용 포맷으로 유지하고, 옆에 고정폭 바이너리 파일을 둠:
+  - draws.bin       : 회차당 7바이트 (메인 6개 + 보너스, uint8)
+  - draws.meta.bin  : 회차당 32바이트 (회차/날짜/판매액/1등 상금/1등 당첨자)
+
+두 파일 모두 memmap으로 읽고, 새 회차는 파일 끝에 덧붙이기만 하면 됨 (O(1))
+"""
+
+import os
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from lotto.util import file_version
+
+RECORD_SIZE = 7
+
+META_DTYPE = np.dtype([
+    ('draw_no', '<i4'),
+    ('first_prize_winners', '<i4'),
+    ('draw_date', '<i8'),            # 1970-01-01 기준 일 수 (datetime64[D])
+    ('total_sell_amount', '<i8'),
+    ('first_prize_amount', '<i8'),
+])
+
+
+class DrawSnapshot:
+    """한 시점의 회차 데이터 (회차순 정렬)"""
+
+    def __init__(self, draws, draw_no, dates, total_sell_amount,
+                 first_prize_amount, first_prize_winners, version):
+        self.draws = draws                              # (N, 7) uint8 - 메인 6개 + 보너스
+        self.draw_no = draw_no                          # (N,) int32
+        self.dates = dates                              # (N,) datetime64[D]
+        self.total_sell_amount = total_sell_amount      # (N,) int64
+        self.first_prize_amount = first_prize_amount    # (N,) int64
+        self.first_prize_winners = first_prize_winners  # (N,) int32
+        self.version = version
+
+
+def parse_draws_json(data_path: str, version=None) -> DrawSnapshot:
+    """draws.json → DrawSnapshot (회차순 정렬)"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        raw_data = json.load(f)
+
+    draws = sorted(raw_data['draws'], key=lambda x: x['draw_no'])
+
+    numbers = np.array([d['numbers'] + [d['bonus']] for d in draws], dtype=np.uint8).reshape(-1, 7)
+    return DrawSnapshot(
+        draws=np.ascontiguousarray(numbers),
+        draw_no=np.array([d['draw_no'] for d in draws], dtype=np.int32),
+        dates=np.array([d.get('draw_date', 'NaT') for d in draws], dtype='datetime64[D]'),
+        total_sell_amount=np.array([d.get('total_sell_amount', 0) for d in draws], dtype=np.int64),
+        first_prize_amount=np.array([d.get('first_prize_amount', 0) for d in draws], dtype=np.int64),
+        first_prize_winners=np.array([d.get('first_prize_winners', 0) for d in draws], dtype=np.int32),
+        version=version,
+    )
+
+
+def archive_paths(data_path: str) -> tuple:
+    """draws.json 경로 → (draws.bin, draws.meta.bin) 경로"""
+    base = Path(data_path).with_suffix('')
+    return Path(f'{base}.bin'), Path(f'{base}.meta.bin')
+
+
+def archive_version(data_path: str):
+    """바이너리 파일 버전, 없으면 None"""
+    versions = tuple(file_version(path) for path in archive_paths(data_path))
+    return None if None in versions else versions
+
+
+def load_archive(data_path: str, version=None) -> DrawSnapshot:
+    """바이너리 파일 → DrawSnapshot (memmap, 복사 없음)"""
+    numbers_path, meta_path = archive_paths(data_path)
+
+    # 덧붙이는 도중이면 두 파일 길이가 다를 수 있음 → 짧은 쪽 기준
+    count = min(os.path.getsize(numbers_path) // RECORD_SIZE,
+                os.path.getsize(meta_path) // META_DTYPE.itemsize)
+    if count == 0:
+        numbers = np.zeros((0, RECORD_SIZE), dtype=np.uint8)
+        meta = np.zeros(0, dtype=META_DTYPE)
+    else:
+        numbers = np.memmap(numbers_path, dtype=np.uint8, mode='r', shape=(count, RECORD_SIZE))
+        meta = np.memmap(meta_path, dtype=META_DTYPE, mode='r', shape=(count,))
+
+    return DrawSnapshot(
+        draws=numbers,
+        draw_no=meta['draw_no'],
+        dates=meta['draw_date'].view('datetime64[D]'),
+        total_sell_amount=meta['total_sell_amount'],
+        first_prize_amount=meta['first_prize_amount'],
+        first_prize_winners=meta['first_prize_winners'],
+        version=version,
+    )
+
+
+def _meta_records(snapshot: DrawSnapshot) -> np.ndarray:
+    meta = np.zeros(len(snapshot.draws), dtype=META_DTYPE)
+    meta['draw_no'] = snapshot.draw_no
+    meta['first_prize_winners'] = snapshot.first_prize_winners
+    meta['draw_date'] = np.asarray(snapshot.dates, dtype='datetime64[D]').view('<i8')
+    meta['total_sell_amount'] = snapshot.total_sell_amount
+    meta['first_prize_amount'] = snapshot.first_prize_amount
+    return meta
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def json_to_archive(data_path: str) -> int:
+    """draws.json → 바이너리 파일 전체 생성, 회차 수 반환"""
+    snapshot = parse_draws_json(data_path)
+    numbers_path, meta_path = archive_paths(data_path)
+
+    # meta 먼저 쓰고 numbers를 나중에 교체 (numbers가 더 최신이면 json보다 우선 사용됨)
+    _write_atomic(meta_path, _meta_records(snapshot).tobytes())
+    _write_atomic(numbers_path, np.ascontiguousarray(snapshot.draws, dtype=np.uint8).tobytes())
+    return len(snapshot.draws)
+
+
+def snapshot_to_json_dict(snapshot: DrawSnapshot) -> dict:
+    """DrawSnapshot → draws.json 스키마"""
+    draws = []
+    for i in range(len(snapshot.draws)):
+        row = snapshot.draws[i].tolist()
+        date = snapshot.dates[i]
+        draws.append({
+            'draw_no': int(snapshot.draw_no[i]),
+            'draw_date': None if np.isnat(date) else str(date),
+            'numbers': row[:6],
+            'bonus': row[6],
+            'total_sell_amount': int(snapshot.total_sell_amount[i]),
+            'first_prize_amount': int(snapshot.first_prize_amount[i]),
+            'first_prize_winners': int(snapshot.first_prize_winners[i]),
+        })
+
+    return {
+        'updated_at': datetime.now().isoformat(),
+        'total_draws': len(draws),
+        'draws': draws,
+        'lottery_id': 'korea_645',
+        'lottery_name': '한국 로또 6/45',
+    }
+
+
+def archive_to_json(data_path: str) -> int:
+    """바이너리 파일 → draws.json 다시 쓰기, 회차 수 반환"""
+    snapshot = load_archive(data_path)
+    output = snapshot_to_json_dict(snapshot)
+
+    tmp_path = Path(str(data_path) + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, data_path)
+    return output['total_draws']
+
+
+def append_draw(data_path: str, draw: dict) -> int:
+    """
+    바이너리 파일 끝에 한 회차 추가 (O(1) 쓰기)
+
+    Args:
+        draw: draws.json의 회차 항목과 같은 형식
+            {'draw_no', 'draw_date', 'numbers', 'bonus', 'total_sell_amount', ...}
+
+    Returns:
+        추가 후 회차 수
+    """
+    numbers = sorted(int(n) for n in draw['numbers'])
+    bonus = int(draw['bonus'])
+    if len(numbers) != 6 or len(set(numbers + [bonus])) != 7 or not all(1 <= n <= 45 for n in numbers + [bonus]):
+        raise ValueError(f"Invalid draw numbers: {draw['numbers']} + {draw['bonus']}")
+
+    numbers_path, meta_path = archive_paths(data_path)
+    if archive_version(data_path) is None:
+        raise FileNotFoundError(f'{numbers_path} not found. Run json_to_archive first.')
+
+    snapshot = load_archive(data_path)
+    count = len(snapshot.draws)
+    if count and int(draw['draw_no']) <= int(snapshot.draw_no[-1]):
+        raise ValueError(f"draw_no {draw['draw_no']} is not after the latest draw {int(snapshot.draw_no[-1])}")
+
+    meta = np.zeros(1, dtype=META_DTYPE)
+    meta['draw_no'] = draw['draw_no']
+    meta['first_prize_winners'] = draw.get('first_prize_winners', 0)
+    meta['draw_date'] = np.array([draw.get('draw_date') or 'NaT'], dtype='datetime64[D]').view('<i8')
+    meta['total_sell_amount'] = draw.get('total_sell_amount', 0)
+    meta['first_prize_amount'] = draw.get('first_prize_amount', 0)
+
+    # 이전에 덧붙이다 끊긴 꼬리가 있으면 잘라내고 이어 씀
+    with open(meta_path, 'r+b') as f:
+        f.truncate(count * META_DTYPE.itemsize)
+        f.seek(0, os.SEEK_END)
+        f.write(meta.tobytes())
+    with open(numbers_path, 'r+b') as f:
+        f.truncate(count * RECORD_SIZE)
+        f.seek(0, os.SEEK_END)
+        f.write(bytes(numbers + [bonus]))
+    return count + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='당첨번호 포맷 변환 (JSON ↔ 바이너리)')
+    parser.add_argument('--data', default='data/draws.json', help='draws.json 경로')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('to-bin', help='draws.json → draws.bin / draws.meta.bin')
+    sub.add_parser('to-json', help='draws.bin / draws.meta.bin → draws.json')
+
+    append = sub.add_parser('append', help='바이너리 파일에 한 회차 추가')
+    append.add_argument('--draw-no', type=int, required=True, help='회차')
+    append.add_argument('--date', default=None, help='추첨일 (YYYY-MM-DD)')
+    append.add_argument('--numbers', type=int, nargs=6, required=True, help='메인 번호 6개')
+    append.add_argument('--bonus', type=int, required=True, help='보너스 번호')
+    append.add_argument('--sell-amount', type=int, default=0, help='총 판매액')
+    append.add_argument('--prize-amount', type=int, default=0, help='1등 당첨금')
+    append.add_argument('--prize-winners', type=int, default=0, help='1등 당첨자 수')
+    args = parser.parse_args()
+
+    if args.command == 'to-bin':
+        count = json_to_archive(args.data)
+        print(f'✅ {count}회차 → {archive_paths(args.data)[0]}')
+    elif args.command == 'to-json':
+        count = archive_to_json(args.data)
+        print(f'✅ {count}회차 → {args.data}')
+    else:
+        count = append_draw(args.data, {
+            'draw_no': args.draw_no,
+            'draw_date': args.date,
+            'numbers': args.numbers,
+            'bonus': args.bonus,
+            'total_sell_amount': args.sell_amount,
+            'first_prize_amount': args.prize_amount,
+            'first_prize_winners': args.prize_winners,
+        })
+        print(f'✅ {args.draw_no}회 추가 (총 {count}회차)')
+
+
+if __name__ == '__main__':
+    main()
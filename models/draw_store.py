@@ -0,0 +1,106 @@
+"""
+당첨번호 인메모리 저장소
+- draws.json을 한 번만 파싱해서 (N, 7) uint8 배열 + 날짜/판매 컬럼으로 보관
+- 바이너리 파일 (draws.bin)이 draws.json보다 최신이면 파싱 대신 memmap
+- 파일 mtime이 바뀔 때만 다시 로드
+- latest(), bonuses() 등은 복사 없는 view 반환
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from lotto.util import file_version
+from models.draw_archive import DrawSnapshot, archive_version, load_archive, parse_draws_json
+
+
+class DrawStore:
+    """
+    draws.json 캐시
+
+    사용법:
+        store = get_draw_store('data/draws.json')
+        store.latest(20)     # (20, 7) view
+        store.bonuses()      # (N,) view
+    """
+
+    def __init__(self, data_path: str):
+        self.data_path = str(data_path)
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _current_version(self) -> tuple:
+        """
+        (소스, 파일 버전)
+        바이너리 파일이 draws.json보다 최신이거나 draws.json이 없으면 바이너리 사용
+        """
+        json_version = file_version(self.data_path)
+        bin_version = archive_version(self.data_path)
+        if bin_version is not None and (json_version is None or bin_version[0][0] >= json_version[0]):
+            return ('bin', bin_version)
+        if json_version is None:
+            raise FileNotFoundError(self.data_path)
+        return ('json', json_version)
+
+    def snapshot(self) -> DrawSnapshot:
+        """최신 스냅샷 (파일이 바뀌었으면 다시 로드)"""
+        version = self._current_version()
+        snap = self._snapshot
+        if snap is not None and snap.version == version:
+            return snap
+
+        with self._lock:
+            snap = self._snapshot
+            if snap is None or snap.version != version:
+                if version[0] == 'bin':
+                    snap = load_archive(self.data_path, version)
+                else:
+                    snap = parse_draws_json(self.data_path, version)
+                self._snapshot = snap
+        return snap
+
+    @property
+    def version(self) -> tuple:
+        """데이터 버전 (소스, 파일 mtime_ns/size)"""
+        return self.snapshot().version
+
+    @property
+    def source(self) -> str:
+        """'json' 또는 'bin'"""
+        return self.snapshot().version[0]
+
+    @property
+    def draws(self) -> np.ndarray:
+        """(N, 7) uint8 - 메인 6개 + 보너스"""
+        return self.snapshot().draws
+
+    def __len__(self) -> int:
+        return len(self.snapshot().draws)
+
+    def numbers(self) -> np.ndarray:
+        """(N, 6) 메인 번호 view"""
+        return self.snapshot().draws[:, :6]
+
+    def bonuses(self) -> np.ndarray:
+        """(N,) 보너스 번호 view"""
+        return self.snapshot().draws[:, 6]
+
+    def latest(self, seq_len: int) -> np.ndarray:
+        """최신 seq_len 회차 (seq_len, 7) view"""
+        return self.snapshot().draws[-seq_len:]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_draw_store(data_path: str) -> DrawStore:
+    """경로별 프로세스 전역 DrawStore"""
+    key = str(Path(data_path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = DrawStore(data_path)
+            _stores[key] = store
+        return store
@@ -0,0 +1,91 @@
+"""
+체크포인트 평가 스크립트
+학습 때와 같은 시간순 분할의 검증 구간에서 지표를 한 번에 계산합니다.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import torch
+
+from models.metrics import MetricAccumulator
+from models.registry import build_transformer, get_device, read_checkpoint
+from models.transformer.dataloader import create_dataloaders
+from models.transformer.dataloader_bonus import create_bonus_dataloaders
+
+TRANSFORMER_DIR = Path(__file__).parent / 'transformer'
+CONFIG_PATHS = {
+    'main': TRANSFORMER_DIR / 'config.json',
+    'bonus': TRANSFORMER_DIR / 'config_bonus.json',
+}
+
+
+def evaluate(model, loader, ks=(1, 5, 10)) -> dict:
+    """loader 전체에 대한 지표 (MetricAccumulator.compute 결과)"""
+    model.eval()
+    accumulator = MetricAccumulator(ks=ks)
+    with torch.no_grad():
+        for seq, target in loader:
+            accumulator.update(model(seq), target)
+    return accumulator.compute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='체크포인트 평가 (검증 구간)')
+    parser.add_argument('--checkpoint', required=True, help='체크포인트 경로')
+    parser.add_argument('--kind', choices=['auto', 'main', 'bonus'], default='auto',
+                        help='모델 종류 (auto: 체크포인트 output_nums로 판단)')
+    parser.add_argument('--data', default=None, help='draws.json 경로 (기본: config)')
+    parser.add_argument('--batch-size', type=int, default=256, help='배치 크기')
+    parser.add_argument('--k', type=int, nargs='+', default=[1, 5, 10], help='hit@k의 k 목록')
+    args = parser.parse_args()
+
+    device = get_device()
+    # 한 번만 읽어서 종류 판단과 모델 생성에 같이 사용
+    checkpoint, fingerprint = read_checkpoint(args.checkpoint, device)
+
+    kind = args.kind
+    if kind == 'auto':
+        kind = 'bonus' if checkpoint.get('config', {}).get('output_nums', 6) == 1 else 'main'
+
+    with open(CONFIG_PATHS[kind], 'r') as f:
+        config = json.load(f)
+    model_cfg = config['model']
+    train_cfg = config['training']
+    data_path = args.data or config['paths']['data']
+
+    model = build_transformer(checkpoint, model_cfg, device, fingerprint)
+
+    if kind == 'main':
+        _, val_loader = create_dataloaders(
+            data_path, seq_len=model.seq_len, batch_size=args.batch_size,
+            train_ratio=train_cfg['train_ratio'], device=device
+        )
+    else:
+        _, val_loader = create_bonus_dataloaders(
+            data_path, seq_len=model.seq_len, batch_size=args.batch_size,
+            train_ratio=train_cfg['train_ratio'], device=device
+        )
+
+    report = evaluate(model, val_loader, ks=args.k)
+
+    print('=' * 50)
+    print(f'📊 체크포인트 평가 ({kind})')
+    print('=' * 50)
+    print(f'   체크포인트: {args.checkpoint}')
+    print(f'   검증 샘플: {report.get("samples", 0)}')
+    if not report:
+        return report
+    print(f'   NLL: {report["nll"]:.4f}')
+    for k in args.k:
+        per_position = ', '.join(f'{v:.2%}' for v in report[f'hit@{k}_per_position'])
+        print(f'   Hit@{k}: {report[f"hit@{k}"]:.2%}  (위치별: {per_position})')
+    print(f'   티켓당 기대 적중: {report["expected_hits"]:.3f}')
+    print(f'   ECE: {report["ece"]:.4f}')
+    print('=' * 50)
+    return report
+
+
+if __name__ == '__main__':
+    main()
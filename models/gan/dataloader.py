@@ -3,35 +3,28 @@ GAN 데이터 로더
 로또 번호를 Discriminator 학습용으로 준비
 """
 
-import json
 import torch
-from torch.utils.data import Dataset, DataLoader
-from typing import Tuple
+from torch.utils.data import Dataset
+
+from models.batch_loader import TensorBatchLoader
+from models.draw_store import get_draw_store
 
 
 class LottoGANDataset(Dataset):
     """로또 번호 데이터셋 (GAN용)"""
     
     def __init__(self, data_path: str):
-        with open(data_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
-        
-        self.draws = raw_data['draws']
-        
-        # 번호만 추출
-        self.numbers = []
-        for draw in self.draws:
-            nums = draw['numbers']  # [6개]
-            self.numbers.append(nums)
+        # 번호만 추출 (DrawStore: 회차순 정렬) → (N, 6) long 텐서
+        self.numbers = torch.from_numpy(get_draw_store(data_path).numbers().astype('int64'))
     
     def __len__(self) -> int:
-        return len(self.numbers)
+        return self.numbers.size(0)
     
     def __getitem__(self, idx: int) -> torch.Tensor:
-        return torch.tensor(self.numbers[idx], dtype=torch.long)
+        return self.numbers[idx]
 
 
-def create_dataloader(data_path: str, batch_size: int = 64) -> DataLoader:
-    """학습용 DataLoader 생성"""
+def create_dataloader(data_path: str, batch_size: int = 64, device=None) -> TensorBatchLoader:
+    """학습용 데이터로더 생성 (텐서 상주, device에 통째로 올림)"""
     dataset = LottoGANDataset(data_path)
-    return DataLoader(dataset, batch_size=batch_size, shuffle=True, drop_last=True)
+    return TensorBatchLoader(dataset.numbers, batch_size=batch_size, shuffle=True, drop_last=True, device=device)
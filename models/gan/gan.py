@@ -8,6 +8,8 @@ Discriminator: 로또 번호 6개 → 진짜/가짜 판별
 import torch
 import torch.nn as nn
 
+from models.sampling import sample_numbers
+
 
 class Generator(nn.Module):
     """
@@ -73,10 +75,15 @@ class Generator(nn.Module):
         
         return torch.stack(outputs, dim=1)  # (batch, 6, 45)
     
-    def generate(self, num_samples: int = 1, device: str = 'cpu') -> torch.Tensor:
+    def generate(self, num_samples: int = 1, device: str = 'cpu', temperature=1.0, top_k=None,
+                 method: str = 'sequential') -> torch.Tensor:
         """
         번호 생성 (중복 없이)
         
+        Args:
+            temperature, top_k: 스칼라 또는 (num_samples,) 텐서 (기본: 온도 1, 전체 후보)
+            method: 'sequential' (위치별 순차) 또는 'gumbel' (한 번에, models/sampling.py 참고)
+        
         Returns:
             (num_samples, 6) 생성된 번호
         """
@@ -84,23 +91,7 @@ class Generator(nn.Module):
         with torch.no_grad():
             z = torch.randn(num_samples, self.latent_dim, device=device)
             logits = self.forward(z)  # (batch, 6, 45)
-            
-            generated = []
-            used_mask = torch.zeros(num_samples, self.num_balls, device=device)
-            
-            for i in range(self.output_nums):
-                curr_logits = logits[:, i, :]
-                curr_logits = curr_logits - used_mask * 1e9
-                
-                probs = torch.softmax(curr_logits, dim=-1)
-                selected = torch.multinomial(probs, 1).squeeze(-1)  # (batch,)
-                
-                generated.append(selected + 1)  # 1~45로 변환
-                used_mask.scatter_(1, selected.unsqueeze(-1), 1.0)
-            
-            result = torch.stack(generated, dim=1)  # (batch, 6)
-            result, _ = torch.sort(result, dim=1)
-            return result
+            return sample_numbers(logits, temperature=temperature, top_k=top_k, method=method)
 
 
 class Discriminator(nn.Module):
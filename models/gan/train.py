@@ -56,8 +56,8 @@ def main():
     
     # 데이터 로더
     print(f'\n📊 데이터 로딩: {paths_cfg["data"]}')
-    dataloader = create_dataloader(paths_cfg['data'], train_cfg['batch_size'])
-    print(f'   총 샘플: {len(dataloader.dataset)}')
+    dataloader = create_dataloader(paths_cfg['data'], train_cfg['batch_size'], device=device)
+    print(f'   총 샘플: {dataloader.num_samples}')
     
     # 모델 생성
     generator = create_generator(model_cfg).to(device)
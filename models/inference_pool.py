@@ -0,0 +1,330 @@
+"""
+추론 전용 프로세스 풀
+- /generate의 torch 연산을 서버 프로세스 밖 (워커 프로세스)에서 실행
+  → GIL 경쟁 없이 코어 수만큼 처리량 증가, async 핸들러 (/dream) 지연 영향 없음
+- 워커마다 모델을 한 번만 로드 (ModelRegistry) 후 워커별 큐로 요청을 받음
+- 결과는 (sets, 7) uint8 바이트로 반환 (Python 리스트 피클 없음)
+- 결과 채널은 워커마다 단방향 파이프 → 쓰는 도중 죽은 워커는 자기 파이프만 망가뜨림 (공유 큐 잠금/데이터 손상 없음)
+- 워커가 죽으면 처리 중이던 요청은 실패시키고 새 워커를 띄움
+
+사용법:
+    pool = InferencePool(2, main_cfg, bonus_cfg, gan_cfg)
+    tickets = await pool.generate('transformer', 5)      # (5, 7) uint8
+    pool.close()
+"""
+
+import os
+import time
+import asyncio
+import itertools
+import threading
+import multiprocessing as mp
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from lotto.util import env_int
+
+WORKERS_ENV = 'LOTTO_INFERENCE_WORKERS'
+HEALTH_INTERVAL = 0.5  # 워커 생존 확인 주기 (초)
+MAX_RESPAWN_DELAY = 30.0  # 모델 로드 전에 계속 죽는 워커의 재시작 간격 상한 (초)
+
+
+def configured_workers() -> int:
+    """LOTTO_INFERENCE_WORKERS 환경 변수 (없거나 0이면 프로세스 풀 사용 안 함)"""
+    return env_int(WORKERS_ENV, 0)
+
+
+def _worker_main(worker_id: int, requests, results, configs: tuple, num_threads: int):
+    """워커 프로세스: 모델 로드 후 요청 처리 루프"""
+    import torch
+    from models.registry import ModelRegistry
+    from models.tickets import SOURCES, TicketSampler
+    from models.transformer.logit_cache import LogitCache
+
+    torch.set_num_threads(num_threads)
+    main_cfg, bonus_cfg, gan_cfg = configs
+    registry = ModelRegistry().load_all(main_cfg, bonus_cfg, gan_cfg)
+    logit_cache = LogitCache()
+    samplers = {
+        source: TicketSampler(source, registry, main_cfg, bonus_cfg, logit_cache=logit_cache)
+        for source in SOURCES
+    }
+    results.send((None, 'ready', os.getpid()))
+
+    while True:
+        job = requests.get()
+        if job is None:
+            break
+        job_id, op, kwargs = job
+        try:
+            if op == 'ping':
+                payload = os.getpid()
+            elif op == 'stats':
+                # 서버 프로세스 레지스트리/캐시는 비어 있으므로 /models, /metrics는 워커 값을 모아서 보고
+                payload = {'pid': os.getpid(), **registry.stats(), 'logit_cache': logit_cache.stats()}
+            elif op == 'sample':
+                registry.refresh()
+                kwargs = dict(kwargs)
+                sampler = samplers[kwargs.pop('source')]
+                if kwargs.pop('unique', False):
+                    tickets = sampler.sample_unique(**kwargs)
+                else:
+                    tickets = sampler.sample(**kwargs)
+                payload = np.ascontiguousarray(tickets, dtype=np.uint8).tobytes()
+            else:
+                raise ValueError(f'Unknown op: {op}')
+            results.send((job_id, 'ok', payload))
+        except Exception as e:
+            results.send((job_id, 'error', f'{type(e).__name__}: {e}'))
+
+
+class _Worker:
+    """부모 쪽 워커 상태"""
+
+    def __init__(self, worker_id: int, process, requests, results, restarts: int = 0, failures: int = 0):
+        self.worker_id = worker_id
+        self.process = process
+        self.requests = requests
+        self.results = results  # 파이프 읽기 쪽
+        self.restarts = restarts
+        self.failures = failures  # 모델 로드 전에 연속으로 죽은 횟수
+        self.inflight = {}  # job_id → (op, Future)
+        self.served = 0
+        self.ready = threading.Event()
+        self.respawn_at = None  # 죽은 뒤 재시작 예정 시각
+
+    @property
+    def available(self) -> bool:
+        return self.respawn_at is None and self.process.is_alive()
+
+
+class InferencePool:
+    """
+    모델 상주 워커 프로세스 풀
+
+    - 요청은 처리 중인 작업이 가장 적은 워커로 전달
+    - 수집 스레드가 결과를 Future로 돌려주고 주기적으로 워커 생존 확인
+    """
+
+    def __init__(self, num_workers: int, main_config: dict, bonus_config: dict, gan_config: dict):
+        if num_workers < 1:
+            raise ValueError('num_workers must be >= 1')
+        self._ctx = mp.get_context('spawn')  # fork 후 torch 스레드 교착 방지
+        self._configs = (main_config, bonus_config, gan_config)
+        self._num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count()
+        self._closed = False
+        self.errors = 0
+
+        self._workers = [self._spawn(i) for i in range(num_workers)]
+        self._collector = threading.Thread(target=self._collect, name='inference-collector', daemon=True)
+        self._collector.start()
+
+    def _spawn(self, worker_id: int, restarts: int = 0, failures: int = 0) -> _Worker:
+        requests = self._ctx.Queue()
+        reader, writer = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main, name=f'lotto-inference-{worker_id}', daemon=True,
+            args=(worker_id, requests, writer, self._configs, self._num_threads),
+        )
+        process.start()
+        writer.close()  # 워커가 죽으면 읽기 쪽이 EOF를 받도록 부모 쪽 쓰기 끝은 닫음
+        return _Worker(worker_id, process, requests, reader, restarts, failures)
+
+    def submit(self, op: str, worker_id: int = None, **kwargs) -> Future:
+        """워커에 작업 전달 (결과는 Future). worker_id가 없으면 처리 중인 작업이 가장 적은 워커"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Inference pool is closed')
+            if worker_id is None:
+                candidates = [w for w in self._workers if w.available]
+                if not candidates:
+                    raise RuntimeError('No inference workers available')
+                worker = min(candidates, key=lambda w: len(w.inflight))
+            else:
+                worker = self._workers[worker_id]
+            job_id = next(self._job_ids)
+            worker.inflight[job_id] = (op, future)
+            worker.requests.put((job_id, op, kwargs))
+        return future
+
+    def sample(self, source: str, count: int, unique: bool = True, temperature=1.0, top_k=15) -> Future:
+        """티켓 샘플링 작업 → Future[(count, 7) uint8]"""
+        return self.submit('sample', source=source, count=count, unique=unique,
+                           temperature=temperature, top_k=top_k)
+
+    async def generate(self, source: str, count: int, unique: bool = True, temperature=1.0,
+                       top_k=15) -> np.ndarray:
+        """이벤트 루프에서 기다리는 sample"""
+        return await asyncio.wrap_future(self.sample(source, count, unique, temperature, top_k))
+
+    def _collect(self):
+        """워커 파이프와 프로세스 sentinel을 같이 기다림 (결과 도착 / 워커 종료 둘 다 바로 깨어남)"""
+        while not self._closed:
+            with self._lock:
+                workers = list(self._workers)
+            readers = {w.results: w for w in workers if not w.results.closed}
+            sentinels = [w.process.sentinel for w in workers if w.respawn_at is None]
+            try:
+                ready = wait(list(readers) + sentinels, timeout=HEALTH_INTERVAL)
+            except OSError:
+                continue  # close() 중 닫힌 파이프
+            for conn in ready:
+                if conn in readers:
+                    self._drain(readers[conn])
+            self._check_workers()
+
+    def _drain(self, worker: _Worker):
+        """워커 파이프에 도착한 결과 모두 처리 (EOF나 깨진 메시지면 파이프를 닫음)"""
+        conn = worker.results
+        while True:
+            try:
+                if conn.closed or not conn.poll():
+                    return
+                job_id, status, payload = conn.recv()
+            except (EOFError, OSError):
+                conn.close()
+                return
+            self._resolve(worker, job_id, status, payload)
+
+    def _resolve(self, worker: _Worker, job_id, status: str, payload):
+        with self._lock:
+            if status == 'ready':
+                worker.ready.set()
+                return
+            op, future = worker.inflight.pop(job_id, (None, None))
+            if status == 'ok':
+                worker.served += 1
+            else:
+                self.errors += 1
+        if future is None:
+            return
+        if status != 'ok':
+            future.set_exception(RuntimeError(payload))
+        elif op == 'sample':
+            future.set_result(np.frombuffer(payload, dtype=np.uint8).reshape(-1, 7))
+        else:
+            future.set_result(payload)
+
+    def _check_workers(self):
+        """
+        죽은 워커 교체 (처리 중이던 요청은 실패)
+        모델 로드 전에 죽은 워커는 재시작 간격을 늘려가며 재시도 (1, 2, 4, ... 최대 30초)
+        """
+        with self._lock:
+            dead = [w for w in self._workers if w.respawn_at is None and not w.process.is_alive()]
+        for worker in dead:
+            self._drain(worker)  # 죽기 전에 보낸 결과부터 처리
+
+        failed = []
+        now = time.monotonic()
+        with self._lock:
+            for i, worker in enumerate(self._workers):
+                if self._closed:
+                    break
+                if worker.respawn_at is None:
+                    if worker not in dead:
+                        continue
+                    delay = 0.0 if worker.ready.is_set() else min(MAX_RESPAWN_DELAY, 2.0 ** worker.failures)
+                    print(f'⚠️ inference worker {i} died (exit code {worker.process.exitcode}), '
+                          f'respawning in {delay:.0f}s')
+                    failed.extend(future for _, future in worker.inflight.values())
+                    worker.inflight.clear()
+                    worker.respawn_at = now + delay
+                if now >= worker.respawn_at:
+                    failures = 0 if worker.ready.is_set() else worker.failures + 1
+                    worker.results.close()
+                    self._workers[i] = self._spawn(i, worker.restarts + 1, failures)
+        for future in failed:
+            future.set_exception(RuntimeError('Inference worker crashed'))
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """모든 워커가 모델 로드를 마칠 때까지 대기"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in list(self._workers):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not worker.ready.wait(remaining):
+                return False
+        return True
+
+    def _broadcast(self, op: str, timeout: float) -> list:
+        """
+        준비된 모든 워커에 같은 작업 전달
+
+        Returns:
+            [(워커, 응답 시간 ms, 결과), ...] - 응답이 없으면 (None, None)
+        """
+        with self._lock:
+            workers = list(self._workers)
+        pending = []
+        for worker in workers:
+            start = time.perf_counter()
+            try:
+                future = self.submit(op, worker.worker_id) if worker.ready.is_set() else None
+            except RuntimeError:
+                future = None
+            pending.append((start, future))
+
+        replies = []
+        for worker, (start, future) in zip(workers, pending):
+            elapsed_ms, payload = None, None
+            if future is not None:
+                try:
+                    payload = future.result(timeout=timeout)
+                    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+                except Exception:
+                    pass
+            replies.append((worker, elapsed_ms, payload))
+        return replies
+
+    def health(self, timeout: float = 2.0) -> dict:
+        """워커별 ping 응답 시간과 상태"""
+        report = [
+            {
+                'id': worker.worker_id,
+                'pid': worker.process.pid,
+                'alive': worker.process.is_alive(),
+                'ready': worker.ready.is_set(),
+                'inflight': len(worker.inflight),
+                'served': worker.served,
+                'restarts': worker.restarts,
+                'ping_ms': ping_ms,
+            }
+            for worker, ping_ms, _ in self._broadcast('ping', timeout)
+        ]
+        return {
+            'workers': report,
+            'healthy': all(w['alive'] and w['ping_ms'] is not None for w in report),
+            'errors': self.errors,
+        }
+
+    def worker_stats(self, timeout: float = 2.0) -> list:
+        """워커별 레지스트리 리포트 (로드 시간/메모리) + 로짓 캐시 지표, 응답 없는 워커는 None"""
+        report = []
+        for worker, _, payload in self._broadcast('stats', timeout):
+            report.append({'id': worker.worker_id, **(payload or {'error': 'no response'})})
+        return report
+
+    def close(self, timeout: float = 5.0):
+        """워커 종료 (처리 중인 요청은 실패)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.requests.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            for _, future in worker.inflight.values():
+                if not future.done():
+                    future.set_exception(RuntimeError('Inference pool closed'))
+        self._collector.join(HEALTH_INTERVAL * 2)
+        for worker in workers:
+            worker.results.close()
@@ -0,0 +1,139 @@
+"""
+평가 지표 (배치 텐서 연산)
+- 샘플/위치별 파이썬 루프 없이 배치 전체를 한 번에 계산
+- 배치마다 .item() 호출 없이 디바이스 위에서 누적 → 마지막에 한 번만 동기화
+
+logits: (batch, positions, 45), target: (batch, positions) 0-indexed
+"""
+
+import torch
+import torch.nn.functional as F
+
+
+def topk_hits(logits: torch.Tensor, target: torch.Tensor, k: int) -> torch.Tensor:
+    """
+    위치별 정답이 top-k 안에 있는지
+
+    Returns:
+        (batch, positions) bool
+    """
+    topk = logits.topk(k, dim=-1).indices  # (batch, positions, k)
+    return (topk == target.unsqueeze(-1)).any(dim=-1)
+
+
+def hit_at_k(logits: torch.Tensor, target: torch.Tensor, k: int) -> torch.Tensor:
+    """hit@k 비율 (스칼라 텐서)"""
+    return topk_hits(logits, target, k).float().mean()
+
+
+def nll(logits: torch.Tensor, target: torch.Tensor, reduction: str = 'mean') -> torch.Tensor:
+    """위치별 cross entropy (기본: 전체 평균)"""
+    return F.cross_entropy(logits.reshape(-1, logits.size(-1)), target.reshape(-1), reduction=reduction)
+
+
+def per_position_accuracy(logits: torch.Tensor, target: torch.Tensor, k: int = 1) -> torch.Tensor:
+    """위치별 top-k 정확도 (positions,)"""
+    return topk_hits(logits, target, k).float().mean(dim=0)
+
+
+def inclusion_probs(logits: torch.Tensor) -> torch.Tensor:
+    """
+    번호별 "티켓에 포함될 확률" 근사 (batch, 45)
+    위치별 분포가 독립이라고 보고 1 - Π(1 - p_pos)
+    """
+    probs = torch.softmax(logits, dim=-1)
+    return 1 - torch.prod(1 - probs, dim=1)
+
+
+def expected_hits(logits: torch.Tensor, target: torch.Tensor) -> torch.Tensor:
+    """
+    티켓당 기대 적중 개수 (batch,)
+    정답 번호 각각이 티켓에 포함될 확률의 합 (무작위 6개 티켓 기준값: 6 * 6/45 = 0.8)
+    """
+    return inclusion_probs(logits).gather(1, target).sum(dim=1)
+
+
+def calibration_bins(logits: torch.Tensor, target: torch.Tensor, num_bins: int = 10) -> tuple:
+    """
+    top-1 확신도 구간별 (확신도 합, 정답 수, 개수)
+
+    Returns:
+        (conf_sum, correct_sum, count) 각 (num_bins,)
+    """
+    probs = torch.softmax(logits, dim=-1)
+    conf, pred = probs.max(dim=-1)
+    correct = (pred == target).float()
+
+    conf = conf.reshape(-1)
+    bins = (conf * num_bins).long().clamp_(max=num_bins - 1)
+    conf_sum = torch.zeros(num_bins, device=logits.device).scatter_add_(0, bins, conf)
+    correct_sum = torch.zeros(num_bins, device=logits.device).scatter_add_(0, bins, correct.reshape(-1))
+    count = torch.bincount(bins, minlength=num_bins).float()
+    return conf_sum, correct_sum, count
+
+
+def expected_calibration_error(conf_sum: torch.Tensor, correct_sum: torch.Tensor, count: torch.Tensor) -> float:
+    """ECE = Σ |정확도 - 확신도| × 구간 비율"""
+    total = count.sum()
+    if total == 0:
+        return 0.0
+    return (torch.abs(correct_sum - conf_sum).sum() / total).item()
+
+
+class MetricAccumulator:
+    """
+    배치별 지표를 디바이스 위에서 누적
+
+    사용법:
+        acc = MetricAccumulator(ks=(1, 5, 10))
+        for seq, target in loader:
+            acc.update(model(seq), target)
+        report = acc.compute()
+    """
+
+    def __init__(self, ks=(1, 5, 10), num_bins: int = 10):
+        self.ks = tuple(ks)
+        self.num_bins = num_bins
+        self._sums = None
+        self.num_samples = 0
+
+    def update(self, logits: torch.Tensor, target: torch.Tensor):
+        logits = logits.detach()
+        if self._sums is None:
+            device = logits.device
+            positions = logits.size(1)
+            self._sums = {
+                'nll': torch.zeros((), device=device),
+                'hits': {k: torch.zeros(positions, device=device) for k in self.ks},
+                'expected_hits': torch.zeros((), device=device),
+                'calibration': [torch.zeros(self.num_bins, device=device) for _ in range(3)],
+            }
+
+        sums = self._sums
+        sums['nll'] += nll(logits, target, reduction='sum')
+        for k in self.ks:
+            sums['hits'][k] += topk_hits(logits, target, k).float().sum(dim=0)
+        sums['expected_hits'] += expected_hits(logits, target).sum()
+        for acc, value in zip(sums['calibration'], calibration_bins(logits, target, self.num_bins)):
+            acc += value
+        self.num_samples += logits.size(0)
+
+    def compute(self) -> dict:
+        """누적 지표 → 파이썬 값 (여기서만 호스트 동기화)"""
+        if self._sums is None or self.num_samples == 0:
+            return {}
+
+        sums = self._sums
+        n = self.num_samples
+        positions = sums['hits'][self.ks[0]].numel()
+        report = {
+            'samples': n,
+            'nll': sums['nll'].item() / (n * positions),
+            'expected_hits': sums['expected_hits'].item() / n,
+            'ece': expected_calibration_error(*sums['calibration']),
+        }
+        for k in self.ks:
+            per_position = (sums['hits'][k] / n).tolist()
+            report[f'hit@{k}'] = sum(per_position) / positions
+            report[f'hit@{k}_per_position'] = per_position
+        return report
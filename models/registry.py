@@ -0,0 +1,185 @@
+"""
+프로세스 전역 모델 레지스트리
+- 서버 시작 시 메인/보너스 Transformer + GAN Generator를 한 번만 로드
+- 모든 모델은 eval 모드로 상주
+- 보너스 모델은 Transformer/GAN 경로가 공유
+"""
+
+import io
+import time
+import hashlib
+import threading
+
+import torch
+
+from lotto.util import file_version
+from models.transformer.transformer import create_model
+from models.gan.gan import create_generator
+
+
+def get_device() -> torch.device:
+    """사용 가능한 디바이스 선택 (MPS > CUDA > CPU)"""
+    if torch.backends.mps.is_available():
+        return torch.device('mps')
+    elif torch.cuda.is_available():
+        return torch.device('cuda')
+    return torch.device('cpu')
+
+
+def read_checkpoint(checkpoint_path: str, device):
+    """
+    체크포인트 로드 + 내용 해시
+
+    Returns:
+        (checkpoint dict, sha256 앞 16자리)
+    """
+    with open(checkpoint_path, 'rb') as f:
+        raw = f.read()
+    fingerprint = hashlib.sha256(raw).hexdigest()[:16]
+    checkpoint = torch.load(io.BytesIO(raw), map_location=device, weights_only=False)
+    return checkpoint, fingerprint
+
+
+def build_transformer(checkpoint: dict, model_config: dict, device, fingerprint: str = None) -> torch.nn.Module:
+    """이미 읽은 체크포인트 dict → Transformer (eval 모드), 체크포인트 내용을 먼저 봐야 하는 경우용"""
+    model = create_model(checkpoint.get('config', model_config)).to(device)
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+    model.checkpoint_fingerprint = fingerprint
+    return model
+
+
+def load_transformer(checkpoint_path: str, model_config: dict, device) -> torch.nn.Module:
+    """Transformer 체크포인트 로드 (eval 모드)"""
+    checkpoint, fingerprint = read_checkpoint(checkpoint_path, device)
+    return build_transformer(checkpoint, model_config, device, fingerprint)
+
+
+def load_generator(checkpoint_path: str, model_config: dict, device) -> torch.nn.Module:
+    """GAN Generator 체크포인트 로드 (eval 모드)"""
+    checkpoint, fingerprint = read_checkpoint(checkpoint_path, device)
+    generator = create_generator(checkpoint.get('config', model_config)).to(device)
+    generator.load_state_dict(checkpoint['generator_state_dict'])
+    generator.eval()
+    generator.checkpoint_fingerprint = fingerprint
+    return generator
+
+
+def model_memory_bytes(model: torch.nn.Module) -> int:
+    """파라미터 + 버퍼가 차지하는 메모리 (bytes)"""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class ModelRegistry:
+    """
+    상주 모델 저장소
+
+    사용법:
+        registry = get_registry()
+        registry.load_all(main_cfg, bonus_cfg, gan_cfg)
+        main_model = registry.get('main')
+    """
+
+    def __init__(self, device: torch.device = None):
+        self.device = device or get_device()
+        self._models = {}
+        self._info = {}
+        self._sources = {}  # name -> (loader, checkpoint_path, model_config, stat)
+        self._lock = threading.Lock()
+
+    def _load(self, name: str, loader, checkpoint_path: str, model_config: dict):
+        """단일 모델 로드 + 로드 시간/메모리 기록"""
+        start = time.perf_counter()
+        try:
+            stat = file_version(checkpoint_path)
+            model = loader(checkpoint_path, model_config, self.device)
+        except FileNotFoundError:
+            # 소스는 기록해둠 → 나중에 파일이 생기면 refresh()에서 로드
+            self._sources[name] = (loader, checkpoint_path, model_config, None)
+            if name not in self._models:
+                self._info[name] = {'checkpoint': checkpoint_path, 'loaded': False,
+                                    'error': 'checkpoint not found'}
+            print(f'   ⚠️ {name}: 체크포인트 없음 ({checkpoint_path})')
+            return None
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._models[name] = model
+        self._sources[name] = (loader, checkpoint_path, model_config, stat)
+        self._info[name] = {
+            'checkpoint': checkpoint_path,
+            'fingerprint': model.checkpoint_fingerprint,
+            'loaded': True,
+            'load_time_ms': round(elapsed_ms, 2),
+            'memory_mb': round(model_memory_bytes(model) / 1024 ** 2, 3),
+            'params': sum(p.numel() for p in model.parameters()),
+        }
+        print(f'   ✅ {name}: {elapsed_ms:.1f}ms, {self._info[name]["memory_mb"]}MB')
+        return model
+
+    def load_all(self, main_config: dict, bonus_config: dict, gan_config: dict):
+        """메인, 보너스, GAN Generator 로드"""
+        with self._lock:
+            self._load('main', load_transformer,
+                       main_config['paths']['checkpoint'], main_config['model'])
+            self._load('bonus', load_transformer,
+                       bonus_config['paths']['checkpoint'], bonus_config['model'])
+            self._load('gan', load_generator,
+                       gan_config['paths']['checkpoint_g'], gan_config['model'])
+        return self
+
+    def refresh(self) -> list:
+        """
+        체크포인트 파일이 바뀌었거나 새로 생긴 모델만 (다시) 로드 (stat 비교라 요청마다 호출해도 가벼움)
+
+        Returns:
+            다시 로드된 모델 이름 리스트
+        """
+        reloaded = []
+        for name, (loader, checkpoint_path, model_config, stat) in list(self._sources.items()):
+            version = file_version(checkpoint_path)
+            if version is None or version == stat:
+                continue
+            with self._lock:
+                try:
+                    if self._load(name, loader, checkpoint_path, model_config) is not None:
+                        reloaded.append(name)
+                except Exception as e:
+                    # 저장 중인 파일 등 - 기존 모델 유지, 다음 호출에서 재시도
+                    print(f'   ⚠️ {name}: 재로드 실패 ({e})')
+        return reloaded
+
+    def get(self, name: str) -> torch.nn.Module:
+        """로드된 모델 반환 (없으면 RuntimeError)"""
+        model = self._models.get(name)
+        if model is None:
+            info = self._info.get(name, {})
+            reason = info.get('error', 'not loaded')
+            raise RuntimeError(f"Model '{name}' is not available: {reason}")
+        return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def fingerprints(self) -> tuple:
+        """로드된 모델별 체크포인트 해시 ((name, fingerprint), ...) - 체크포인트가 바뀌면 값이 달라짐"""
+        return tuple(sorted(
+            (name, getattr(model, 'checkpoint_fingerprint', None)) for name, model in self._models.items()
+        ))
+
+    def stats(self) -> dict:
+        """모델별 로드 시간/메모리 리포트"""
+        return {'device': str(self.device), 'models': dict(self._info)}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """프로세스 전역 레지스트리 (싱글턴)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,115 @@
+"""
+번호 샘플링 (중복 없이 6개)
+
+두 가지 방식:
+  - sequential: 기존 방식과 같은 분포. 위치 i의 로짓에서 이미 뽑은 번호를 가리고
+    top-k 안에서 하나씩 뽑음. softmax + multinomial 대신 Gumbel-max (argmax)로
+    같은 분포를 뽑아서 위치당 연산이 몇 개의 fused op으로 줄어듦
+  - gumbel: 한 번에 6개 (Gumbel-top-k). 위치별 분포를 하나로 합친 뒤
+    (위치 분포의 평균 = 혼합 분포) 그 분포에서 비복원 추출 (Plackett-Luce).
+    ⚠️ 위치별 헤드 순서 정보가 사라지므로 sequential과 분포가 다름
+
+temperature, top_k는 스칼라 또는 (batch,) 텐서 → 한 배치에 서로 다른 설정을 섞을 수 있음
+"""
+
+import torch
+
+
+def _per_row(value, batch_size: int, device, dtype) -> torch.Tensor:
+    """스칼라 또는 (batch,) 텐서 → (batch,) 텐서"""
+    if isinstance(value, torch.Tensor):
+        return value.to(device=device, dtype=dtype).expand(batch_size)
+    return torch.full((batch_size,), value, device=device, dtype=dtype)
+
+
+def apply_temperature(logits: torch.Tensor, temperature) -> torch.Tensor:
+    """(batch, ..., num_balls) 로짓을 행별 온도로 나눔"""
+    temperature = _per_row(temperature, logits.size(0), logits.device, logits.dtype)
+    return logits / temperature.view(-1, *([1] * (logits.dim() - 1)))
+
+
+def apply_top_k(logits: torch.Tensor, top_k) -> torch.Tensor:
+    """
+    행별 top-k 밖의 로짓을 -inf로 (batch, num_balls)
+    top_k가 None이면 그대로 반환. 경계값과 같은 로짓은 함께 남김
+    """
+    if top_k is None:
+        return logits
+    num_balls = logits.size(-1)
+    top_k = _per_row(top_k, logits.size(0), logits.device, torch.long).clamp(1, num_balls)
+    sorted_logits = logits.sort(dim=-1, descending=True).values
+    kth = sorted_logits.gather(-1, (top_k - 1).unsqueeze(-1))  # (batch, 1)
+    return logits.masked_fill(logits < kth, -float('inf'))
+
+
+def gumbel_noise(like: torch.Tensor) -> torch.Tensor:
+    """Gumbel(0, 1) 노이즈: argmax(logits + g) ~ softmax(logits)"""
+    u = torch.rand_like(like).clamp_(1e-10, 1.0 - 1e-7)
+    return -torch.log(-torch.log(u))
+
+
+def sequential_sample(logits: torch.Tensor, temperature=1.0, top_k=None) -> torch.Tensor:
+    """
+    위치별 순차 샘플링 (기존 generate 루프와 같은 분포)
+
+    Args:
+        logits: (batch, positions, num_balls)
+        temperature: 스칼라 또는 (batch,)
+        top_k: None, 스칼라 또는 (batch,)
+
+    Returns:
+        (batch, positions) 0-indexed, 뽑힌 순서대로
+    """
+    batch_size, positions, num_balls = logits.shape
+    logits = apply_temperature(logits, temperature)
+    used = torch.zeros(batch_size, num_balls, dtype=torch.bool, device=logits.device)
+    noise = gumbel_noise(logits)
+
+    selected = []
+    for i in range(positions):
+        curr = logits[:, i, :].masked_fill(used, -float('inf'))
+        curr = apply_top_k(curr, top_k)
+        choice = (curr + noise[:, i, :]).argmax(dim=-1)  # (batch,)
+        used.scatter_(1, choice.unsqueeze(-1), True)
+        selected.append(choice)
+    return torch.stack(selected, dim=1)
+
+
+def gumbel_top_k(logits: torch.Tensor, num: int = 6, temperature=1.0, top_k=None) -> torch.Tensor:
+    """
+    Gumbel-top-k 한 번에 num개 비복원 추출
+
+    Args:
+        logits: (batch, num_balls) 또는 (batch, positions, num_balls)
+            3차원이면 위치별 분포의 평균 (혼합 분포)에서 추출
+        top_k: 합쳐진 분포 기준 후보 수 (num보다 작으면 num으로 올림)
+
+    Returns:
+        (batch, num) 0-indexed
+    """
+    logits = apply_temperature(logits, temperature)
+    if logits.dim() == 3:
+        # log(mean_p softmax_p) - 상수항(log P)은 순위에 영향 없음
+        logits = torch.logsumexp(torch.log_softmax(logits, dim=-1), dim=1)
+
+    if top_k is not None:
+        top_k = _per_row(top_k, logits.size(0), logits.device, torch.long).clamp(min=num)
+        logits = apply_top_k(logits, top_k)
+    return (logits + gumbel_noise(logits)).topk(num, dim=-1).indices
+
+
+def sample_numbers(logits: torch.Tensor, temperature=1.0, top_k=None, method: str = 'sequential') -> torch.Tensor:
+    """
+    로짓 → 오름차순 번호 (batch, positions), 1~45
+
+    Args:
+        logits: (batch, positions, num_balls)
+        method: 'sequential' (기존 분포) 또는 'gumbel' (한 번에, 혼합 분포)
+    """
+    if method == 'sequential':
+        indices = sequential_sample(logits, temperature, top_k)
+    elif method == 'gumbel':
+        indices = gumbel_top_k(logits, logits.size(1), temperature, top_k)
+    else:
+        raise ValueError(f'Unknown sampling method: {method}')
+    return torch.sort(indices + 1, dim=1).values
@@ -0,0 +1,200 @@
+"""
+미리 생성해둔 티켓 풀
+- 기본 설정 (temperature/top_k 기본값) /generate 요청은 풀에서 바로 꺼내서 응답
+- 모델별 (capacity, 7) uint8 링 버퍼, 꺼내기는 head 이동 + 복사 한 번
+- 남은 양이 low watermark 아래로 내려가면 백그라운드 스레드가 큰 배치로 채움
+- 회차 버전이나 체크포인트가 바뀌면 풀을 비움 (이전 로짓으로 뽑은 티켓 폐기)
+- version_fn (stat / 재로드)은 보충 스레드만 호출, take()는 게시된 버전만 비교
+  → 회차/체크포인트가 바뀐 뒤 최대 1초 (보충 스레드 확인 간격) 동안은 이전 버전 티켓이 나갈 수 있음
+- 모델이 아직 없으면 (ready_fn) 보충을 건너뛰고, 보충이 실패하면 간격을 늘려가며 재시도 (1, 2, 4, ... 최대 30초)
+
+사용법:
+    pool = TicketPool('transformer', sample_fn, version_fn, capacity=10000).start()
+    tickets = pool.take(5)      # (5, 7) uint8, 부족하면 None
+"""
+
+import time
+import threading
+
+import numpy as np
+
+from lotto.util import env_int
+
+POOL_SIZE_ENV = 'LOTTO_TICKET_POOL_SIZE'
+VERSION_CHECK_INTERVAL = 1.0
+MAX_RETRY_DELAY = 30.0
+
+
+def configured_pool_size(default: int = 10_000) -> int:
+    """LOTTO_TICKET_POOL_SIZE (0이면 풀 사용 안 함)"""
+    return env_int(POOL_SIZE_ENV, default)
+
+
+class TicketPool:
+    """
+    티켓 링 버퍼 + 백그라운드 보충
+
+    Args:
+        sample_fn: (count) -> (count, 7) uint8 (백그라운드 스레드에서 호출)
+        version_fn: () -> 현재 버전 키 (회차 버전, 체크포인트 해시 등). 바뀌면 풀을 비움
+            (보충 스레드에서만 호출, 최대 1초 간격)
+        ready_fn: () -> bool, False면 보충하지 않음 (체크포인트가 아직 없는 모델 등)
+        capacity: 버퍼 크기 (티켓 수)
+        low_watermark: 이 비율 아래로 내려가면 보충 시작
+        refill_batch: 보충 한 번에 생성할 티켓 수 (기본: capacity의 절반)
+    """
+
+    def __init__(self, name: str, sample_fn, version_fn, capacity: int = 10_000,
+                 low_watermark: float = 0.25, refill_batch: int = None, ready_fn=None):
+        self.name = name
+        self.sample_fn = sample_fn
+        self.version_fn = version_fn
+        self.ready_fn = ready_fn
+        self.capacity = capacity
+        self.low = max(1, int(capacity * low_watermark))
+        self.refill_batch = refill_batch or max(1, capacity // 2)
+
+        self._buffer = np.zeros((capacity, 7), dtype=np.uint8)
+        self._head = 0
+        self._size = 0
+        self._version = None            # 버퍼에 든 티켓의 버전
+        self.current_version = None     # 보충 스레드가 마지막으로 확인한 버전
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = None
+        self._failures = 0              # 연속 보충 실패
+        self._retry_at = 0.0
+        self.ready = ready_fn is None
+
+        # 지표
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.refills = 0
+        self.refilled = 0
+        self.refill_seconds = 0.0
+        self.refill_errors = 0
+
+    def start(self):
+        """백그라운드 보충 스레드 시작 (처음부터 가득 채움)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refill_loop, name=f'ticket-pool-{self.name}', daemon=True)
+            self._thread.start()
+            self._wakeup.set()
+        return self
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _check_version(self, version):
+        """버전이 바뀌었으면 비움 (lock 안에서 호출)"""
+        if version != self._version:
+            if self._size:
+                self.flushes += 1
+            self._version = version
+            self._head = 0
+            self._size = 0
+
+    def take(self, count: int):
+        """
+        count개 꺼내기 (O(count) 복사, 생성/버전 확인 호출 없음)
+        버전은 보충 스레드가 게시한 값만 비교 → 변경 후 최대 VERSION_CHECK_INTERVAL초는 이전 티켓이 나갈 수 있음
+
+        Returns:
+            (count, 7) uint8 또는 None (남은 티켓 부족 또는 버전 변경 → 호출 쪽에서 직접 생성)
+        """
+        with self._lock:
+            if count > self._size or self._version != self.current_version:
+                # 버전이 바뀐 버퍼는 보충 스레드가 비우고 다시 채움
+                self.misses += 1
+                tickets = None
+            else:
+                end = self._head + count
+                if end <= self.capacity:
+                    tickets = self._buffer[self._head:end].copy()
+                else:
+                    tickets = np.concatenate([self._buffer[self._head:], self._buffer[:end - self.capacity]])
+                self._head = end % self.capacity
+                self._size -= count
+                self.hits += 1
+            low = self._size < self.low or self._version != self.current_version
+        if low:
+            self._wakeup.set()
+        return tickets
+
+    def _put(self, tickets: np.ndarray, version) -> bool:
+        """버퍼 뒤쪽에 추가 (그동안 버전이 바뀌었으면 버림)"""
+        with self._lock:
+            if version != self._version:
+                return False
+            n = min(len(tickets), self.capacity - self._size)
+            tail = (self._head + self._size) % self.capacity
+            first = min(n, self.capacity - tail)
+            self._buffer[tail:tail + first] = tickets[:first]
+            self._buffer[:n - first] = tickets[first:n]
+            self._size += n
+            return True
+
+    def _refill_loop(self):
+        while not self._closed:
+            self._wakeup.wait(timeout=VERSION_CHECK_INTERVAL)
+            self._wakeup.clear()
+            # 요청이 없어도 회차/체크포인트 변경은 반영
+            while not self._closed:
+                try:
+                    version = self.version_fn()
+                except Exception as e:
+                    print(f'⚠️ ticket pool {self.name}: version check failed ({e})')
+                    time.sleep(1.0)
+                    break
+                with self._lock:
+                    self.current_version = version
+                    self._check_version(version)
+                    space = self.capacity - self._size
+                    if space == 0 or (self._size >= self.low and space < self.refill_batch):
+                        break
+                if self.ready_fn is not None:
+                    self.ready = bool(self.ready_fn())
+                    if not self.ready:
+                        break  # 모델이 생기면 다음 확인 때 보충
+                if time.monotonic() < self._retry_at:
+                    break
+                start = time.perf_counter()
+                try:
+                    tickets = self.sample_fn(min(self.refill_batch, space))
+                except Exception as e:
+                    self.refill_errors += 1
+                    delay = min(MAX_RETRY_DELAY, 2.0 ** self._failures)
+                    self._failures += 1
+                    self._retry_at = time.monotonic() + delay
+                    print(f'⚠️ ticket pool {self.name}: refill failed ({e}), retrying in {delay:.0f}s')
+                    break
+                if self._failures:
+                    print(f'✅ ticket pool {self.name}: refill recovered')
+                    self._failures = 0
+                if self._put(tickets, version):
+                    self.refills += 1
+                    self.refilled += len(tickets)
+                    self.refill_seconds += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        served = self.hits + self.misses
+        return {
+            'depth': self._size,
+            'capacity': self.capacity,
+            'low_watermark': self.low,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / served, 4) if served else 0.0,
+            'flushes': self.flushes,
+            'refills': self.refills,
+            'refilled': self.refilled,
+            'refill_rate': round(self.refilled / self.refill_seconds, 1) if self.refill_seconds else 0.0,
+            'refill_errors': self.refill_errors,
+            'ready': self.ready,
+        }
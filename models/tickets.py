@@ -0,0 +1,105 @@
+"""
+티켓 샘플러 (transformer / gan / random 공통)
+- 모델과 로짓은 한 번 준비해두고 청크 단위로 샘플링
+- 결과는 (count, 7) uint8 배열 (오름차순 메인 6개 + 보너스)
+"""
+
+import numpy as np
+import torch
+
+from lotto.uniqueness import unique_sample
+from models.transformer.generate_full import (
+    latest_bonus_logits, latest_main_logits, sample_bonus, sample_with_bonus
+)
+
+SOURCES = ('transformer', 'gan', 'random')
+# source별로 레지스트리에 있어야 하는 모델
+SOURCE_MODELS = {'transformer': ('main', 'bonus'), 'gan': ('gan', 'bonus'), 'random': ()}
+
+
+def pack_tickets(main_numbers: torch.Tensor, bonus: torch.Tensor) -> np.ndarray:
+    """(sets, 6) 메인 + (sets,) 보너스 텐서 → (sets, 7) uint8 배열"""
+    packed = torch.cat([main_numbers, bonus.unsqueeze(-1)], dim=1).to(torch.uint8)
+    return packed.cpu().numpy()
+
+
+def sample_random(count: int) -> np.ndarray:
+    """45개 중 7개 비복원 추출 (6개 메인 오름차순 + 보너스)"""
+    picks = torch.rand(count, 45).argsort(dim=1)[:, :7] + 1
+    main_numbers = picks[:, :6].sort(dim=1).values
+    return pack_tickets(main_numbers, picks[:, 6])
+
+
+class TicketSampler:
+    """
+    source별 티켓 샘플러
+
+    사용법:
+        sampler = TicketSampler('transformer', registry, main_cfg, bonus_cfg, logit_cache)
+        tickets = sampler.sample(10000)   # (10000, 7) uint8
+    """
+
+    def __init__(self, source: str, registry=None, main_config: dict = None,
+                 bonus_config: dict = None, logit_cache=None):
+        if source not in SOURCES:
+            raise ValueError(f'Unknown source: {source}')
+        self.source = source
+        self.registry = registry
+        self.main_config = main_config
+        self.bonus_config = bonus_config
+        self.logit_cache = logit_cache
+
+    def available(self) -> bool:
+        """필요한 모델이 모두 로드됐는지 (random은 항상 True)"""
+        return all(self.registry.is_loaded(name) for name in SOURCE_MODELS[self.source])
+
+    def sample(self, count: int, temperature=1.0, top_k=15) -> np.ndarray:
+        """
+        count개 티켓 샘플링
+
+        temperature, top_k는 transformer에만 적용 (스칼라 또는 (count,) 텐서).
+        gan은 기존 generate_numbers와 같은 기본 설정 사용
+        """
+        if self.source == 'random':
+            return sample_random(count)
+
+        bonus_model = self.registry.get('bonus')
+        bonus_cfg = self.bonus_config
+        bonus_logits = latest_bonus_logits(
+            bonus_model, bonus_cfg['paths']['data'], bonus_cfg['model']['seq_len'], self.logit_cache
+        )
+
+        if self.source == 'transformer':
+            main_model = self.registry.get('main')
+            main_cfg = self.main_config
+            main_logits = latest_main_logits(
+                main_model, main_cfg['paths']['data'], main_cfg['model']['seq_len'], self.logit_cache
+            )
+            main_numbers, bonus = sample_with_bonus(
+                main_model, main_logits, bonus_logits, count, temperature=temperature, top_k=top_k
+            )
+        else:
+            generator = self.registry.get('gan')
+            main_numbers = generator.generate(count, self.registry.device)
+            bonus = sample_bonus(bonus_logits, main_numbers)
+
+        return pack_tickets(main_numbers, bonus)
+
+    def sample_unique(self, count: int, temperature=1.0, top_k=15, seen=None, max_rounds: int = 50) -> np.ndarray:
+        """
+        중복 없는 count개 티켓 (메인 6개 기준, 겹친 행만 다시 샘플링)
+        seen(TicketBitset)을 넘기면 이전 청크/응답과도 겹치지 않음
+        """
+        def sample_rows(rows):
+            rows_t = torch.from_numpy(rows)
+            return self.sample(
+                len(rows), temperature=_select_rows(temperature, rows_t), top_k=_select_rows(top_k, rows_t)
+            )
+        return unique_sample(sample_rows, count, seen=seen, max_rounds=max_rounds)
+
+
+def _select_rows(value, rows: torch.Tensor):
+    """행별 설정 텐서면 해당 행만, 스칼라면 그대로"""
+    if isinstance(value, torch.Tensor) and value.dim() > 0:
+        return value[rows.to(value.device)]
+    return value
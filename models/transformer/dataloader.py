@@ -2,15 +2,35 @@
 로또 데이터 로더 및 전처리
 """
 
-import json
 import torch
-from torch.utils.data import Dataset, DataLoader
-from typing import Tuple, List
-import os
+from torch.utils.data import Dataset
+from typing import Tuple
+
+from models.batch_loader import TensorBatchLoader, chronological_split
+from models.draw_store import get_draw_store
+
+
+def sliding_windows(data: torch.Tensor, seq_len: int) -> torch.Tensor:
+    """
+    (N, C) → (N - seq_len, seq_len, C) 슬라이딩 윈도우 view (복사 없음)
+    
+    i번째 윈도우 = data[i:i + seq_len], 타겟은 data[i + seq_len]이므로
+    마지막 윈도우 (타겟 없음)는 제외
+    """
+    num_samples = max(data.size(0) - seq_len, 0)
+    if num_samples == 0:
+        return data.new_empty((0, seq_len, data.size(1)))
+    # unfold: (N - seq_len + 1, C, seq_len) → transpose: (.., seq_len, C)
+    return data.unfold(0, seq_len, 1).transpose(1, 2)[:num_samples]
 
 
 class LottoDataset(Dataset):
-    """로또 시퀀스 데이터셋"""
+    """
+    로또 시퀀스 데이터셋
+    
+    (N, 7) 텐서 하나 위에 윈도우를 view로 노출하므로
+    seq_len이 커져도 메모리가 늘지 않고, 샘플 조회 시 복사가 없음
+    """
     
     def __init__(self, data_path: str, seq_len: int = 20, include_bonus: bool = False):
         """
@@ -22,45 +42,22 @@ class LottoDataset(Dataset):
         self.seq_len = seq_len
         self.include_bonus = include_bonus
         
-        # 데이터 로드
-        with open(data_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
-        
-        self.draws = raw_data['draws']
-        self.total_draws = len(self.draws)
+        # 데이터 로드 (DrawStore: 회차순 정렬된 (N, 7) 배열) → (N, 7) long 텐서 1개
+        self.data = torch.from_numpy(get_draw_store(data_path).draws.astype('int64'))
+        self.total_draws = self.data.size(0)
+        num_cols = 7 if include_bonus else 6
         
-        # 데이터 정렬 (회차순)
-        self.draws.sort(key=lambda x: x['draw_no'])
+        # 입력: 과거 seq_len 회차 윈도우 view (M, seq_len, 6 or 7)
+        self.sequences = sliding_windows(self.data[:, :num_cols], seq_len)
         
-        # 시퀀스 데이터 생성
-        self.sequences = []
-        self.targets = []
-        
-        for i in range(seq_len, self.total_draws):
-            # 입력: 과거 seq_len 회차
-            seq = []
-            for j in range(i - seq_len, i):
-                draw = self.draws[j]
-                numbers = draw['numbers']  # [6개 번호]
-                if include_bonus:
-                    numbers = numbers + [draw['bonus']]
-                seq.append(numbers)
-            
-            # 타겟: 현재 회차 번호 (6개)
-            target = self.draws[i]['numbers']
-            
-            self.sequences.append(seq)
-            self.targets.append(target)
+        # 타겟: 현재 회차 번호 (M, 6), 0-indexed로 변환 (1~45 -> 0~44)
+        self.targets = self.data[seq_len:, :6] - 1
     
     def __len__(self) -> int:
-        return len(self.sequences)
+        return self.sequences.size(0)
     
     def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor]:
-        seq = torch.tensor(self.sequences[idx], dtype=torch.long)  # (seq_len, 6 or 7)
-        target = torch.tensor(self.targets[idx], dtype=torch.long)  # (6,)
-        # 타겟을 0-indexed로 변환 (1~45 -> 0~44)
-        target = target - 1
-        return seq, target
+        return self.sequences[idx], self.targets[idx]  # (seq_len, 6 or 7), (6,)
 
 
 def create_dataloaders(
@@ -68,10 +65,11 @@ def create_dataloaders(
     seq_len: int = 20,
     batch_size: int = 32,
     train_ratio: float = 0.8,
-    include_bonus: bool = False
-) -> Tuple[DataLoader, DataLoader]:
+    include_bonus: bool = False,
+    device=None
+) -> Tuple[TensorBatchLoader, TensorBatchLoader]:
     """
-    학습/검증 데이터로더 생성
+    학습/검증 데이터로더 생성 (텐서 상주, device에 통째로 올림)
     
     Returns:
         (train_loader, val_loader)
@@ -79,17 +77,10 @@ def create_dataloaders(
     dataset = LottoDataset(data_path, seq_len, include_bonus)
     
     # 시간순으로 분할 (나중 데이터를 검증용으로)
-    total = len(dataset)
-    train_size = int(total * train_ratio)
-    
-    train_indices = list(range(train_size))
-    val_indices = list(range(train_size, total))
+    train, val = chronological_split(dataset.sequences, dataset.targets, train_ratio=train_ratio)
     
-    train_subset = torch.utils.data.Subset(dataset, train_indices)
-    val_subset = torch.utils.data.Subset(dataset, val_indices)
-    
-    train_loader = DataLoader(train_subset, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_subset, batch_size=batch_size, shuffle=False)
+    train_loader = TensorBatchLoader(*train, batch_size=batch_size, shuffle=True, device=device)
+    val_loader = TensorBatchLoader(*val, batch_size=batch_size, shuffle=False, device=device)
     
     return train_loader, val_loader
 
@@ -101,20 +92,7 @@ def get_latest_sequence(data_path: str, seq_len: int = 20, include_bonus: bool =
     Returns:
         (1, seq_len, 6 or 7) 텐서
     """
-    with open(data_path, 'r', encoding='utf-8') as f:
-        raw_data = json.load(f)
-    
-    draws = raw_data['draws']
-    draws.sort(key=lambda x: x['draw_no'])
-    
-    # 최신 seq_len 회차
-    latest = draws[-seq_len:]
-    
-    seq = []
-    for draw in latest:
-        numbers = draw['numbers']
-        if include_bonus:
-            numbers = numbers + [draw['bonus']]
-        seq.append(numbers)
+    num_cols = 7 if include_bonus else 6
+    latest = get_draw_store(data_path).latest(seq_len)[:, :num_cols]
     
-    return torch.tensor([seq], dtype=torch.long)
+    return torch.from_numpy(latest.astype('int64')).unsqueeze(0)
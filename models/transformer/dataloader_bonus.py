@@ -3,80 +3,57 @@
 과거 보너스 시퀀스 → 다음 보너스 예측
 """
 
-import json
 import torch
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset
 from typing import Tuple
 
+from models.batch_loader import TensorBatchLoader, chronological_split
+from models.draw_store import get_draw_store
+from models.transformer.dataloader import sliding_windows
+
 
 class BonusDataset(Dataset):
-    """보너스 번호 시퀀스 데이터셋"""
+    """보너스 번호 시퀀스 데이터셋 (보너스 컬럼 view 위의 슬라이딩 윈도우)"""
     
     def __init__(self, data_path: str, seq_len: int = 20):
         self.seq_len = seq_len
         
-        with open(data_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
-        
-        self.draws = raw_data['draws']
-        self.draws.sort(key=lambda x: x['draw_no'])
-        
-        # 보너스 번호만 추출
-        self.bonuses = [draw['bonus'] for draw in self.draws]
-        
-        # 시퀀스 생성
-        self.sequences = []
-        self.targets = []
+        # 보너스 번호만 추출 (DrawStore: 회차순 정렬) → (N, 1) view
+        self.data = torch.from_numpy(get_draw_store(data_path).draws.astype('int64'))
+        self.bonuses = self.data[:, 6:7]
         
-        for i in range(seq_len, len(self.bonuses)):
-            seq = self.bonuses[i - seq_len:i]
-            target = self.bonuses[i]
-            self.sequences.append(seq)
-            self.targets.append(target)
+        # 입력: (M, seq_len, 1) 윈도우 view, 타겟: (M, 1) 0-indexed
+        self.sequences = sliding_windows(self.bonuses, seq_len)
+        self.targets = self.bonuses[seq_len:] - 1
     
     def __len__(self) -> int:
-        return len(self.sequences)
+        return self.sequences.size(0)
     
     def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor]:
-        # (seq_len, 1) 형태로 reshape
-        seq = torch.tensor(self.sequences[idx], dtype=torch.long).unsqueeze(-1)
-        target = torch.tensor([self.targets[idx] - 1], dtype=torch.long)  # 0-indexed
-        return seq, target
+        return self.sequences[idx], self.targets[idx]  # (seq_len, 1), (1,)
 
 
 def create_bonus_dataloaders(
     data_path: str,
     seq_len: int = 20,
     batch_size: int = 32,
-    train_ratio: float = 0.8
-) -> Tuple[DataLoader, DataLoader]:
-    """보너스 학습/검증 데이터로더"""
+    train_ratio: float = 0.8,
+    device=None
+) -> Tuple[TensorBatchLoader, TensorBatchLoader]:
+    """보너스 학습/검증 데이터로더 (텐서 상주)"""
     dataset = BonusDataset(data_path, seq_len)
     
-    total = len(dataset)
-    train_size = int(total * train_ratio)
+    train, val = chronological_split(dataset.sequences, dataset.targets, train_ratio=train_ratio)
     
-    train_indices = list(range(train_size))
-    val_indices = list(range(train_size, total))
-    
-    train_subset = torch.utils.data.Subset(dataset, train_indices)
-    val_subset = torch.utils.data.Subset(dataset, val_indices)
-    
-    train_loader = DataLoader(train_subset, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_subset, batch_size=batch_size, shuffle=False)
+    train_loader = TensorBatchLoader(*train, batch_size=batch_size, shuffle=True, device=device)
+    val_loader = TensorBatchLoader(*val, batch_size=batch_size, shuffle=False, device=device)
     
     return train_loader, val_loader
 
 
 def get_latest_bonus_sequence(data_path: str, seq_len: int = 20) -> torch.Tensor:
     """최신 보너스 시퀀스 (추론용)"""
-    with open(data_path, 'r', encoding='utf-8') as f:
-        raw_data = json.load(f)
-    
-    draws = raw_data['draws']
-    draws.sort(key=lambda x: x['draw_no'])
-    
-    bonuses = [draw['bonus'] for draw in draws[-seq_len:]]
+    bonuses = get_draw_store(data_path).bonuses()[-seq_len:]
     
     # (1, seq_len, 1) 형태
-    return torch.tensor(bonuses, dtype=torch.long).unsqueeze(0).unsqueeze(-1)
+    return torch.from_numpy(bonuses.astype('int64')).unsqueeze(0).unsqueeze(-1)
@@ -3,12 +3,11 @@
 config.json에서 파라미터를 로드합니다.
 """
 
-import torch
 import argparse
 from pathlib import Path
 import json
 
-from models.transformer.transformer import create_model
+from models.registry import get_device, load_transformer
 from models.transformer.dataloader import get_latest_sequence
 
 # Config 로드
@@ -19,9 +18,11 @@ def load_config():
         return json.load(f)
 
 
-def generate_numbers(config, num_sets: int = None, temperature: float = None, top_k: int = None):
+def generate_numbers(config, num_sets: int = None, temperature: float = None, top_k: int = None, model=None):
     """
     로또 번호 생성
+
+    model을 넘기면 (레지스트리에 상주 중인 모델) 체크포인트 로드를 건너뜀
     """
     model_cfg = config['model']
     gen_cfg = config['generation']
@@ -32,24 +33,13 @@ def generate_numbers(config, num_sets: int = None, temperature: float = None, to
     temperature = temperature or gen_cfg['temperature']
     top_k = top_k or gen_cfg['top_k']
     
-    # 디바이스 설정
-    if torch.backends.mps.is_available():
-        device = torch.device('mps')
-    elif torch.cuda.is_available():
-        device = torch.device('cuda')
-    else:
-        device = torch.device('cpu')
-    
-    # 모델 로드
-    checkpoint = torch.load(paths_cfg['checkpoint'], map_location=device, weights_only=False)
-    saved_config = checkpoint.get('config', model_cfg)
-    
-    model = create_model(saved_config).to(device)
-    model.load_state_dict(checkpoint['model_state_dict'])
-    model.eval()
+    # 모델 로드 (미리 로드된 모델이 없을 때만)
+    if model is None:
+        model = load_transformer(paths_cfg['checkpoint'], model_cfg, get_device())
+    device = next(model.parameters()).device
     
     # 최신 시퀀스 로드
-    seq_len = saved_config.get('seq_len', model_cfg['seq_len'])
+    seq_len = model.seq_len
     input_seq = get_latest_sequence(paths_cfg['data'], seq_len=seq_len).to(device)
     
     # 번호 생성
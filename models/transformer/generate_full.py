@@ -8,7 +8,8 @@ import argparse
 from pathlib import Path
 import json
 
-from models.transformer.transformer import create_model
+from models.registry import get_device, load_transformer
+from models.sampling import apply_temperature
 from models.transformer.dataloader import get_latest_sequence
 from models.transformer.dataloader_bonus import get_latest_bonus_sequence
 
@@ -24,78 +25,127 @@ def load_configs():
     return main_config, bonus_config
 
 
-def generate_with_bonus(main_config, bonus_config, num_sets=5, temperature=1.0, top_k=15):
-    """메인 6개 + 보너스 1개 생성"""
+def sample_bonus(bonus_logits: torch.Tensor, main_numbers: torch.Tensor, temperature=1.0) -> torch.Tensor:
+    """
+    보너스 번호 일괄 샘플링 (메인 번호와 중복 없이)
     
-    # 디바이스
-    if torch.backends.mps.is_available():
-        device = torch.device('mps')
-    elif torch.cuda.is_available():
-        device = torch.device('cuda')
-    else:
-        device = torch.device('cpu')
+    Args:
+        bonus_logits: (1, 1, 45) 또는 (sets, 1, 45) 보너스 모델 출력
+        main_numbers: (sets, 6) 메인 번호 (1~45)
+        temperature: 스칼라 또는 (sets,)
+    
+    Returns:
+        (sets,) 보너스 번호 (1~45)
+    """
+    num_sets = main_numbers.size(0)
+    logits = apply_temperature(bonus_logits[:, 0, :].expand(num_sets, -1), temperature)  # (sets, 45)
+    
+    # 메인 번호 마스킹: (sets, 45) 마스크에 scatter 한 번
+    mask = torch.zeros(num_sets, logits.size(-1), dtype=torch.bool, device=logits.device)
+    mask.scatter_(1, main_numbers.to(logits.device) - 1, True)
+    logits = logits.masked_fill(mask, -float('inf'))
+    
+    probs = torch.softmax(logits, dim=-1)
+    return torch.multinomial(probs, 1).squeeze(-1) + 1
+
+
+def latest_main_logits(main_model, data_path: str, seq_len: int, logit_cache=None) -> torch.Tensor:
+    """최신 seq_len 회차 기준 메인 로짓 (1, 6, 45) - logit_cache가 있으면 캐시 사용"""
+    def compute():
+        device = next(main_model.parameters()).device
+        seq = get_latest_sequence(data_path, seq_len).to(device)
+        with torch.no_grad():
+            return main_model(seq)
+    
+    if logit_cache is None:
+        return compute()
+    return logit_cache.get('main', main_model, data_path, compute)
+
+
+def latest_bonus_logits(bonus_model, data_path: str, seq_len: int, logit_cache=None) -> torch.Tensor:
+    """최신 seq_len 회차 기준 보너스 로짓 (1, 1, 45) - logit_cache가 있으면 캐시 사용"""
+    def compute():
+        device = next(bonus_model.parameters()).device
+        seq = get_latest_bonus_sequence(data_path, seq_len).to(device)
+        with torch.no_grad():
+            return bonus_model(seq)
+    
+    if logit_cache is None:
+        return compute()
+    return logit_cache.get('bonus', bonus_model, data_path, compute)
+
+
+def sample_with_bonus(main_model, main_logits, bonus_logits, num_sets, temperature=1.0, top_k=15):
+    """
+    메인 + 보너스 일괄 샘플링
+    
+    입력 시퀀스가 모든 세트에서 같으므로 메인/보너스 로짓은 한 번만 계산해서 넘기고
+    세트 수만큼 expand 해서 샘플링
+    
+    Returns:
+        (main (sets, 6), bonus (sets,)) 텐서
+    """
+    with torch.no_grad():
+        main_numbers = main_model.sample(
+            main_logits.expand(num_sets, -1, -1), temperature=temperature, top_k=top_k
+        )
+        bonus = sample_bonus(bonus_logits, main_numbers, temperature)
+    return main_numbers, bonus
+
+
+def generate_with_bonus(main_config, bonus_config, num_sets=5, temperature=1.0, top_k=15,
+                        main_model=None, bonus_model=None, logit_cache=None, verbose=True):
+    """
+    메인 6개 + 보너스 1개 생성
+
+    main_model/bonus_model을 넘기면 (레지스트리에 상주 중인 모델) 체크포인트 로드를 건너뜀
+    logit_cache를 넘기면 회차/체크포인트가 같은 동안 forward를 건너뜀
+    verbose=False면 콘솔 출력 생략 (서버용)
+    """
     
     main_paths = main_config['paths']
     bonus_paths = bonus_config['paths']
     
-    # 메인 모델 로드
-    main_ckpt = torch.load(main_paths['checkpoint'], map_location=device, weights_only=False)
-    main_model = create_model(main_ckpt.get('config', main_config['model'])).to(device)
-    main_model.load_state_dict(main_ckpt['model_state_dict'])
-    main_model.eval()
-    
-    # 보너스 모델 로드
-    bonus_ckpt = torch.load(bonus_paths['checkpoint'], map_location=device, weights_only=False)
-    bonus_model = create_model(bonus_ckpt.get('config', bonus_config['model'])).to(device)
-    bonus_model.load_state_dict(bonus_ckpt['model_state_dict'])
-    bonus_model.eval()
-    
-    # 입력 시퀀스
-    main_seq = get_latest_sequence(main_paths['data'], main_config['model']['seq_len']).to(device)
-    bonus_seq = get_latest_bonus_sequence(bonus_paths['data'], bonus_config['model']['seq_len']).to(device)
-    
-    print('=' * 60)
-    print('🎱 AI 로또 번호 생성기 (메인 + 보너스)')
-    print('=' * 60)
-    print(f'   메인 모델: {main_paths["checkpoint"]}')
-    print(f'   보너스 모델: {bonus_paths["checkpoint"]}')
-    print(f'   온도: {temperature}, Top-K: {top_k}')
-    print('=' * 60)
-    
-    results = []
-    
-    for i in range(num_sets):
-        # 메인 6개 생성
-        main_input = main_seq.repeat(1, 1, 1)
-        main_numbers = main_model.generate(main_input, temperature=temperature, top_k=top_k)
-        main_list = main_numbers[0].cpu().tolist()
-        
-        # 보너스 생성 (메인과 중복 시 재시도)
-        bonus_input = bonus_seq.repeat(1, 1, 1)
-        
-        with torch.no_grad():
-            bonus_logits = bonus_model.forward(bonus_input)  # (1, 1, 45)
-            bonus_probs = bonus_logits[0, 0, :] / temperature
-            
-            # 메인 번호 마스킹
-            for num in main_list:
-                bonus_probs[num - 1] = -float('inf')
-            
-            probs = torch.softmax(bonus_probs, dim=-1)
-            bonus_idx = torch.multinomial(probs, 1).item()
-            bonus = bonus_idx + 1
-        
-        results.append((main_list, bonus))
-    
-    print('\n📌 생성된 번호:')
-    print('-' * 60)
-    
-    for i, (main_nums, bonus) in enumerate(results):
-        nums_str = ', '.join([f'{n:2d}' for n in main_nums])
-        print(f'   세트 {i+1}: [ {nums_str} ] + 보너스 🔵 {bonus}')
-    
-    print('-' * 60)
-    print('\n💡 참고: AI 예측은 재미용이며 당첨을 보장하지 않습니다.')
+    # 모델 로드 (미리 로드된 모델이 없을 때만)
+    if main_model is None:
+        main_model = load_transformer(main_paths['checkpoint'], main_config['model'], get_device())
+    if bonus_model is None:
+        bonus_model = load_transformer(bonus_paths['checkpoint'], bonus_config['model'], get_device())
+    
+    # 최신 회차 기준 로짓 (forward 각 1회 또는 캐시)
+    main_logits = latest_main_logits(
+        main_model, main_paths['data'], main_config['model']['seq_len'], logit_cache
+    )
+    bonus_logits = latest_bonus_logits(
+        bonus_model, bonus_paths['data'], bonus_config['model']['seq_len'], logit_cache
+    )
+    
+    if verbose:
+        print('=' * 60)
+        print('🎱 AI 로또 번호 생성기 (메인 + 보너스)')
+        print('=' * 60)
+        print(f'   메인 모델: {main_paths["checkpoint"]}')
+        print(f'   보너스 모델: {bonus_paths["checkpoint"]}')
+        print(f'   온도: {temperature}, Top-K: {top_k}')
+        print('=' * 60)
+    
+    # 전체 세트 일괄 샘플링
+    main_numbers, bonus = sample_with_bonus(
+        main_model, main_logits, bonus_logits, num_sets,
+        temperature=temperature, top_k=top_k
+    )
+    results = list(zip(main_numbers.cpu().tolist(), bonus.cpu().tolist()))
+    
+    if verbose:
+        print('\n📌 생성된 번호:')
+        print('-' * 60)
+    
+        for i, (main_nums, bonus) in enumerate(results):
+            nums_str = ', '.join([f'{n:2d}' for n in main_nums])
+            print(f'   세트 {i+1}: [ {nums_str} ] + 보너스 🔵 {bonus}')
+    
+        print('-' * 60)
+        print('\n💡 참고: AI 예측은 재미용이며 당첨을 보장하지 않습니다.')
     
     return results
 
@@ -0,0 +1,85 @@
+"""
+서빙용 로짓 캐시
+- 서빙 경로의 forward 입력은 항상 "최신 seq_len 회차"라서
+  draws.json과 체크포인트가 바뀌기 전까지 로짓이 변하지 않음
+- (회차 버전, 체크포인트 해시) 키로 로짓을 캐시하고 요청마다 샘플링만 수행
+"""
+
+import threading
+from collections import OrderedDict
+
+from models.draw_store import get_draw_store
+
+
+def draw_version(data_path: str) -> tuple:
+    """draws.json 버전 - 파일이 바뀌면 값이 달라짐"""
+    return get_draw_store(data_path).version
+
+
+class LogitCache:
+    """
+    (tag, 체크포인트 해시, 회차 버전) → 로짓 텐서
+
+    - draws.json이 바뀌면 회차 버전이 달라져 자동으로 miss
+    - 체크포인트가 바뀌어 모델이 다시 로드되면 해시가 달라져 자동으로 miss
+    - 체크포인트 해시가 없는 모델 (직접 생성한 모델 등)은 캐시하지 않음
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tag: str, model, data_path: str, compute):
+        """
+        캐시된 로짓 반환, 없으면 compute()로 계산 후 저장
+
+        Args:
+            tag: 'main' / 'bonus' 등 로짓 종류
+            model: checkpoint_fingerprint 속성이 있는 모델
+            data_path: draws.json 경로
+            compute: 로짓을 계산하는 인자 없는 함수
+        """
+        fingerprint = getattr(model, 'checkpoint_fingerprint', None)
+        if fingerprint is None:
+            return compute()
+
+        key = (tag, fingerprint, draw_version(data_path))
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        logits = compute()
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = logits
+            # 이전 버전 항목 제거
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return logits
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_cache = LogitCache()
+
+
+def get_logit_cache() -> LogitCache:
+    """프로세스 전역 로짓 캐시"""
+    return _cache
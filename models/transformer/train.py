@@ -12,6 +12,7 @@ import json
 
 from models.transformer.transformer import create_model
 from models.transformer.dataloader import create_dataloaders
+from models.metrics import topk_hits
 
 # Config 로드
 CONFIG_PATH = Path(__file__).parent / 'config.json'
@@ -48,10 +49,10 @@ def train_epoch(model, loader, criterion, optimizer, device):
 
 
 def validate(model, loader, criterion, device):
-    """검증"""
+    """검증 (배치 텐서 연산, 호스트 동기화는 마지막 1회)"""
     model.eval()
-    total_loss = 0
-    correct_nums = 0
+    total_loss = torch.zeros((), device=device)
+    correct_nums = torch.zeros((), device=device)
     total_nums = 0
     
     with torch.no_grad():
@@ -61,19 +62,13 @@ def validate(model, loader, criterion, device):
             
             output = model(seq)
             
-            loss = 0
-            for i in range(6):
-                loss += criterion(output[:, i, :], target[:, i])
-                top10 = output[:, i, :].topk(10, dim=1).indices
-                for b in range(target.size(0)):
-                    if target[b, i] in top10[b]:
-                        correct_nums += 1
-                    total_nums += 1
-            loss /= 6
-            
-            total_loss += loss.item()
+            # 위치별 손실 평균 (배치 크기가 같으므로 전체 평균과 동일)
+            total_loss += criterion(output.reshape(-1, output.size(-1)), target.reshape(-1))
+            correct_nums += topk_hits(output, target, 10).sum()
+            total_nums += target.numel()
     
-    return total_loss / len(loader), correct_nums / total_nums if total_nums > 0 else 0
+    val_loss = total_loss.item() / len(loader)
+    return val_loss, correct_nums.item() / total_nums if total_nums > 0 else 0
 
 
 def main():
@@ -106,10 +101,11 @@ def main():
         paths_cfg['data'],
         seq_len=model_cfg['seq_len'],
         batch_size=args.batch_size,
-        train_ratio=train_cfg['train_ratio']
+        train_ratio=train_cfg['train_ratio'],
+        device=device
     )
-    print(f'   학습 샘플: {len(train_loader.dataset)}')
-    print(f'   검증 샘플: {len(val_loader.dataset)}')
+    print(f'   학습 샘플: {train_loader.num_samples}')
+    print(f'   검증 샘플: {val_loader.num_samples}')
     
     # 모델 생성 (config에서 파라미터 로드)
     model = create_model(model_cfg).to(device)
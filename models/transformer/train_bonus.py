@@ -12,6 +12,7 @@ import json
 
 from models.transformer.transformer import create_model
 from models.transformer.dataloader_bonus import create_bonus_dataloaders
+from models.metrics import topk_hits
 
 CONFIG_PATH = Path(__file__).parent / 'config_bonus.json'
 
@@ -43,8 +44,8 @@ def train_epoch(model, loader, criterion, optimizer, device):
 
 def validate(model, loader, criterion, device):
     model.eval()
-    total_loss = 0
-    correct = 0
+    total_loss = torch.zeros((), device=device)
+    correct = torch.zeros((), device=device)
     total = 0
     
     with torch.no_grad():
@@ -53,17 +54,13 @@ def validate(model, loader, criterion, device):
             target = target.to(device)
             
             output = model(seq)
-            loss = criterion(output[:, 0, :], target[:, 0])
-            total_loss += loss.item()
+            total_loss += criterion(output[:, 0, :], target[:, 0])
             
             # Top-5 정확도
-            top5 = output[:, 0, :].topk(5, dim=1).indices
-            for b in range(target.size(0)):
-                if target[b, 0] in top5[b]:
-                    correct += 1
-                total += 1
+            correct += topk_hits(output, target, 5).sum()
+            total += target.size(0)
     
-    return total_loss / len(loader), correct / total if total > 0 else 0
+    return total_loss.item() / len(loader), correct.item() / total if total > 0 else 0
 
 
 def main():
@@ -92,10 +89,11 @@ def main():
     train_loader, val_loader = create_bonus_dataloaders(
         paths_cfg['data'],
         seq_len=model_cfg['seq_len'],
-        batch_size=train_cfg['batch_size']
+        batch_size=train_cfg['batch_size'],
+        device=device
     )
-    print(f'   학습 샘플: {len(train_loader.dataset)}')
-    print(f'   검증 샘플: {len(val_loader.dataset)}')
+    print(f'   학습 샘플: {train_loader.num_samples}')
+    print(f'   검증 샘플: {val_loader.num_samples}')
     
     # 모델
     model = create_model(model_cfg).to(device)
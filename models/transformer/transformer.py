@@ -8,6 +8,8 @@ import torch
 import torch.nn as nn
 import math
 
+from models.sampling import sample_numbers
+
 
 class PositionalEncoding(nn.Module):
     """위치 인코딩"""
@@ -119,14 +121,15 @@ class LottoTransformer(nn.Module):
         # (batch, 6, 45)
         return torch.stack(outputs, dim=1)
     
-    def generate(self, x: torch.Tensor, temperature: float = 1.0, top_k: int = 10) -> torch.Tensor:
+    def generate(self, x: torch.Tensor, temperature=1.0, top_k=10, method: str = 'sequential') -> torch.Tensor:
         """
         번호 생성 (중복 없이)
         
         Args:
             x: 입력 시퀀스
-            temperature: 샘플링 온도 (높을수록 다양성 증가)
-            top_k: 상위 k개 후보에서 샘플링
+            temperature: 샘플링 온도 (높을수록 다양성 증가), 스칼라 또는 (batch,)
+            top_k: 상위 k개 후보에서 샘플링, 스칼라 또는 (batch,)
+            method: 'sequential' (위치별 순차) 또는 'gumbel' (한 번에, models/sampling.py 참고)
         
         Returns:
             (batch_size, 6) - 생성된 번호
@@ -134,34 +137,19 @@ class LottoTransformer(nn.Module):
         self.eval()
         with torch.no_grad():
             logits = self.forward(x)  # (batch, 6, 45)
-            batch_size = logits.size(0)
-            
-            generated = []
-            used_mask = torch.zeros(batch_size, self.num_balls, device=logits.device)
-            
-            for i in range(self.output_nums):
-                # 현재 위치의 로짓
-                curr_logits = logits[:, i, :] / temperature  # (batch, 45)
-                
-                # 이미 선택된 번호 마스킹
-                curr_logits = curr_logits - used_mask * 1e9
-                
-                # Top-k 샘플링
-                top_k_logits, top_k_indices = torch.topk(curr_logits, top_k, dim=-1)
-                probs = torch.softmax(top_k_logits, dim=-1)
-                
-                # 샘플링
-                sampled_idx = torch.multinomial(probs, 1).squeeze(-1)  # (batch,)
-                selected = top_k_indices.gather(1, sampled_idx.unsqueeze(-1)).squeeze(-1)  # (batch,)
-                
-                # 선택된 번호 기록
-                generated.append(selected + 1)  # 1~45로 변환
-                used_mask.scatter_(1, selected.unsqueeze(-1), 1.0)
-            
-            result = torch.stack(generated, dim=1)  # (batch, 6)
-            # 오름차순 정렬
-            result, _ = torch.sort(result, dim=1)
-            return result
+            return self.sample(logits, temperature=temperature, top_k=top_k, method=method)
+    
+    def sample(self, logits: torch.Tensor, temperature=1.0, top_k=10, method: str = 'sequential') -> torch.Tensor:
+        """
+        로짓에서 번호 샘플링 (중복 없이)
+        
+        forward 결과를 (batch, 6, 45)로 expand 해서 넘기면
+        forward 한 번으로 여러 세트를 뽑을 수 있음
+        
+        Returns:
+            (batch_size, 6) - 생성된 번호 (오름차순)
+        """
+        return sample_numbers(logits, temperature=temperature, top_k=top_k, method=method)
 
 
 def create_model(config: dict = None) -> LottoTransformer:
@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+"""과거 회차 백테스트"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from lotto.backtest import main
+
+if __name__ == '__main__':
+    main()
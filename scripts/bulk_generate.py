@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+"""대량 티켓 생성 (바이너리 파일)"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from models.bulk_generate import main
+
+if __name__ == '__main__':
+    main()
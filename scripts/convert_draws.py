@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+"""당첨번호 포맷 변환 (JSON ↔ 바이너리)"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from models.draw_archive import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+"""체크포인트 평가 (검증 구간)"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from models.evaluate import main
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,44 @@
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+import os
 import json
 import torch
 import sys
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # 루트 경로 추가
 ROOT = Path(__file__).parent
 sys.path.insert(0, str(ROOT))
 
-from models.transformer.generate_full import generate_with_bonus, load_configs as load_trans_configs
-from models.gan.generate import generate_numbers, load_config as load_gan_config
-from api.dream import generate_dream_numbers, generate_dream_numbers_with_llm
+from models.transformer.generate_full import load_configs as load_trans_configs
+from models.gan.generate import load_config as load_gan_config
+from models.registry import get_registry
+from models.transformer.logit_cache import get_logit_cache
+from models.tickets import SOURCE_MODELS, SOURCES, TicketSampler
+from models.draw_store import get_draw_store
+from models.inference_pool import InferencePool, configured_workers
+from models.batcher import RequestCoalescer, configured_max_sets, configured_window_ms
+from models.bulk_generate import file_header
+from models.ticket_pool import TicketPool, configured_pool_size
+from lotto.uniqueness import TicketBitset, seen_set
+from lotto.stats import FrequencyIndex
+from lotto.cooccurrence import CooccurrenceIndex
+from lotto.draw_index import DrawIndex
+from lotto.util import file_version
+from api.dream import generate_dream_numbers, generate_dream_numbers_batch, generate_dream_numbers_with_llm
+from api.llm_cache import llm_cache_stats
+from api.llm_client import llm_stats
+from api.morphemes import configured_warmup, kiwi_state, morpheme_cache, warm_up_kiwi
 
 # Request 모델
 class DreamRequest(BaseModel):
@@ -22,7 +46,103 @@ class DreamRequest(BaseModel):
     sets: int = 1
     use_llm: bool = False
 
-app = FastAPI(title="AI Lotto Server", description="AI 기반 로또 번호 생성 + 해몽")
+class DreamBatchRequest(BaseModel):
+    dreams: List[str]
+    sets: int = 1
+
+# /dream/batch 한 번에 받는 꿈 수 상한
+MAX_DREAM_BATCH = 1000
+
+# /generate 세트 수 상한 (메인/보너스 forward가 세트 수와 무관하게 1회라 넉넉하게)
+MAX_SETS = 1000
+
+# /generate/stream 상한과 청크 크기 (메모리는 청크 크기만큼만 사용)
+MAX_STREAM_SETS = 10_000_000
+DEFAULT_STREAM_CHUNK = 10_000
+MAX_STREAM_CHUNK = 100_000
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream',
+    'binary': 'application/octet-stream',
+}
+
+# 추론 워커 프로세스 (LOTTO_INFERENCE_WORKERS > 0일 때만, 없으면 서버 프로세스에서 샘플링)
+inference_pool = None
+# 기본 설정 요청용 미리 생성된 티켓 (LOTTO_TICKET_POOL_SIZE > 0일 때만)
+ticket_pools = {}
+
+# 모델/인덱스는 lifespan에서 준비 (spawn 워커가 server.py를 __mp_main__으로 다시 import해도 반복하지 않도록)
+registry = None
+logit_cache = None
+samplers = {}
+draw_store = None
+frequency_index = None
+cooccurrence_index = None
+draw_index = None
+
+def _setup_models(load: bool):
+    """
+    서버 프로세스 샘플러 준비
+    load=False면 (추론 워커 사용) 모델을 로드하지 않음 → 'random'만 서버 프로세스에서 샘플링
+    """
+    global registry, logit_cache, samplers
+    registry = get_registry()
+    if load:
+        # 모델 상주 로드 (요청마다 torch.load 하지 않도록)
+        print("⏳ Loading Models...")
+        registry.load_all(trans_main_cfg, trans_bonus_cfg, gan_config)
+        print("✅ Models Loaded")
+    logit_cache = get_logit_cache()
+    samplers = {
+        source: TicketSampler(source, registry, trans_main_cfg, trans_bonus_cfg, logit_cache=logit_cache)
+        for source in SOURCES
+    }
+
+def _setup_indexes():
+    """회차 통계 인덱스 (요청 때 추가된 회차만 반영)"""
+    global draw_store, frequency_index, cooccurrence_index, draw_index
+    draw_store = get_draw_store(trans_main_cfg['paths']['data'])
+    frequency_index = FrequencyIndex(draw_store)
+    cooccurrence_index = CooccurrenceIndex(draw_store)
+    draw_index = DrawIndex(draw_store)
+
+async def _start_inference_pool(workers: int):
+    """추론 워커 시작, 제한 시간 안에 준비되지 않으면 닫고 None (서버 프로세스 샘플링으로 전환)"""
+    print(f"⏳ Starting {workers} inference workers...")
+    pool = InferencePool(workers, trans_main_cfg, trans_bonus_cfg, gan_config)
+    if await run_in_threadpool(pool.wait_ready, 120):
+        print("✅ Inference workers ready")
+        return pool
+    print("⚠️ Inference workers not ready after 120s, falling back to in-process sampling")
+    await run_in_threadpool(pool.close)
+    return None
+
+@asynccontextmanager
+async def lifespan(app):
+    global inference_pool
+    if configured_warmup():
+        warm_up_kiwi()  # 백그라운드 생성 (준비 완료를 막지 않음, 끝나기 전 /dream은 첫 호출에서 대기)
+    workers = configured_workers()
+    if workers:
+        inference_pool = await _start_inference_pool(workers)
+    await run_in_threadpool(_setup_models, inference_pool is None)
+    _setup_indexes()
+    pool_size = configured_pool_size()
+    if pool_size:
+        for source in ('transformer', 'gan'):
+            ticket_pools[source] = TicketPool(
+                source, lambda count, source=source: _sample_for_pool(source, count), _pool_version,
+                capacity=pool_size, ready_fn=lambda source=source: _pool_ready(source),
+            ).start()
+    yield
+    for pool in ticket_pools.values():
+        pool.close()
+    ticket_pools.clear()
+    if inference_pool is not None:
+        inference_pool.close()
+        inference_pool = None
+
+app = FastAPI(title="AI Lotto Server", description="AI 기반 로또 번호 생성 + 해몽", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -39,51 +159,292 @@ trans_main_cfg, trans_bonus_cfg = load_trans_configs()
 gan_config = load_gan_config()
 print("✅ Configuration Loaded")
 
+MAX_PAGE_SIZE = 100
+STATS_CACHE_SIZE = 64
+stats_cache = OrderedDict()  # (회차 버전, 파라미터) → 응답
+stats_cache_lock = threading.Lock()  # /stats는 sync 핸들러 (스레드풀에서 동시 실행)
+
+def _etag(*key) -> str:
+    return '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:16] + '"'
+
 @app.get("/")
 def read_root():
     return {"status": "ok", "message": "AI Lotto Generator API is running"}
 
+@app.get("/health")
+async def health():
+    """서버/추론 워커 상태 (워커별 ping 응답 시간)"""
+    if inference_pool is None:
+        return {"status": "ok", "inference": {"mode": "in-process"}, "kiwi": kiwi_state()}
+    report = await run_in_threadpool(inference_pool.health)
+    return {"status": "ok" if report["healthy"] else "degraded", "inference": {"mode": "pool", **report},
+            "kiwi": kiwi_state()}
+
+@app.get("/models")
+def model_stats():
+    """상주 모델 로드 시간/메모리 리포트 (워커 모드면 워커별 리포트)"""
+    if inference_pool is not None:
+        return {"workers": [
+            {key: value for key, value in w.items() if key != "logit_cache"}
+            for w in inference_pool.worker_stats()
+        ]}
+    return registry.stats()
+
+def _logit_cache_stats():
+    """로짓 캐시 지표 (워커 모드면 각 워커 프로세스의 캐시)"""
+    if inference_pool is not None:
+        return {"workers": [
+            {"id": w["id"], **w.get("logit_cache", {"error": w.get("error")})}
+            for w in inference_pool.worker_stats()
+        ]}
+    return logit_cache.stats()
+
+@app.get("/metrics")
+def metrics():
+    """서빙 캐시 지표"""
+    return {
+        "logit_cache": _logit_cache_stats(),
+        "batcher": {source: coalescer.stats() for source, coalescer in coalescers.items()},
+        "ticket_pool": {source: pool.stats() for source, pool in ticket_pools.items()},
+        "morpheme_cache": morpheme_cache.stats(),
+        "llm": llm_stats(),
+        "llm_cache": llm_cache_stats(),
+    }
+
+@app.get("/stats")
+def stats(response: Response, window: Optional[int] = None, top: int = 6,
+          if_none_match: Optional[str] = Header(None)):
+    """
+    번호별 출현 통계 (핫/콜드)
+    :param window: 최근 N회 (없으면 전체)
+    :param top: 핫/콜드 번호 개수
+    :return: {'frequency': [45], 'bonus_frequency': [45], 'draws_since_last_seen': [45], 'hot', 'cold', ...}
+    ETag는 회차 버전 기준 → 같은 회차 데이터면 304
+    """
+    if window is not None and window < 1:
+        raise HTTPException(status_code=400, detail="window must be >= 1")
+    top = max(1, min(45, top))
+
+    # 버전과 배열을 같은 스냅샷에서 읽음 (계산 중 sync가 끼어들면 이전 버전 키로 저장될 수 있음)
+    with frequency_index.synced():
+        key = (frequency_index.version, window, top)
+        etag = _etag(*key)
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        with stats_cache_lock:
+            body = stats_cache.get(key)
+            if body is not None:
+                stats_cache.move_to_end(key)
+        if body is None:
+            lo, hi = frequency_index.draw_range(last=window)
+            body = {
+                "draws": hi - lo,
+                "from_draw": int(frequency_index.draw_no[lo]) if hi > lo else None,
+                "to_draw": int(frequency_index.draw_no[hi - 1]) if hi > lo else None,
+                "frequency": frequency_index.frequency(last=window).tolist(),
+                "bonus_frequency": frequency_index.frequency(last=window, bonus=True).tolist(),
+                "draws_since_last_seen": frequency_index.draws_since_last_seen().tolist(),
+                "hot": frequency_index.hot(top, last=window),
+                "cold": frequency_index.cold(top, last=window),
+            }
+            with stats_cache_lock:
+                stats_cache[key] = body
+                while len(stats_cache) > STATS_CACHE_SIZE:
+                    stats_cache.popitem(last=False)
+
+    response.headers["ETag"] = etag
+    return body
+
+@app.get("/cooccurrence/partners")
+def cooccurrence_partners(number: int, top: int = 10, start_date: Optional[str] = None,
+                          end_date: Optional[str] = None):
+    """
+    number와 가장 자주 같이 나온 번호
+    :param start_date, end_date: 'YYYY-MM-DD' (양 끝 포함, 없으면 전체)
+    :return: {'number': 7, 'partners': [{'number': 23, 'count': 31}, ...]}
+    """
+    try:
+        # 조회 중 sync가 카운트를 더하거나 0으로 재구축하지 않도록 잠금을 잡은 채로 계산
+        with cooccurrence_index.synced():
+            partners = cooccurrence_index.partners(
+                number, k=max(1, min(44, top)), start_date=start_date, end_date=end_date
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"number": number, "partners": [{"number": n, "count": c} for n, c in partners]}
+
+@app.get("/cooccurrence/count")
+def cooccurrence_count(numbers: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    번호들이 한 회차에 모두 나온 횟수
+    :param numbers: 쉼표 구분 2~6개 (예: '7,23' 또는 '7,23,40')
+    """
+    try:
+        parsed = [int(n) for n in numbers.split(',')]
+        if not 2 <= len(parsed) <= 6:
+            raise ValueError("numbers must contain 2 to 6 values")
+        with cooccurrence_index.synced():
+            count = cooccurrence_index.count(parsed, start_date=start_date, end_date=end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"numbers": sorted(parsed), "count": count}
+
+@app.get("/cooccurrence/top")
+def cooccurrence_top(size: int = 2, top: int = 10, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None):
+    """
+    가장 자주 같이 나온 쌍 (size=2) / 삼중 (size=3)
+    :return: {'size': 2, 'combinations': [{'numbers': [..], 'count': n}, ...]}
+    """
+    try:
+        with cooccurrence_index.synced():
+            combos = cooccurrence_index.top_combinations(
+                size, k=max(1, min(100, top)), start_date=start_date, end_date=end_date
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"size": size, "combinations": [{"numbers": n, "count": c} for n, c in combos]}
+
+def _parse_numbers(value: Optional[str]) -> list:
+    """'7,23' → [7, 23]"""
+    if not value:
+        return []
+    return [int(n) for n in value.split(',') if n.strip()]
+
+@app.get("/draws")
+def search_draws(include: Optional[str] = None, exclude: Optional[str] = None, bonus: Optional[int] = None,
+                 start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 page: int = 1, page_size: int = 20):
+    """
+    회차 검색 (최신 회차 먼저)
+    :param include: 모두 포함해야 하는 번호 (쉼표 구분, 예: '7,23')
+    :param exclude: 포함하면 안 되는 번호 (쉼표 구분)
+    :param bonus: 보너스 번호
+    :param start_date, end_date: 'YYYY-MM-DD' (양 끝 포함)
+    :return: {'total', 'page', 'page_size', 'draws': [{'draw_no', 'date', 'numbers', 'bonus'}, ...]}
+    """
+    page = max(1, page)
+    page_size = max(1, min(MAX_PAGE_SIZE, page_size))
+    try:
+        # 조회 중 sync가 비트셋을 늘리거나 재구축하지 않도록 잠금을 잡은 채로 검색
+        with draw_index.synced():
+            return draw_index.search(
+                include=_parse_numbers(include), exclude=_parse_numbers(exclude), bonus=bonus,
+                start_date=start_date, end_date=end_date, page=page, page_size=page_size
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _sample_local(model: str, count: int, temperature, top_k):
+    registry.refresh()
+    return samplers[model].sample(count, temperature=temperature, top_k=top_k)
+
+async def _sample_batch(model: str, count: int, temperature, top_k):
+    """배치 샘플링 (워커 풀 또는 스레드풀), temperature/top_k는 행별 텐서"""
+    if inference_pool is not None:
+        return await inference_pool.generate(model, count, unique=False, temperature=temperature, top_k=top_k)
+    return await run_in_threadpool(_sample_local, model, count, temperature, top_k)
+
+# 모델별 요청 합치기 (짧은 창 동안 모인 요청을 forward + 샘플링 1회로)
+coalescers = {
+    source: RequestCoalescer(
+        lambda count, temperature, top_k, source=source: _sample_batch(source, count, temperature, top_k),
+        window_ms=configured_window_ms(), max_sets=configured_max_sets(MAX_SETS),
+    )
+    for source in ('transformer', 'gan')
+}
+
+def _checkpoint_paths() -> dict:
+    """레지스트리 모델 이름 → 체크포인트 경로"""
+    return {'main': trans_main_cfg['paths']['checkpoint'], 'bonus': trans_bonus_cfg['paths']['checkpoint'],
+            'gan': gan_config['paths']['checkpoint_g']}
+
+def _checkpoint_stats() -> tuple:
+    """워커가 로드하는 체크포인트 파일 (mtime, size) - 워커 모드에서는 서버 레지스트리가 비어 있음"""
+    return tuple(file_version(path) for path in _checkpoint_paths().values())
+
+def _pool_version() -> tuple:
+    """티켓 풀 버전 - 회차 데이터나 체크포인트가 바뀌면 풀을 비움 (보충 스레드에서만 호출)"""
+    if inference_pool is not None:
+        return (draw_store.version, _checkpoint_stats())
+    registry.refresh()
+    return (draw_store.version, registry.fingerprints())
+
+def _pool_ready(model: str) -> bool:
+    """풀을 채울 수 있는지 - 필요한 모델이 없으면 (워커 모드는 체크포인트 파일) 보충을 건너뜀"""
+    if inference_pool is not None:
+        paths = _checkpoint_paths()
+        return all(os.path.exists(paths[name]) for name in SOURCE_MODELS[model])
+    return samplers[model].available()
+
+def _sample_for_pool(model: str, count: int):
+    """풀 보충용 샘플링 (백그라운드 스레드)"""
+    if inference_pool is not None:
+        return inference_pool.sample(model, count, unique=False).result()
+    return _sample_local(model, count, 1.0, 15)
+
+def _take_from_pool(model: str, sets: int, unique: bool, max_rounds: int = 50):
+    """풀에서 꺼내기 (unique면 겹친 세트만 풀에서 더 꺼냄), 부족하면 None"""
+    pool = ticket_pools.get(model)
+    tickets = pool.take(sets) if pool is not None else None
+    if tickets is None or not unique:
+        return tickets
+    seen = seen_set(sets)
+    rows = np.arange(sets)[~seen.add_tickets(tickets)]
+    for _ in range(max_rounds):
+        if len(rows) == 0:
+            return tickets
+        extra = pool.take(len(rows))
+        if extra is None:
+            return None
+        tickets[rows] = extra
+        rows = rows[~seen.add_tickets(extra)]
+    return None
+
+async def _generate_fresh(model: str, sets: int, unique: bool):
+    if model in coalescers:
+        # 동시 요청과 합쳐서 샘플링 (unique는 요청 단위로 보장)
+        return await coalescers[model].submit(sets, unique=unique)
+    if inference_pool is not None:
+        return await inference_pool.generate(model, sets, unique=unique)
+    return await run_in_threadpool(_generate_local, model, sets, unique)
+
+def _generate_local(model: str, sets: int, unique: bool):
+    """서버 프로세스에서 샘플링 (워커 풀이 없을 때)"""
+    # 체크포인트가 바뀐 모델만 재로드 (로짓 캐시는 해시가 바뀌어 자동 무효화)
+    registry.refresh()
+    sampler = samplers[model]
+    if unique:
+        # 응답 안에서 메인 6개 조합이 겹치지 않도록 겹친 세트만 다시 샘플링
+        return sampler.sample_unique(sets)
+    return sampler.sample(sets)
+
 @app.get("/generate")
-def generate(model: str = 'transformer', sets: int = 5):
+async def generate(model: str = 'transformer', sets: int = 5, unique: bool = True):
     """
     로또 번호 생성 API
     :param model: 'transformer' | 'gan' | 'random'
-    :param sets: 생성할 세트 수 (1~100)
+    :param sets: 생성할 세트 수 (1~MAX_SETS)
+    :param unique: True면 응답 안에 같은 번호 조합이 없음
     :return: {'results': [[1,2,3,4,5,6,7], ...]}
     """
     
     # 세트 수 제한
     if sets < 1: sets = 1
-    if sets > 100: sets = 100
+    if sets > MAX_SETS: sets = MAX_SETS
     
+    if model not in SOURCES:
+        raise HTTPException(status_code=400, detail="Unknown model type")
+
     try:
-        results = []
-        
-        if model == 'transformer':
-            # 메인 + 보너스 (튜플 리스트: ([Main], Bonus))
-            raw_results = generate_with_bonus(trans_main_cfg, trans_bonus_cfg, num_sets=sets)
-            # 포맷 변환: [[Main..., Bonus], ...]
-            results = [ main + [bonus] for main, bonus in raw_results ]
-            
-        elif model == 'gan':
-            # 메인 + 보너스 (리스트 튜플: ([Main], Bonus))
-            raw_results = generate_numbers(gan_config, num_sets=sets)
-            results = [ main + [bonus] for main, bonus in raw_results ]
-            
-        elif model == 'random':
-            import random
-            results = []
-            for _ in range(sets):
-                # 7개 뽑기 (6개 메인 + 1개 보너스)
-                # 실제 로또처럼 45개 중 7개 비복원 추출
-                nums = random.sample(range(1, 46), 7)
-                main = sorted(nums[:6])
-                bonus = nums[6]
-                results.append(main + [bonus])
-                
-        else:
-            raise HTTPException(status_code=400, detail="Unknown model type")
-            
+        # (sets, 7) uint8: 오름차순 메인 6개 + 보너스
+        # 미리 생성된 풀에서 꺼내고, 없거나 부족하면 새로 샘플링
+        tickets = await run_in_threadpool(_take_from_pool, model, sets, unique) if model in ticket_pools else None
+        if tickets is None:
+            tickets = await _generate_fresh(model, sets, unique)
+        results = tickets.tolist()
+
         return {"results": results, "model": model}
         
     except Exception as e:
@@ -91,6 +452,95 @@ def generate(model: str = 'transformer', sets: int = 5):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _negotiate_stream_format(accept: Optional[str]) -> str:
+    """Accept 헤더 → 'ndjson' | 'sse' | 'binary' (기본 ndjson)"""
+    accept = (accept or '').lower()
+    for fmt in ('binary', 'sse', 'ndjson'):
+        if STREAM_FORMATS[fmt] in accept:
+            return fmt
+    return 'ndjson'
+
+async def _stream_chunk(model: str, count: int, seen: Optional[TicketBitset], max_rounds: int = 50):
+    """청크 하나 샘플링 (seen이 있으면 스트림 전체에서 겹친 행만 다시 샘플링)"""
+    if model == 'random':
+        tickets = await run_in_threadpool(_generate_local, model, count, False)
+    else:
+        tickets = await _sample_batch(model, count, 1.0, 15)
+    if seen is None:
+        return tickets
+
+    tickets = np.array(tickets)
+    rows = np.arange(count)[~seen.add_tickets(tickets)]
+    for _ in range(max_rounds):
+        if len(rows) == 0:
+            return tickets
+        if model == 'random':
+            retry = await run_in_threadpool(_generate_local, model, len(rows), False)
+        else:
+            retry = await _sample_batch(model, len(rows), 1.0, 15)
+        tickets[rows] = retry
+        rows = rows[~seen.add_tickets(retry)]
+    raise RuntimeError(f'{len(rows)} tickets still duplicated after {max_rounds} rounds')
+
+def _encode_chunk(tickets: np.ndarray, fmt: str) -> bytes:
+    if fmt == 'binary':
+        return np.ascontiguousarray(tickets, dtype=np.uint8).tobytes()
+    rows = tickets.tolist()
+    if fmt == 'sse':
+        return f"event: tickets\ndata: {json.dumps(rows, separators=(',', ':'))}\n\n".encode()
+    return ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows).encode()
+
+@app.get("/generate/stream")
+async def generate_stream(request: Request, model: str = 'transformer', sets: int = 1000,
+                          chunk_size: int = DEFAULT_STREAM_CHUNK, unique: bool = True,
+                          output_format: Optional[str] = Query(None, alias="format")):
+    """
+    대량 번호 생성 스트리밍 (청크 단위로 생성해서 바로 전송)
+    :param sets: 총 세트 수 (1~MAX_STREAM_SETS)
+    :param chunk_size: 한 번에 생성/전송할 세트 수
+    :param unique: True면 스트림 전체에서 같은 번호 조합이 없음
+    :param format: 'ndjson' | 'sse' | 'binary' (없으면 Accept 헤더로 결정)
+        ndjson: 줄마다 [1,2,3,4,5,6,7]
+        sse: 청크마다 'event: tickets' + 'data: [[...], ...]', 마지막에 'event: done'
+        binary: 16바이트 티켓 파일 헤더 (bulk_generate packed와 동일) + 7바이트 레코드
+    """
+    if model not in SOURCES:
+        raise HTTPException(status_code=400, detail="Unknown model type")
+    if output_format is not None and output_format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(STREAM_FORMATS)}")
+    fmt = output_format or _negotiate_stream_format(request.headers.get('accept'))
+    sets = max(1, min(MAX_STREAM_SETS, sets))
+    chunk_size = max(1, min(MAX_STREAM_CHUNK, chunk_size))
+
+    async def body():
+        # 클라이언트가 읽는 속도에 맞춰 다음 청크를 생성 (send가 끝나야 다음 yield로 진행)
+        seen = seen_set(sets) if unique else None
+        sent = 0
+        if fmt == 'binary':
+            yield file_header('packed', model, unique=unique)
+        try:
+            while sent < sets:
+                if await request.is_disconnected():
+                    print(f"⚠️ stream client disconnected after {sent:,} sets")
+                    return
+                n = min(chunk_size, sets - sent)
+                yield _encode_chunk(await _stream_chunk(model, n, seen), fmt)
+                sent += n
+        except Exception as e:
+            # 헤더는 이미 전송됨 → 형식에 맞춰 오류를 본문 끝에 알림 (binary는 연결 종료)
+            print(f"❌ Stream Error: {str(e)}")
+            if fmt == 'sse':
+                yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n".encode()
+            elif fmt == 'ndjson':
+                yield (json.dumps({'error': str(e)}) + '\n').encode()
+            return
+        if fmt == 'sse':
+            yield f"event: done\ndata: {json.dumps({'sets': sent})}\n\n".encode()
+
+    headers = {"X-Ticket-Count": str(sets), "X-Ticket-Format": fmt, "Cache-Control": "no-cache"}
+    return StreamingResponse(body(), media_type=STREAM_FORMATS[fmt], headers=headers)
+
+
 @app.post("/dream")
 async def dream_interpret(request: DreamRequest):
     """
@@ -114,8 +564,8 @@ async def dream_interpret(request: DreamRequest):
             # LLM 사용 (Gemini API 키 필요)
             result = await generate_dream_numbers_with_llm(request.dream, sets)
         else:
-            # 규칙 기반
-            result = generate_dream_numbers(request.dream, sets)
+            # 규칙 기반 (Kiwi 생성/분석은 스레드에서, 이벤트 루프를 막지 않도록)
+            result = await run_in_threadpool(generate_dream_numbers, request.dream, sets)
         
         return {
             "success": True,
@@ -128,6 +578,32 @@ async def dream_interpret(request: DreamRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/dream/batch")
+async def dream_interpret_batch(request: DreamBatchRequest):
+    """
+    여러 꿈 한 번에 해몽 (규칙 기반, Kiwi 멀티스레드 배치 분석)
+
+    :param request: {"dreams": ["꿈 내용", ...], "sets": 1}
+    :return: {"count": N, "results": [/dream과 같은 형식, ...]}
+    """
+    if not request.dreams:
+        raise HTTPException(status_code=400, detail="꿈 내용을 입력해주세요")
+    if len(request.dreams) > MAX_DREAM_BATCH:
+        raise HTTPException(status_code=400, detail=f"dreams must be at most {MAX_DREAM_BATCH}")
+    empty = [i for i, dream in enumerate(request.dreams) if len(dream.strip()) < 2]
+    if empty:
+        raise HTTPException(status_code=400, detail=f"꿈 내용을 입력해주세요 (index {empty[0]})")
+
+    sets = max(1, min(10, request.sets))  # 1-10 제한
+
+    try:
+        results = await run_in_threadpool(generate_dream_numbers_batch, request.dreams, sets)
+    except Exception as e:
+        print(f"❌ Dream Batch API Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"success": True, "model": "rule-based", "count": len(results), "results": results}
+
+
 if __name__ == '__main__':
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)